@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+
+def setup_django(database_name=None):
+    import django
+    from django.conf import settings
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    if database_name is None:
+        database_name = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    settings.DATABASES["default"]["NAME"] = database_name
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+    return database_name
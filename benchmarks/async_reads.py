@@ -0,0 +1,91 @@
+"""
+Compare the sync DRF read endpoints with their /api/async/ counterparts by
+driving the ASGI application in-process with concurrent clients.
+
+    python -m benchmarks.async_reads --concurrency 50 --requests 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks import setup_django
+from benchmarks.load import ASGITransport
+
+ENDPOINTS = {
+    "project list": ("/api/projects/", "/api/async/projects/"),
+    "project detail": ("/api/projects/{project}/", "/api/async/projects/{project}/"),
+    "task list": ("/api/tasks/?status=TODO", "/api/async/tasks/?status=TODO"),
+    "task detail": ("/api/tasks/{task}/", "/api/async/tasks/{task}/"),
+}
+
+
+async def asgi_get(application, url, token):
+    status, _ = await ASGITransport(application).request("GET", url, token)
+    return status
+
+
+async def run_load(application, url, token, concurrency, total):
+    latencies = []
+    remaining = iter(range(total))
+
+    async def client():
+        for _ in remaining:
+            started = time.perf_counter()
+            status = await asgi_get(application, url, token)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                raise RuntimeError(f"{url} returned {status}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--database", default=None)
+    args = parser.parse_args()
+
+    database = setup_django(args.database)
+    from django.core.asgi import get_asgi_application
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from projects.dataset import generate
+    from projects.models import Task
+
+    print(f"Seeding {args.tasks} tasks into {database}")
+    data = generate(users=args.users, projects=args.projects, tasks=args.tasks)
+    project = data["projects"][0]
+    member_id = data["members"][project.pk][0]
+    task_id = Task.objects.filter(project=project).values_list("id", flat=True)[0]
+    user = next(u for u in data["users"] if u.pk == member_id)
+    token = str(RefreshToken.for_user(user).access_token)
+    application = get_asgi_application()
+
+    print(f"{args.requests} requests per endpoint, concurrency {args.concurrency}")
+    for name, urls in ENDPOINTS.items():
+        for label, url in zip(("sync", "async"), urls):
+            url = url.format(project=project.pk, task=task_id)
+            result = asyncio.run(
+                run_load(application, url, token, args.concurrency, args.requests)
+            )
+            print(
+                f"{name:15} {label:5} {result['rps']:9.1f} req/s"
+                f"  p50 {result['p50']:8.2f} ms  p99 {result['p99']:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Delete a project holding --tasks tasks (a million by default) with the
+chunked engine in projects.deletion, then delete a user assigned to half
+as many on another project. --orm-tasks also times a plain project.delete()
+on a board of that size, which collects every task into memory first. Peak
+memory is traced Python allocations, so timings run slower than untraced.
+
+    python -m benchmarks.deletion --tasks 1000000 --chunk-size 2000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks import setup_django
+
+
+def seed(tasks, users, batch_size=10_000):
+    from django.contrib.auth.models import User
+    from django.db import transaction
+    from projects.models import Project, Task
+    from projects.stats import rebuild_project_stats
+
+    statuses = ["TODO", "IN_PROGRESS", "DONE"]
+    with transaction.atomic():
+        project = Project.objects.create(name=f"Deletion {tasks}")
+        user_objs = User.objects.bulk_create(
+            [User(username=f"deletion-{tasks}-{i}") for i in range(users)]
+        )
+        project.members.add(*user_objs)
+    for start in range(0, tasks, batch_size):
+        with transaction.atomic():
+            Task.objects.bulk_create(
+                [
+                    Task(
+                        project=project,
+                        title=f"Task {i}",
+                        status=statuses[i % len(statuses)],
+                        assigned_to=user_objs[i % users],
+                    )
+                    for i in range(start, min(start + batch_size, tasks))
+                ]
+            )
+    rebuild_project_stats([project.pk])
+    return project, user_objs
+
+
+def measure(func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def report(name, rows, elapsed, peak, batches=None):
+    print(f"\n== {name}")
+    print(f"rows:          {rows:10d}")
+    print(f"seconds:       {elapsed:10.2f}")
+    print(f"rows/second:   {rows / elapsed:10.0f}")
+    print(f"peak memory:   {peak / 2**20:10.1f} MiB")
+    if batches:
+        print(f"ms per batch:  {elapsed * 1000 / batches:10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--orm-tasks", type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import transaction
+    from projects import deletion
+    from projects.stats import find_drift
+
+    print(f"seeding {args.tasks} tasks")
+    project, _ = seed(args.tasks, args.users)
+    # A second board, all assigned to one user, for delete_user.
+    _, (assignee,) = seed(args.tasks // 2, 1)
+
+    result, elapsed, peak = measure(
+        lambda: deletion.delete_project(project, chunk_size=args.chunk_size)
+    )
+    rows = result["deleted_tasks"]
+    report("delete_project", rows, elapsed, peak, -(-rows // args.chunk_size))
+
+    result, elapsed, peak = measure(
+        lambda: deletion.delete_user(assignee, chunk_size=args.chunk_size)
+    )
+    rows = result["unassigned_tasks"]
+    report("delete_user", rows, elapsed, peak, -(-rows // args.chunk_size))
+    print(f"\nstats drift:   {find_drift()}")
+
+    if args.orm_tasks:
+        print(f"\nseeding {args.orm_tasks} tasks")
+        project, _ = seed(args.orm_tasks, args.users)
+
+        def orm_delete():
+            with transaction.atomic():
+                return project.delete()
+
+        _, elapsed, peak = measure(orm_delete)
+        report("project.delete()", args.orm_tasks, elapsed, peak)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Mixed read/write load against the real URLconf. Virtual users log in with
+/api/token/, discover their projects and tasks through the API, then pick
+weighted operations from SCENARIO until the request budget is spent.
+Throughput and p50/p95/p99 are reported per operation; --output saves them
+as JSON and --compare prints the change against an earlier run.
+
+In-process (seeds a temporary SQLite database and drives the ASGI app):
+
+    python -m benchmarks.load --users 20 --requests 5000
+
+Against a running server seeded with
+``manage.py generate_dataset --password secret`` (needs httpx):
+
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 --password secret
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+from benchmarks import setup_django
+
+# name, weight, method, path, body factory (rng, context) -> JSON body
+SCENARIO = [
+    ("task-list", 20, "GET", "/api/tasks/?project={project}", None),
+    (
+        "task-list-filtered",
+        10,
+        "GET",
+        "/api/tasks/?status=TODO&ordering=due_date",
+        None,
+    ),
+    ("task-list-sparse", 5, "GET", "/api/tasks/?fields=id,title,status", None),
+    ("task-detail", 15, "GET", "/api/tasks/{task}/", None),
+    ("project-list", 10, "GET", "/api/projects/", None),
+    ("project-detail", 15, "GET", "/api/projects/{project}/", None),
+    ("project-stats", 5, "GET", "/api/projects/{project}/stats/", None),
+    ("async-task-list", 5, "GET", "/api/async/tasks/?project={project}", None),
+    (
+        "task-create",
+        5,
+        "POST",
+        "/api/tasks/",
+        lambda rng, ctx: {"title": "Load test task", "project_id": ctx["project"]},
+    ),
+    (
+        "task-set-status",
+        10,
+        "PATCH",
+        "/api/tasks/{task}/set-status/",
+        lambda rng, ctx: {"status": rng.choice(["TODO", "IN_PROGRESS", "DONE"])},
+    ),
+]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[
+        min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    ]
+
+
+class ASGITransport:
+    def __init__(self, application):
+        self.application = application
+
+    async def request(self, method, path, token=None, body=None):
+        path, _, query = path.partition("?")
+        payload = json.dumps(body).encode() if body is not None else b""
+        headers = [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ]
+        if token:
+            headers.append((b"authorization", f"Bearer {token}".encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+        }
+        received = False
+        status = None
+        chunks = []
+
+        async def receive():
+            nonlocal received
+            if received:
+                await asyncio.Event().wait()
+            received = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.application(scope, receive, send)
+        return status, b"".join(chunks)
+
+    async def close(self):
+        pass
+
+
+class HTTPXTransport:
+    def __init__(self, base_url, concurrency):
+        import httpx
+
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(max_connections=concurrency),
+            timeout=30,
+        )
+
+    async def request(self, method, path, token=None, body=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        response = await self.client.request(method, path, json=body, headers=headers)
+        return response.status_code, response.content
+
+    async def close(self):
+        await self.client.aclose()
+
+
+async def login(transport, username, password):
+    status, body = await transport.request(
+        "POST", "/api/token/", body={"username": username, "password": password}
+    )
+    if status != 200:
+        raise RuntimeError(f"login for {username} returned {status}")
+    token = json.loads(body)["access"]
+
+    status, body = await transport.request("GET", "/api/projects/?fields=id", token)
+    projects = [project["id"] for project in json.loads(body)["results"]]
+    status, body = await transport.request(
+        "GET", "/api/tasks/?fields=id&page_size=100", token
+    )
+    tasks = [task["id"] for task in json.loads(body)["results"]]
+    if not projects or not tasks:
+        return None
+    return {"token": token, "projects": projects, "tasks": tasks}
+
+
+async def run_scenario(transport, sessions, total, concurrency, seed):
+    rng = random.Random(seed)
+    weights = [operation[1] for operation in SCENARIO]
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    remaining = iter(range(total))
+
+    async def virtual_user(session):
+        for _ in remaining:
+            name, _, method, path, body = rng.choices(SCENARIO, weights)[0]
+            ctx = {
+                "project": rng.choice(session["projects"]),
+                "task": rng.choice(session["tasks"]),
+            }
+            started = time.perf_counter()
+            status, _ = await transport.request(
+                method,
+                path.format(**ctx),
+                session["token"],
+                body(rng, ctx) if body else None,
+            )
+            latencies[name].append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                errors[name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(virtual_user(sessions[i % len(sessions)]) for i in range(concurrency))
+    )
+    elapsed = time.perf_counter() - started
+
+    report = {}
+    for name, values in sorted(latencies.items()):
+        values.sort()
+        report[name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            "rps": len(values) / elapsed,
+            "p50": percentile(values, 0.50),
+            "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99),
+        }
+    report["total"] = {
+        "requests": total,
+        "errors": sum(errors.values()),
+        "rps": total / elapsed,
+    }
+    return report
+
+
+def print_report(report, previous=None):
+    print(
+        f"{'operation':20} {'requests':>8} {'errors':>6} {'req/s':>9}"
+        f" {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for name, row in report.items():
+        line = f"{name:20} {row['requests']:8d} {row['errors']:6d} {row['rps']:9.1f}"
+        if "p50" in row:
+            line += f" {row['p50']:8.2f} {row['p95']:8.2f} {row['p99']:8.2f}"
+        if previous and name in previous:
+            before = previous[name]
+            line += f"  req/s {(row['rps'] / before['rps'] - 1) * 100:+6.1f}%"
+            if "p95" in row and before.get("p95"):
+                line += f"  p95 {(row['p95'] / before['p95'] - 1) * 100:+6.1f}%"
+        print(line)
+
+
+async def main_async(args, transport, usernames):
+    sessions = [
+        session
+        for session in await asyncio.gather(
+            *(login(transport, name, args.password) for name in usernames)
+        )
+        if session is not None
+    ]
+    if not sessions:
+        raise SystemExit("No virtual user has projects and tasks to work on")
+    try:
+        return await run_scenario(
+            transport, sessions, args.requests, args.concurrency, args.seed
+        )
+    finally:
+        await transport.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--base-url", help="Load a running server instead.")
+    parser.add_argument("--password", default="benchmark")
+    parser.add_argument("--users", type=int, default=20, help="Virtual users.")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dataset-users", type=int, default=200)
+    parser.add_argument("--dataset-projects", type=int, default=50)
+    parser.add_argument("--dataset-tasks", type=int, default=20_000)
+    parser.add_argument("--output", help="Write the report as JSON.")
+    parser.add_argument("--compare", help="JSON report of an earlier run.")
+    args = parser.parse_args()
+
+    usernames = [f"bench-{args.seed}-{i}" for i in range(args.users)]
+    if args.base_url:
+        transport = HTTPXTransport(args.base_url, args.concurrency)
+    else:
+        database = setup_django()
+        from django.conf import settings
+        from django.core.asgi import get_asgi_application
+        from projects.dataset import generate
+
+        settings.ALLOWED_HOSTS = ["localhost"]
+        print(f"Seeding {args.dataset_tasks} tasks into {database}")
+        generate(
+            users=args.dataset_users,
+            projects=args.dataset_projects,
+            tasks=args.dataset_tasks,
+            seed=args.seed,
+            password=args.password,
+        )
+        transport = ASGITransport(get_asgi_application())
+
+    report = asyncio.run(main_async(args, transport, usernames))
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_report(report, previous)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
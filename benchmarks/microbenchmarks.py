@@ -0,0 +1,107 @@
+"""
+pytest-benchmark microbenchmarks for the serializers, the renderer and the
+querysets behind the hot endpoints. The file is not collected by the test
+suite; run it explicitly and compare runs with pytest-benchmark's storage:
+
+    pytest benchmarks/microbenchmarks.py --benchmark-autosave
+    pytest benchmarks/microbenchmarks.py --benchmark-compare
+
+BENCHMARK_TASKS / BENCHMARK_PROJECTS / BENCHMARK_USERS size the dataset.
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from projects.dataset import generate  # noqa: E402
+from projects.queries import (  # noqa: E402
+    filter_tasks,
+    project_list_queryset,
+    visible_tasks,
+)
+from projects.renderers import FastJSONRenderer  # noqa: E402
+from projects.serializers import (  # noqa: E402
+    ProjectSummarySerializer,
+    TaskSerializer,
+)
+from projects.stats import project_stats  # noqa: E402
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(scope="module")
+def dataset(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        data = generate(
+            users=int(os.environ.get("BENCHMARK_USERS", 200)),
+            projects=int(os.environ.get("BENCHMARK_PROJECTS", 200)),
+            tasks=int(os.environ.get("BENCHMARK_TASKS", 10_000)),
+        )
+        yield data
+        call_command("flush", interactive=False, verbosity=0)
+
+
+@pytest.fixture(scope="module")
+def member(dataset):
+    # The busiest member: the visibility filter has the most to match.
+    counts = {}
+    for user_ids in dataset["members"].values():
+        for user_id in user_ids:
+            counts[user_id] = counts.get(user_id, 0) + 1
+    return User.objects.get(pk=max(counts, key=counts.get))
+
+
+@pytest.fixture(scope="module")
+def tasks(dataset):
+    return list(visible_tasks(User(is_staff=True)).order_by("id")[:1000])
+
+
+@pytest.fixture(scope="module")
+def projects(dataset):
+    return list(project_list_queryset(User(is_staff=True), {}).order_by("id"))
+
+
+def test_task_list_drf_serializer(benchmark, tasks):
+    benchmark(lambda: serializers.ListSerializer(tasks, child=TaskSerializer()).data)
+
+
+def test_task_list_compiled_serializer(benchmark, tasks):
+    benchmark(lambda: TaskSerializer(tasks, many=True).data)
+
+
+def test_project_summary_compiled_serializer(benchmark, projects):
+    benchmark(lambda: ProjectSummarySerializer(projects, many=True).data)
+
+
+def test_render_json_renderer(benchmark, tasks):
+    data = TaskSerializer(tasks, many=True).data
+    benchmark(JSONRenderer().render, data)
+
+
+def test_render_fast_json_renderer(benchmark, tasks):
+    data = TaskSerializer(tasks, many=True).data
+    benchmark(FastJSONRenderer().render, data)
+
+
+def test_visible_task_page(benchmark, member):
+    benchmark(lambda: list(visible_tasks(member).order_by("id")[:50]))
+
+
+def test_filtered_task_page(benchmark, member):
+    params = {"status": "TODO", "ordering": "due_date"}
+    benchmark(lambda: list(filter_tasks(visible_tasks(member), params)[:50]))
+
+
+def test_project_list_page(benchmark, member):
+    benchmark(lambda: list(project_list_queryset(member, {}).order_by("id")[:50]))
+
+
+def test_project_stats(benchmark, dataset):
+    project_id = dataset["projects"][0].pk
+    benchmark(project_stats, project_id)
@@ -0,0 +1,89 @@
+"""
+Compare DRF's ListSerializer + JSONRenderer with the compiled list
+serializers + FastJSONRenderer on large task and project lists. Rows are
+fetched once; only serialization and rendering are timed.
+
+    python -m benchmarks.serialization --tasks 10000 --projects 1000
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks import setup_django
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def build_cases():
+    from django.contrib.auth.models import User
+    from rest_framework import serializers
+    from projects.queries import project_list_queryset, visible_tasks
+    from projects.serializers import ProjectSummarySerializer, TaskSerializer
+
+    staff = User(is_staff=True)
+    tasks = list(visible_tasks(staff).order_by("id"))
+    projects = list(project_list_queryset(staff, {}).order_by("id"))
+    return {
+        f"{len(tasks)} tasks": (
+            lambda: serializers.ListSerializer(tasks, child=TaskSerializer()).data,
+            lambda: TaskSerializer(tasks, many=True).data,
+        ),
+        f"{len(projects)} project summaries": (
+            lambda: serializers.ListSerializer(
+                projects, child=ProjectSummarySerializer()
+            ).data,
+            lambda: ProjectSummarySerializer(projects, many=True).data,
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--database", default=None)
+    args = parser.parse_args()
+
+    database = setup_django(args.database)
+    from rest_framework.renderers import JSONRenderer
+    from projects.dataset import generate
+    from projects import renderers
+
+    print(f"Seeding {args.tasks} tasks into {database}")
+    generate(users=args.users, projects=args.projects, tasks=args.tasks)
+    if renderers.orjson is None:
+        print("orjson is not installed; FastJSONRenderer uses the stdlib encoder")
+
+    for name, (drf, compiled) in build_cases().items():
+        data = drf()
+        assert compiled() == data, f"{name}: compiled output differs"
+        results = {
+            "serialize (DRF)": timed(drf, args.repeat),
+            "serialize (compiled)": timed(compiled, args.repeat),
+            "render (JSONRenderer)": timed(
+                lambda: JSONRenderer().render(data), args.repeat
+            ),
+            "render (FastJSONRenderer)": timed(
+                lambda: renderers.FastJSONRenderer().render(data), args.repeat
+            ),
+        }
+        print(f"\n== {name}")
+        for label, ms in results.items():
+            print(f"{label:28} {ms:9.2f} ms")
+        before = results["serialize (DRF)"] + results["render (JSONRenderer)"]
+        after = results["serialize (compiled)"] + results["render (FastJSONRenderer)"]
+        print(f"{'speedup':28} {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare the TaskViewSet hot queries with and without the Task.Meta.indexes.
+
+    python -m benchmarks.task_indexes --tasks 200000
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks import setup_django
+
+
+def build_queries(data):
+    from projects.models import Task
+
+    big_project = data["projects"][0]
+    member_id = data["members"][big_project.pk][0]
+    return {
+        "member tasks by status, due_date": lambda: Task.objects.filter(
+            project__members=member_id, status="TODO"
+        ).order_by("due_date"),
+        "project tasks by status, due_date": lambda: Task.objects.filter(
+            project=big_project, status="IN_PROGRESS"
+        ).order_by("due_date"),
+        "assignee tasks by status": lambda: Task.objects.filter(
+            assigned_to=member_id, status="IN_PROGRESS"
+        ),
+        "project tasks by -created_at": lambda: Task.objects.filter(
+            project=big_project
+        ).order_by("-created_at"),
+    }
+
+
+def measure(queries, repeat, page_size):
+    report = {}
+    for name, make_queryset in queries.items():
+        plan = make_queryset()[:page_size].explain()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(make_queryset()[:page_size])
+            timings.append((time.perf_counter() - started) * 1000)
+        report[name] = (plan, statistics.median(timings))
+    return report
+
+
+def set_indexes(enabled):
+    from django.db import connection
+    from projects.models import Task
+
+    with connection.schema_editor() as editor:
+        for index in Task._meta.indexes:
+            if enabled:
+                editor.add_index(Task, index)
+            else:
+                editor.remove_index(Task, index)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--database", default=None)
+    args = parser.parse_args()
+
+    database = setup_django(args.database)
+    from projects.dataset import generate
+
+    print(f"Seeding {args.tasks} tasks into {database}")
+    data = generate(users=args.users, projects=args.projects, tasks=args.tasks)
+    queries = build_queries(data)
+
+    set_indexes(False)
+    before = measure(queries, args.repeat, args.page_size)
+    set_indexes(True)
+    after = measure(queries, args.repeat, args.page_size)
+
+    for name in queries:
+        plan_before, ms_before = before[name]
+        plan_after, ms_after = after[name]
+        print(f"\n== {name}")
+        print(f"without indexes: {ms_before:8.2f} ms  | {plan_before}")
+        print(f"with indexes:    {ms_after:8.2f} ms  | {plan_after}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Concurrent task writers against a file-backed SQLite database, once with
+SQLite's defaults (rollback journal, synchronous=FULL, deferred
+transactions) and once with the settings.py profile (WAL, synchronous=NORMAL,
+busy_timeout, mmap, BEGIN IMMEDIATE). Each write is a Task insert with its
+signal work (project touch, stats, change log) in one transaction, and a
+reader thread keeps listing tasks meanwhile.
+
+    python -m benchmarks.write_contention --writers 8 --writes 200
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks import setup_django
+
+DEFAULT_PROFILE = {"pragmas": {"journal_mode": "DELETE"}, "options": {}}
+
+
+def tuned_profile():
+    from django.conf import settings
+
+    return {
+        "pragmas": settings.SQLITE_PRAGMAS,
+        "options": settings.DATABASES["default"].get("OPTIONS", {}),
+    }
+
+
+def use_profile(profile, directory, name):
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connections
+
+    connections.close_all()
+    database = connections["default"].settings_dict
+    database["NAME"] = os.path.join(directory, f"{name}.sqlite3")
+    database["OPTIONS"] = dict(profile["options"])
+    settings.SQLITE_PRAGMAS = profile["pragmas"]
+    call_command("migrate", verbosity=0)
+
+
+def run(writers, writes, readers):
+    from django.db import OperationalError, connection, transaction
+    from projects.models import Project, Task
+
+    project = Project.objects.create(name="Contention")
+    counts = {"committed": 0, "locked": 0, "reads": 0}
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def record(name):
+        with lock:
+            counts[name] += 1
+
+    def write(worker):
+        try:
+            for i in range(writes):
+                try:
+                    with transaction.atomic():
+                        Task.objects.create(project=project, title=f"w{worker}-{i}")
+                    record("committed")
+                except OperationalError:
+                    record("locked")
+        finally:
+            connection.close()
+
+    def read():
+        try:
+            while not done.is_set():
+                try:
+                    list(Task.objects.filter(project=project).order_by("-id")[:50])
+                    record("reads")
+                except OperationalError:
+                    record("locked")
+        finally:
+            connection.close()
+
+    reader_threads = [threading.Thread(target=read) for _ in range(readers)]
+    writer_threads = [threading.Thread(target=write, args=(n,)) for n in range(writers)]
+    started = time.perf_counter()
+    for thread in reader_threads + writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    for thread in reader_threads:
+        thread.join()
+    return counts, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=2)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    setup_django(os.path.join(directory, "setup.sqlite3"))
+    profiles = {"sqlite defaults": DEFAULT_PROFILE, "tuned profile": tuned_profile()}
+
+    for index, (name, profile) in enumerate(profiles.items()):
+        use_profile(profile, directory, f"profile-{index}")
+        counts, elapsed = run(args.writers, args.writes, args.readers)
+        print(f"\n== {name}: {profile['pragmas']} {profile['options']}")
+        print(f"committed writes: {counts['committed']:6d}")
+        print(f"locked errors:    {counts['locked']:6d}")
+        print(f"reads:            {counts['reads']:6d}")
+        print(f"writes/second:    {counts['committed'] / elapsed:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,9 +45,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "projects.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "projects.middleware.WriteAdmissionMiddleware",
+    "projects.middleware.ReplicaRoutingMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -76,11 +80,219 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# POSTGRES_DB switches to PostgreSQL. With POSTGRES_POOL_MAX_SIZE set,
+# connections come from a psycopg pool (which rules out CONN_MAX_AGE).
+# CONN_MAX_AGE defaults to 0: async views and event streams run over ASGI,
+# where each request gets a fresh thread and a persistent connection would
+# never be reused. Raise it only for WSGI-only deployments.
+# Without it the single-node SQLite profile applies SQLITE_PRAGMAS to every
+# new connection (projects/database.py).
+
+if os.environ.get("POSTGRES_DB"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ["POSTGRES_DB"],
+            "USER": os.environ.get("POSTGRES_USER", ""),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+            "HOST": os.environ.get("POSTGRES_HOST", ""),
+            "PORT": os.environ.get("POSTGRES_PORT", ""),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
+        }
+    }
+    if os.environ.get("POSTGRES_POOL_MAX_SIZE"):
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.environ.get("POSTGRES_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.environ["POSTGRES_POOL_MAX_SIZE"]),
+            "timeout": float(os.environ.get("POSTGRES_POOL_TIMEOUT", 10)),
+        }
+    else:
+        DATABASES["default"]["CONN_MAX_AGE"] = int(os.environ.get("CONN_MAX_AGE", 0))
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": int(os.environ.get("CONN_MAX_AGE", 0)),
+            # Writers take the lock at BEGIN and wait on busy_timeout instead
+            # of failing when a read transaction tries to upgrade.
+            "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+        }
+    }
+
+# Read replicas: POSTGRES_REPLICA_HOSTS or SQLITE_REPLICA_PATHS (comma
+# separated) add replica-N aliases that mirror default in tests. GETs to
+# DATABASE_REPLICA_ROUTES read from one of them; a write pins the client to
+# the primary for DATABASE_REPLICA_LAG_SECONDS (projects/routers.py).
+
+if os.environ.get("POSTGRES_DB"):
+    REPLICA_KEY, REPLICA_LOCATIONS = "HOST", os.environ.get("POSTGRES_REPLICA_HOSTS")
+else:
+    REPLICA_KEY, REPLICA_LOCATIONS = "NAME", os.environ.get("SQLITE_REPLICA_PATHS")
+
+DATABASE_REPLICAS = []
+for number, location in enumerate((REPLICA_LOCATIONS or "").split(","), start=1):
+    if not location.strip():
+        continue
+    alias = f"replica-{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        REPLICA_KEY: location.strip(),
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        "TEST": {"MIRROR": "default"},
     }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["projects.routers.ReplicaRouter"]
+
+DATABASE_REPLICA_ROUTES = [
+    "task-list",
+    "task-detail",
+    "project-list-create",
+    "project-detail",
+    "async-task-list",
+    "async-task-detail",
+    "async-project-list",
+    "async-project-detail",
+]
+
+DATABASE_REPLICA_LAG_SECONDS = int(os.environ.get("DATABASE_REPLICA_LAG_SECONDS", 5))
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is per process; point REDIS_URL at a shared instance when
+# running several workers so invalidation reaches all of them. CACHE_SHARED
+# says whether the default alias is shared: membership, authenticated user
+# and detail payload caches are only kept across requests when it is, and
+# `manage.py check --deploy` warns while it is not.
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "project-tracker",
+        }
+    }
+
+CACHE_SHARED = bool(os.environ.get("REDIS_URL"))
+
+PROJECT_MEMBERSHIP_CACHE_TIMEOUT = 300
+
+# projects.authentication.CachedJWTAuthentication keeps the token's user in
+# the cache above for this long while CACHE_SHARED; deactivation and
+# deletion invalidate it.
+AUTH_USER_CACHE_TIMEOUT = 60
+
+# Serialized project detail payloads. DjangoPayloadCache only caches while
+# CACHE_SHARED, since its invalidations must reach every worker;
+# projects.detail_cache.LRUPayloadCache keeps them in process (OPTIONS:
+# timeout, max_entries) for single-worker deployments.
+
+PROJECT_DETAIL_CACHE = {
+    "BACKEND": "projects.detail_cache.DjangoPayloadCache",
+    "OPTIONS": {"timeout": 300, "alias": "default"},
+}
+
+# Per-URL-name request histograms served at /metrics (projects/metrics.py).
+# Requests running more than QUERY_BUDGET queries are logged as warnings by
+# the projects.metrics logger; TOKEN requires "Authorization: Bearer <token>"
+# from the scraper. Without a TOKEN /metrics answers 403 unless DEBUG.
+
+REQUEST_METRICS = {
+    "QUERY_BUDGET": (
+        int(os.environ["REQUEST_QUERY_BUDGET"])
+        if os.environ.get("REQUEST_QUERY_BUDGET")
+        else None
+    ),
+    "TOKEN": os.environ.get("METRICS_TOKEN"),
+}
+
+# Write admission control (projects/throttling.py). Unsafe requests to views
+# with a listed throttle_scope draw from token buckets that refill at "rate"
+# and hold "burst" tokens, one per user and one per endpoint; an empty
+# bucket answers 429 with Retry-After. CacheBucketStore shares buckets
+# through a cache alias (OPTIONS: alias, timeout); LocalBucketStore keeps
+# exact per-process buckets (OPTIONS: max_entries).
+
+WRITE_THROTTLES = {
+    "STORE": {
+        "BACKEND": "projects.throttling.CacheBucketStore",
+        "OPTIONS": {"alias": "default"},
+    },
+    "SCOPES": {
+        "tasks": {
+            "user": {"rate": "120/min", "burst": 30},
+            "endpoint": {"rate": "3000/min", "burst": 300},
+        },
+        "add-member": {
+            "user": {"rate": "30/min", "burst": 10},
+            "endpoint": {"rate": "600/min", "burst": 60},
+        },
+        "jobs": {"user": {"rate": "10/min", "burst": 5}},
+    },
+}
+
+# Unsafe requests running at once per process; see WriteAdmissionMiddleware.
+
+WRITE_CONCURRENCY = {
+    "MAX_IN_FLIGHT": int(os.environ.get("WRITE_MAX_IN_FLIGHT", 16)),
+    "MAX_QUEUED": int(os.environ.get("WRITE_MAX_QUEUED", 64)),
+    "QUEUE_TIMEOUT": 2.0,
+    "RETRY_AFTER": 1,
+    "EXEMPT_PATHS": ["/api/token/"],
+}
+
+# Background jobs (projects/jobs.py) run by `manage.py run_jobs`. A failing
+# job is retried up to MAX_ATTEMPTS times, RETRY_DELAY seconds times the
+# attempt apart; one running for longer than STALE_AFTER is assumed to have
+# lost its worker and is queued again. Export files go to EXPORT_DIR, which
+# must be shared by the workers and web servers, and are removed
+# EXPORT_RETENTION seconds after the job finishes.
+
+JOB_QUEUE = {
+    "WORKERS": int(os.environ.get("JOB_WORKERS", 2)),
+    "POLL_INTERVAL": 1.0,
+    "MAX_ATTEMPTS": 3,
+    "RETRY_DELAY": 30,
+    "STALE_AFTER": 3600,
+    "DELETE_CHUNK_SIZE": 1000,
+    "EXPORT_DIR": os.environ.get("JOB_EXPORT_DIR", str(BASE_DIR / "exports")),
+    "EXPORT_RETENTION": 7 * 86400,
+}
+
+# Task change feed (/api/tasks/changes/). Entries younger than
+# SETTLE_SECONDS are not served yet, so rows from transactions still in
+# flight on PostgreSQL cannot be skipped; keep it above the longest write
+# transaction. `manage.py prune_change_log` drops entries older than
+# RETENTION_DAYS; cursors from before that answer 410 Gone.
+
+CHANGE_FEED = {
+    "SETTLE_SECONDS": 5 if os.environ.get("POSTGRES_DB") else 0,
+    "RETENTION_DAYS": 30,
+}
+
+# Live project streams (/api/projects/<pk>/events/, served over ASGI only)
+
+PROJECT_EVENTS = {
+    "BROKER": "projects.events.InMemoryBroker",
+    "OPTIONS": {"max_queue": 100},
+    "HEARTBEAT_SECONDS": 15,
 }
 
 
@@ -127,7 +339,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "projects.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
@@ -137,6 +349,13 @@ REST_FRAMEWORK = {
         "rest_framework.filters.OrderingFilter",
         "rest_framework.filters.SearchFilter",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "projects.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_THROTTLE_CLASSES": [
+        "projects.throttling.TokenBucketThrottle",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
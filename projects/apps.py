@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ProjectsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "projects"
+
+    def ready(self):
+        from . import checks, database, schema, signals  # noqa: F401
+        from .search import install_search_schema
+
+        post_migrate.connect(install_search_schema, sender=self)
@@ -0,0 +1,181 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed, NotFound, ValidationError
+from rest_framework.request import Request
+from .authentication import CachedJWTAuthentication
+from .fieldsets import get_field_selection
+from .events import format_sse, get_broker, project_channel
+from .membership import aget_user_project_ids
+from .models import Project
+from .pagination import ProjectCursorPagination, TaskKeysetPagination
+from .queries import (
+    filter_tasks,
+    project_detail_queryset,
+    project_list_queryset,
+    select_task_fields,
+    visible_tasks,
+)
+from .serializers import ProjectSerializer, ProjectSummarySerializer, TaskSerializer
+
+
+def error_response(detail, status):
+    response = JsonResponse({"detail": detail}, status=status)
+    if status == 401:
+        response["WWW-Authenticate"] = 'Bearer realm="api"'
+    return response
+
+
+def unauthorized():
+    return error_response("Authentication credentials were not provided.", 401)
+
+
+def forbidden():
+    return error_response("You do not have permission to perform this action.", 403)
+
+
+async def authenticate(request):
+    # Bearer tokens only, as REST_FRAMEWORK's authentication classes allow.
+    try:
+        result = await sync_to_async(CachedJWTAuthentication().authenticate)(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result is not None else None
+
+
+async def project_ids_for(user):
+    if user.is_staff:
+        return None
+    return await aget_user_project_ids(user)
+
+
+async def check_project_access(request, pk):
+    user = await authenticate(request)
+    if user is None:
+        return None, unauthorized()
+    if not await Project.objects.filter(pk=pk).aexists():
+        return None, error_response("No Project matches the given query.", 404)
+    project_ids = await project_ids_for(user)
+    if project_ids is not None and pk not in project_ids:
+        return None, forbidden()
+    return user, None
+
+
+async def project_list(request):
+    user = await authenticate(request)
+    if user is None:
+        return unauthorized()
+    drf_request = Request(request)
+    try:
+        selection = get_field_selection(
+            drf_request.query_params, ProjectSummarySerializer
+        )
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+    projects = project_list_queryset(
+        user, drf_request.query_params, await project_ids_for(user), selection
+    )
+    paginator = ProjectCursorPagination()
+    try:
+        page = await paginator.apaginate_queryset(projects, drf_request)
+    except NotFound as exc:
+        return error_response(str(exc.detail), 404)
+    data = ProjectSummarySerializer(page, many=True, selection=selection).data
+    return JsonResponse(paginator.get_paginated_response(data).data)
+
+
+async def project_detail(request, pk):
+    user = await authenticate(request)
+    if user is None:
+        return unauthorized()
+    try:
+        selection = get_field_selection(request.GET, ProjectSerializer)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+    project = await project_detail_queryset(selection).filter(pk=pk).afirst()
+    if project is None:
+        return error_response("No Project matches the given query.", 404)
+    project_ids = await project_ids_for(user)
+    if project_ids is not None and pk not in project_ids:
+        return forbidden()
+    return JsonResponse(ProjectSerializer(project, selection=selection).data)
+
+
+async def task_list(request):
+    user = await authenticate(request)
+    if user is None:
+        return unauthorized()
+    drf_request = Request(request)
+    tasks = visible_tasks(user, await project_ids_for(user))
+    try:
+        selection = get_field_selection(drf_request.query_params, TaskSerializer)
+        tasks = filter_tasks(tasks, drf_request.query_params)
+        tasks = select_task_fields(tasks, selection)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+
+    paginator = TaskKeysetPagination()
+    try:
+        page = await paginator.apaginate_queryset(tasks, drf_request)
+    except NotFound as exc:
+        return error_response(str(exc.detail), 404)
+    data = TaskSerializer(page, many=True, selection=selection).data
+    return JsonResponse(paginator.get_paginated_response(data).data)
+
+
+async def task_detail(request, pk):
+    user = await authenticate(request)
+    if user is None:
+        return unauthorized()
+    try:
+        selection = get_field_selection(request.GET, TaskSerializer)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+    tasks = select_task_fields(
+        visible_tasks(user, await project_ids_for(user)), selection
+    )
+    task = await tasks.filter(pk=pk).afirst()
+    if task is None:
+        return error_response("No Task matches the given query.", 404)
+    return JsonResponse(TaskSerializer(task, selection=selection).data)
+
+
+def closes_stream(message, user_id):
+    if message["type"] == "project.deleted":
+        return True
+    return message["type"] == "members.removed" and user_id in message["user_ids"]
+
+
+async def event_stream(project_id, user_id, heartbeat):
+    subscription = get_broker().subscribe(project_channel(project_id))
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            if subscription.overflowed:
+                yield format_sse({"type": "stream.overflow", "project_id": project_id})
+                break
+            try:
+                message = await subscription.get(heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(message)
+            if closes_stream(message, user_id):
+                break
+    finally:
+        subscription.close()
+
+
+async def project_events(request, pk):
+    user, error = await check_project_access(request, pk)
+    if error is not None:
+        return error
+    response = StreamingHttpResponse(
+        event_stream(pk, user.pk, settings.PROJECT_EVENTS["HEARTBEAT_SECONDS"]),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,111 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from .membership import project_ids_key
+
+# Columns carried by a cached user, in model order as from_db expects; the
+# rest of the row is deferred and loads on first access. Saving any of
+# AUTH_FIELDS bumps the auth version.
+CACHED_USER_FIELDS = tuple(
+    field.attname
+    for field in User._meta.concrete_fields
+    if field.attname in {"id", "username", "is_active", "is_staff", "is_superuser"}
+)
+AUTH_FIELDS = {"password", *CACHED_USER_FIELDS}
+
+
+def _version_key(user_id):
+    return f"projects:auth-version:{user_id}"
+
+
+def _user_key(user_id):
+    return f"projects:auth-user:{user_id}"
+
+
+def auth_version(user_id):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_auth_versions(user_ids):
+    version = time.time_ns()
+    cache.set_many({_version_key(user_id): version for user_id in user_ids}, None)
+
+
+def invalidate_user_auth(user_ids):
+    # Bump now and again after commit: a request that read the row before
+    # the commit stored its entry under a version that is already stale.
+    user_ids = list(user_ids)
+    bump_auth_versions(user_ids)
+    transaction.on_commit(lambda: bump_auth_versions(user_ids))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    # JWTAuthentication plus a short-lived cache of the token's user, so an
+    # authenticated request costs a cache read instead of a user query.
+    # Entries are checked against the user's auth version, which
+    # deactivation, deletion and password or role changes bump. A bump only
+    # reaches other workers through a shared cache, so without CACHE_SHARED
+    # every request loads the user as simplejwt does.
+
+    def get_user(self, validated_token):
+        if not settings.CACHE_SHARED:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        keys = [_version_key(user_id), _user_key(user_id), project_ids_key(user_id)]
+        cached = cache.get_many(keys)
+        version = cached.get(keys[0]) or auth_version(user_id)
+        entry = cached.get(keys[1])
+        if entry is None or entry["version"] != version:
+            entry = self.load_user(user_id, version)
+
+        user = User.from_db(DEFAULT_DB_ALIAS, CACHED_USER_FIELDS, entry["values"])
+        if keys[2] in cached:
+            user._project_ids = cached[keys[2]]
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != entry["revoke"]:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+        return user
+
+    def load_user(self, user_id, version):
+        # From the primary: the entry is trusted for access checks.
+        row = (
+            User.objects.using(DEFAULT_DB_ALIAS)
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list("password", *CACHED_USER_FIELDS)
+            .first()
+        )
+        if row is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        password, *values = row
+        entry = {
+            "version": version,
+            "values": values,
+            "revoke": get_md5_hash_password(password),
+        }
+        cache.set(_user_key(user_id), entry, settings.AUTH_USER_CACHE_TIMEOUT)
+        return entry
@@ -0,0 +1,186 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from .models import Project, Task, locked_stats_keys
+from .changelog import record_task_upserts
+from .detail_cache import invalidate_project_details
+from .events import publish_tasks_changed
+from .membership import get_membership_resolver
+from .stats import record_tasks_changed
+
+BULK_MAX_ITEMS = 1000
+BULK_BATCH_SIZE = 500
+
+
+class BulkTaskCreateItem(serializers.ModelSerializer):
+    project_id = serializers.IntegerField()
+    assigned_to_id = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Task
+        fields = [
+            "title",
+            "description",
+            "status",
+            "due_date",
+            "project_id",
+            "assigned_to_id",
+        ]
+
+
+class BulkStatusItem(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=[c[0] for c in Task.STATUS_CHOICES])
+
+
+class BulkAssignItem(serializers.Serializer):
+    id = serializers.IntegerField()
+    assigned_to_id = serializers.IntegerField(allow_null=True)
+
+
+def _error(index, errors):
+    return {"index": index, "status": "error", "errors": errors}
+
+
+def _validate_items(items, item_serializer_class, results):
+    valid = []
+    for index, item in enumerate(items):
+        serializer = item_serializer_class(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = _error(index, serializer.errors)
+    return valid
+
+
+def bulk_create_tasks(request, items):
+    results = [None] * len(items)
+    valid = _validate_items(items, BulkTaskCreateItem, results)
+
+    projects = Project.objects.in_bulk({data["project_id"] for _, data in valid})
+    resolver = get_membership_resolver(request)
+    resolver.prime(projects.keys())
+
+    pending = []
+    for index, data in valid:
+        project = projects.get(data["project_id"])
+        assignee_id = data.get("assigned_to_id")
+        if project is None:
+            results[index] = _error(index, {"project_id": "Project does not exist"})
+        elif not resolver.can_access(request.user, project):
+            results[index] = _error(
+                index, {"detail": "You are not allowed to create tasks in this project"}
+            )
+        elif assignee_id is not None and assignee_id not in resolver.member_ids(
+            project
+        ):
+            results[index] = _error(
+                index, {"assigned_to_id": "Assignee must be a member of the project"}
+            )
+        else:
+            data["project"] = projects[data.pop("project_id")]
+            pending.append((index, Task(**data)))
+
+    with transaction.atomic():
+        created = Task.objects.bulk_create(
+            [task for _, task in pending], batch_size=BULK_BATCH_SIZE
+        )
+        project_ids = {task.project_id for task in created}
+        Project.objects.filter(pk__in=project_ids).touch()
+        invalidate_project_details(project_ids)
+        record_tasks_changed(created, created=True)
+        record_task_upserts((task.pk, task.project_id) for task in created)
+        publish_tasks_changed(created, "tasks.created")
+
+    for (index, _), task in zip(pending, created):
+        results[index] = {"index": index, "status": "created", "id": task.id}
+    return results
+
+
+def _load_tasks(queryset, valid, results):
+    tasks = queryset.in_bulk({data["id"] for _, data in valid})
+    found = []
+    for index, data in valid:
+        task = tasks.get(data["id"])
+        if task is None:
+            results[index] = _error(index, {"id": "Task not found"})
+        else:
+            found.append((index, data, task))
+    return found
+
+
+def _save_updates(found, fields, results):
+    changed = {task.pk: task for _, _, task in found}
+    now = timezone.now()
+    for task in changed.values():
+        task.updated_at = now
+    with transaction.atomic():
+        previous = locked_stats_keys(changed, Task.objects.db)
+        for task_id in changed.keys() - previous.keys():
+            # Deleted since it was loaded.
+            del changed[task_id]
+        for task_id, key in previous.items():
+            changed[task_id]._stats_key = key
+        Task.objects.bulk_update(
+            list(changed.values()), fields + ["updated_at"], batch_size=BULK_BATCH_SIZE
+        )
+        project_ids = {task.project_id for task in changed.values()}
+        Project.objects.filter(pk__in=project_ids).touch()
+        invalidate_project_details(project_ids)
+        record_tasks_changed(list(changed.values()), update_fields=fields)
+        record_task_upserts((task.pk, task.project_id) for task in changed.values())
+        publish_tasks_changed(changed.values(), "tasks.updated")
+    for index, data, _ in found:
+        if data["id"] in changed:
+            results[index] = {"index": index, "status": "updated", "id": data["id"]}
+        else:
+            results[index] = _error(index, {"id": "Task not found"})
+    return results
+
+
+def bulk_set_status(request, queryset, items):
+    results = [None] * len(items)
+    valid = _validate_items(items, BulkStatusItem, results)
+    found = _load_tasks(queryset, valid, results)
+
+    resolver = get_membership_resolver(request)
+    resolver.prime({task.project_id for _, _, task in found})
+
+    allowed = []
+    for index, data, task in found:
+        if not resolver.can_access(request.user, task.project):
+            results[index] = _error(
+                index,
+                {"detail": "You are not allowed to change task status in this project"},
+            )
+            continue
+        task.status = data["status"]
+        allowed.append((index, data, task))
+    return _save_updates(allowed, ["status"], results)
+
+
+def bulk_assign(request, queryset, items):
+    results = [None] * len(items)
+    valid = _validate_items(items, BulkAssignItem, results)
+    found = _load_tasks(queryset, valid, results)
+
+    resolver = get_membership_resolver(request)
+    resolver.prime({task.project_id for _, _, task in found})
+
+    allowed = []
+    for index, data, task in found:
+        assignee_id = data["assigned_to_id"]
+        if not resolver.can_access(request.user, task.project):
+            results[index] = _error(
+                index, {"detail": "You are not allowed to assign tasks in this project"}
+            )
+        elif assignee_id is not None and assignee_id not in resolver.member_ids(
+            task.project
+        ):
+            results[index] = _error(
+                index, {"assigned_to_id": "Assignee must be a member of the project"}
+            )
+        else:
+            task.assigned_to_id = assignee_id
+            allowed.append((index, data, task))
+    return _save_updates(allowed, ["assigned_to"], results)
@@ -0,0 +1,160 @@
+import base64
+import binascii
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+from .membership import get_user_project_ids
+from .models import ChangeLog, Task
+
+CURSOR_PREFIX = "v1:"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorExpired(Exception):
+    pass
+
+
+def encode_cursor(entry_id):
+    return base64.urlsafe_b64encode(f"{CURSOR_PREFIX}{entry_id}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if not raw.startswith(CURSOR_PREFIX) or not raw[len(CURSOR_PREFIX) :].isdigit():
+        raise InvalidCursor(cursor)
+    return int(raw[len(CURSOR_PREFIX) :])
+
+
+def record_task_upserts(tasks):
+    ChangeLog.objects.bulk_create(
+        ChangeLog(kind=ChangeLog.TASK_UPSERT, project_id=project_id, task_id=task_id)
+        for task_id, project_id in tasks
+    )
+
+
+def record_task_delete(task, project_id=None):
+    # project_id: the project a moved task left, when not its current one.
+    ChangeLog.objects.create(
+        kind=ChangeLog.TASK_DELETE,
+        project_id=project_id or task.project_id,
+        task_id=task.pk,
+    )
+
+
+def record_project_delete(project, member_ids):
+    # One unscoped entry for staff plus one per member, since members lose
+    # visibility of the project id once it is gone.
+    ChangeLog.objects.bulk_create(
+        ChangeLog(kind=ChangeLog.PROJECT_DELETE, project_id=project.pk, user_id=uid)
+        for uid in [None, *member_ids]
+    )
+
+
+def record_membership(kind, project_ids, user_ids):
+    ChangeLog.objects.bulk_create(
+        ChangeLog(kind=kind, project_id=project_id, user_id=user_id)
+        for project_id in project_ids
+        for user_id in user_ids
+    )
+
+
+def settled_entries():
+    # Ids are handed out at insert, not at commit: on PostgreSQL a reader
+    # can see id 11 while id 10 is still uncommitted, and a cursor past 11
+    # would skip 10 for good. Entries younger than SETTLE_SECONDS are held
+    # back, which is safe while no transaction writing to the log stays
+    # open longer than that. SQLite commits writers one at a time.
+    entries = ChangeLog.objects.all()
+    settle = settings.CHANGE_FEED["SETTLE_SECONDS"]
+    if settle:
+        cutoff = timezone.now() - timedelta(seconds=settle)
+        entries = entries.filter(created_at__lte=cutoff)
+    return entries
+
+
+def head_cursor():
+    return encode_cursor(settled_entries().aggregate(last=Max("id"))["last"] or 0)
+
+
+def prune_change_log(batch_size=10_000):
+    # Drops entries older than RETENTION_DAYS, always keeping the newest so
+    # that expired cursors stay recognisable.
+    cutoff = timezone.now() - timedelta(days=settings.CHANGE_FEED["RETENTION_DAYS"])
+    newest = ChangeLog.objects.aggregate(last=Max("id"))["last"]
+    deleted = 0
+    while newest is not None:
+        ids = list(
+            ChangeLog.objects.filter(id__lt=newest, created_at__lt=cutoff)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        deleted += ChangeLog.objects.filter(id__in=ids).delete()[0]
+    return deleted
+
+
+def build_change_feed(user, after, limit):
+    # A cursor is the last entry its client has seen; once pruned, the
+    # entries after it may be gone too. One just before the oldest entry
+    # has missed nothing.
+    oldest = ChangeLog.objects.aggregate(first=Min("id"))["first"]
+    if after and oldest is not None and after < oldest - 1:
+        raise CursorExpired(after)
+
+    entries = settled_entries().filter(id__gt=after).order_by("id")
+    if user.is_staff:
+        entries = entries.filter(user_id__isnull=True)
+    else:
+        entries = entries.filter(
+            Q(project_id__in=get_user_project_ids(user), user_id__isnull=True)
+            | Q(user_id=user.pk)
+        )
+    entries = list(
+        entries.values_list("id", "kind", "project_id", "task_id")[: limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Later entries win: a task upserted then deleted is only a tombstone.
+    task_state = {}
+    deleted_projects = set()
+    resync_projects = set()
+    for _, kind, project_id, task_id in entries:
+        if kind in (ChangeLog.TASK_UPSERT, ChangeLog.TASK_DELETE):
+            task_state[task_id] = kind
+        elif kind in (ChangeLog.PROJECT_DELETE, ChangeLog.MEMBER_REMOVED):
+            deleted_projects.add(project_id)
+            resync_projects.discard(project_id)
+        elif kind == ChangeLog.MEMBER_ADDED:
+            resync_projects.add(project_id)
+            deleted_projects.discard(project_id)
+
+    upserted_ids = [
+        task_id for task_id, kind in task_state.items() if kind == ChangeLog.TASK_UPSERT
+    ]
+    tasks = Task.objects.select_related("project", "assigned_to").filter(
+        pk__in=upserted_ids
+    )
+    if not user.is_staff:
+        tasks = tasks.filter(project_id__in=get_user_project_ids(user))
+    changed = list(tasks.order_by("id"))
+
+    found = {task.pk for task in changed}
+    deleted = sorted(task_id for task_id in task_state if task_id not in found)
+    return {
+        "changed": changed,
+        "deleted": deleted,
+        "deleted_projects": sorted(deleted_projects),
+        "resync_projects": sorted(resync_projects),
+        "cursor": encode_cursor(entries[-1][0]) if entries else encode_cursor(after),
+        "has_more": has_more,
+    }
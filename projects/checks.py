@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+@register(Tags.caches)
+def check_cache_shared(app_configs, **kwargs):
+    if settings.CACHE_SHARED and isinstance(caches["default"], PROCESS_LOCAL_CACHES):
+        return [
+            Error(
+                "CACHE_SHARED is set but the default cache is local to each process.",
+                hint="Point REDIS_URL at a shared cache, or unset CACHE_SHARED.",
+                id="projects.E001",
+            )
+        ]
+    return []
+
+
+@register(Tags.caches, deploy=True)
+def check_cache_deploy(app_configs, **kwargs):
+    if settings.CACHE_SHARED:
+        return []
+    return [
+        Warning(
+            "The default cache is local to each process, so membership lookups, "
+            "authenticated users and project detail payloads are not cached "
+            "across requests.",
+            hint="Set REDIS_URL when running more than one worker process.",
+            id="projects.W001",
+        )
+    ]
@@ -0,0 +1,75 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+from .fieldsets import FieldSelection
+from .membership import get_membership_resolver, visible_projects_q
+from .models import Project, Task
+from .queries import visible_projects
+
+
+def make_etag(*parts):
+    return hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def conditional(compute_state):
+    # compute_state(request, ...) -> (etag, last_modified), run once per request
+    attr = f"_conditional_{compute_state.__name__}"
+
+    def state(request, *args, **kwargs):
+        if not hasattr(request, attr):
+            setattr(request, attr, compute_state(request, *args, **kwargs))
+        return getattr(request, attr)
+
+    return condition(
+        etag_func=lambda request, *args, **kwargs: state(request, *args, **kwargs)[0],
+        last_modified_func=lambda request, *args, **kwargs: state(
+            request, *args, **kwargs
+        )[1],
+    )
+
+
+def _projects_etag(request, projects):
+    # Every task and membership change bumps Project.updated_at, so the newest
+    # timestamp plus the row count changes whenever the listing could.
+    stats = projects.aggregate(last=Max("updated_at"), count=Count("id"))
+    return make_etag(
+        request.user.pk, request.get_full_path(), stats["last"], stats["count"]
+    )
+
+
+def project_list_state(request, *args, **kwargs):
+    return _projects_etag(request, visible_projects(request.user)), None
+
+
+def project_detail_state(request, pk, *args, **kwargs):
+    if not get_membership_resolver(request).can_access(request.user, Project(pk=pk)):
+        return None, None
+    updated_at = (
+        Project.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+    )
+    if updated_at is None:
+        return None, None
+    selection = FieldSelection.from_params(request.query_params).key()
+    return make_etag("project", pk, updated_at, selection), updated_at
+
+
+def task_list_state(request, *args, **kwargs):
+    projects = visible_projects(request.user)
+    project_id = request.query_params.get("project")
+    if project_id and project_id.isdigit():
+        projects = projects.filter(pk=project_id)
+    return _projects_etag(request, projects), None
+
+
+def task_detail_state(request, pk=None, *args, **kwargs):
+    if not str(pk).isdigit():
+        return None, None
+    tasks = Task.objects.filter(pk=pk)
+    if not request.user.is_staff:
+        tasks = tasks.filter(visible_projects_q(request.user, prefix="project__"))
+    updated_at = tasks.values_list("updated_at", flat=True).first()
+    if updated_at is None:
+        return None, None
+    selection = FieldSelection.from_params(request.query_params).key()
+    return make_etag("task", pk, updated_at, selection), updated_at
@@ -0,0 +1,82 @@
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from .models import Project, Task
+from .stats import rebuild_project_stats
+
+STATUS_WEIGHTS = {"TODO": 5, "IN_PROGRESS": 2, "DONE": 3}
+
+
+def generate(
+    users=200,
+    projects=50,
+    tasks=100_000,
+    members_per_project=8,
+    seed=0,
+    batch_size=5000,
+    password=None,
+):
+    # members_per_project is the mean; boards range from half to one and a
+    # half times that. password (hashed once) lets load tests log in.
+    rng = random.Random(seed)
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    today = date.today()
+
+    with transaction.atomic():
+        hashed = make_password(password)
+        user_objs = User.objects.bulk_create(
+            [User(username=f"bench-{seed}-{i}", password=hashed) for i in range(users)],
+            batch_size=batch_size,
+        )
+        project_objs = Project.objects.bulk_create(
+            [
+                Project(name=f"Project {i}", description=f"Benchmark project {i}")
+                for i in range(projects)
+            ],
+            batch_size=batch_size,
+        )
+
+        Membership = Project.members.through
+        members = {}
+        rows = []
+        for project in project_objs:
+            size = rng.randint(
+                max(1, members_per_project // 2), max(1, members_per_project * 3 // 2)
+            )
+            chosen = rng.sample(user_objs, min(size, len(user_objs)))
+            members[project.pk] = [u.pk for u in chosen]
+            rows.extend(Membership(project_id=project.pk, user_id=u.pk) for u in chosen)
+        Membership.objects.bulk_create(rows, batch_size=batch_size)
+
+    # project sizes follow a long tail: a few boards hold most tasks
+    project_weights = [1 / (rank + 1) for rank in range(len(project_objs))]
+    remaining = tasks
+    while remaining > 0:
+        chunk = min(batch_size, remaining)
+        batch = []
+        for project in rng.choices(project_objs, project_weights, k=chunk):
+            assignee = rng.choice(members[project.pk] + [None])
+            due = rng.random() < 0.7
+            batch.append(
+                Task(
+                    project_id=project.pk,
+                    title=f"Task {rng.randrange(10**9)}",
+                    description="Generated benchmark task",
+                    status=rng.choices(statuses, weights)[0],
+                    assigned_to_id=assignee,
+                    due_date=(
+                        today + timedelta(days=rng.randint(-60, 120)) if due else None
+                    ),
+                )
+            )
+        with transaction.atomic():
+            Task.objects.bulk_create(batch, batch_size=batch_size)
+        remaining -= chunk
+
+    # bulk_create skips the signals that keep the stats tables current.
+    rebuild_project_stats([project.pk for project in project_objs])
+    return {"users": user_objs, "projects": project_objs, "members": members}
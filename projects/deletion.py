@@ -0,0 +1,141 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models.signals import post_delete, pre_delete
+from .changelog import record_task_upserts
+from .detail_cache import invalidate_project_details
+from .models import Project, Task
+from .signals import membership_updated
+from .stats import apply_stats_deltas, stats_deltas
+
+# Deletes behind big projects and users, in batches of DELETE_CHUNK_SIZE
+# rows with one transaction each: memory is bounded by the batch and no
+# lock is held for longer than one batch. Unless signals are asked for,
+# rows are read as values, not model instances, and each batch does in bulk
+# what the per-row signal handlers would do.
+
+
+def _execute_in(sql, ids, using):
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(sql % ", ".join(["%s"] * len(ids)), ids)
+
+
+def _delete_in(model, ids, using):
+    quote = connections[using].ops.quote_name
+    _execute_in(
+        f"DELETE FROM {quote(model._meta.db_table)} "
+        f"WHERE {quote(model._meta.pk.column)} IN (%s)",
+        ids,
+        using,
+    )
+
+
+def _nullify_in(model, field_name, ids, using):
+    quote = connections[using].ops.quote_name
+    column = model._meta.get_field(field_name).column
+    _execute_in(
+        f"UPDATE {quote(model._meta.db_table)} SET {quote(column)} = NULL "
+        f"WHERE {quote(model._meta.pk.column)} IN (%s)",
+        ids,
+        using,
+    )
+
+
+def _chunk_size(chunk_size):
+    return chunk_size or settings.JOB_QUEUE["DELETE_CHUNK_SIZE"]
+
+
+def delete_project(project, chunk_size=None, send_signals=False, using=None):
+    # Tasks first, batch by batch. send_signals sends pre_delete and
+    # post_delete for each task with the project as origin, as a cascade
+    # would (task_deleted leaves those to the project tombstone); that loads
+    # one batch of instances at a time. The project row goes last through
+    # the ORM, so its own signals and the membership and stats cascades,
+    # which are single DELETEs, behave as before.
+    using = using or DEFAULT_DB_ALIAS
+    chunk_size = _chunk_size(chunk_size)
+    deleted = 0
+    while True:
+        with transaction.atomic(using=using):
+            # The project bump orders this batch against task writers.
+            Project.objects.using(using).filter(pk=project.pk).touch()
+            rows = list(
+                Task.objects.using(using)
+                .filter(project_id=project.pk)
+                .order_by("pk")
+                .values_list("pk", "status", "assigned_to_id", "due_date")[:chunk_size]
+            )
+            if not rows:
+                break
+            ids = [row[0] for row in rows]
+            instances = []
+            if send_signals:
+                instances = list(Task.objects.using(using).filter(pk__in=ids))
+                for task in instances:
+                    pre_delete.send(Task, instance=task, using=using, origin=project)
+            _delete_in(Task, ids, using)
+            for task in instances:
+                post_delete.send(Task, instance=task, using=using, origin=project)
+            apply_stats_deltas(
+                stats_deltas(removed=[(project.pk, *row[1:]) for row in rows])
+            )
+            invalidate_project_details([project.pk])
+        deleted += len(rows)
+
+    with transaction.atomic(using=using):
+        project.delete(using=using)
+    return {"deleted_tasks": deleted}
+
+
+def delete_user(user, chunk_size=None, using=None):
+    # The account is deactivated first, which also revokes its cached
+    # authentication, so it cannot write while its rows are detached.
+    using = using or DEFAULT_DB_ALIAS
+    chunk_size = _chunk_size(chunk_size)
+    if user.is_active:
+        user.is_active = False
+        user.save(update_fields=["is_active"], using=using)
+
+    unassigned = 0
+    while True:
+        with transaction.atomic(using=using):
+            rows = list(
+                Task.objects.using(using)
+                .filter(assigned_to_id=user.pk)
+                .order_by("pk")
+                .values_list("pk", "project_id", "status", "due_date")[:chunk_size]
+            )
+            if not rows:
+                break
+            project_ids = sorted({row[1] for row in rows})
+            Project.objects.using(using).filter(pk__in=project_ids).touch()
+            _nullify_in(Task, "assigned_to", [row[0] for row in rows], using)
+            apply_stats_deltas(
+                stats_deltas(
+                    removed=[(p, status, user.pk, due) for _, p, status, due in rows],
+                    added=[(p, status, None, due) for _, p, status, due in rows],
+                )
+            )
+            record_task_upserts((row[0], row[1]) for row in rows)
+            invalidate_project_details(project_ids)
+        unassigned += len(rows)
+
+    through = Project.members.through
+    removed = 0
+    while True:
+        with transaction.atomic(using=using):
+            rows = list(
+                through.objects.using(using)
+                .filter(user_id=user.pk)
+                .order_by("pk")
+                .values_list("pk", "project_id")[:chunk_size]
+            )
+            if not rows:
+                break
+            _delete_in(through, [row[0] for row in rows], using)
+            membership_updated("post_remove", [row[1] for row in rows], [user.pk])
+        removed += len(rows)
+
+    with transaction.atomic(using=using):
+        user.delete(using=using)
+    return {"unassigned_tasks": unassigned, "removed_memberships": removed}
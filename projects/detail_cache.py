@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+# Serialized ProjectDetailApiView payloads, keyed by project, field selection
+# and a per-project generation. Invalidation bumps the generation, so a
+# request that read the database before a write cannot store its stale
+# payload under the key later requests look up. Generations are time_ns()
+# stamps, which lets a store be refused while replicas may still lag.
+
+
+class CacheMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def record(self, name, count=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def snapshot(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / total if total else None,
+            }
+
+
+class Entry:
+    def __init__(self, backend, key, payload):
+        self.backend = backend
+        self.key = key
+        self.payload = payload
+
+    def age(self):
+        return (time.time_ns() - self.key[1]) / 1e9 if self.key[1] else 0
+
+    def store(self, payload, min_age=0):
+        # min_age: skip payloads read from a replica that may not have
+        # replayed the write behind the last invalidation yet.
+        if self.key is not None and self.age() >= min_age:
+            self.backend.store(self.key, payload)
+
+
+class BasePayloadCache:
+    enabled = True
+
+    def __init__(self, timeout=60):
+        self.timeout = timeout
+        self.metrics = CacheMetrics()
+
+    def lookup(self, project_id, variant):
+        if not self.enabled:
+            # Neither a hit nor a miss: there is nothing to look in.
+            return Entry(self, None, None)
+        key = (project_id, self.generation(project_id), variant)
+        payload = self.load(key)
+        self.metrics.record("misses" if payload is None else "hits")
+        return Entry(self, key, payload)
+
+    def invalidate(self, project_ids):
+        project_ids = list(project_ids)
+        if project_ids:
+            self.bump(project_ids)
+            self.metrics.record("invalidations", len(project_ids))
+
+    def stats(self):
+        return {
+            "backend": type(self).__name__,
+            "enabled": self.enabled,
+            "timeout": self.timeout,
+            **self.metrics.snapshot(),
+        }
+
+
+class LRUPayloadCache(BasePayloadCache):
+    # Bounded in-process cache. Invalidation only reaches this process, so
+    # deployments with several workers should use DjangoPayloadCache.
+
+    def __init__(self, timeout=60, max_entries=1000):
+        super().__init__(timeout)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def _next_generation(self, project_id):
+        return max(time.time_ns(), self._generations.get(project_id, 0) + 1)
+
+    def generation(self, project_id):
+        with self._lock:
+            if project_id not in self._generations:
+                self._generations[project_id] = self._next_generation(project_id)
+            return self._generations[project_id]
+
+    def load(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, payload = item
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def store(self, key, payload):
+        project_id, generation, _ = key
+        with self._lock:
+            if self._generations.get(project_id) != generation:
+                return
+            self._entries[key] = (time.monotonic() + self.timeout, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump(self, project_ids):
+        project_ids = set(project_ids)
+        if not project_ids:
+            return
+        with self._lock:
+            for project_id in project_ids:
+                self._generations[project_id] = self._next_generation(project_id)
+            for key in [key for key in self._entries if key[0] in project_ids]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        return {**super().stats(), "entries": size, "max_entries": self.max_entries}
+
+
+class DjangoPayloadCache(BasePayloadCache):
+    # Shared through a Django cache alias; TTL and eviction are the
+    # backend's (maxmemory-policy for Redis). Inactive unless CACHE_SHARED.
+
+    def __init__(self, timeout=60, alias="default"):
+        super().__init__(timeout)
+        self.alias = alias
+
+    @property
+    def enabled(self):
+        # An invalidation would only reach this process while the other
+        # workers kept serving their copies, so nothing is cached.
+        return settings.CACHE_SHARED
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _generation_key(self, project_id):
+        return f"projects:detail-generation:{project_id}"
+
+    def generation(self, project_id):
+        key = self._generation_key(project_id)
+        generation = self.cache.get(key)
+        if generation is None:
+            self.cache.add(key, time.time_ns(), None)
+            generation = self.cache.get(key)
+        return generation
+
+    def _payload_key(self, key):
+        project_id, generation, variant = key
+        return f"projects:detail:{project_id}:{generation}:{variant}"
+
+    def load(self, key):
+        return self.cache.get(self._payload_key(key))
+
+    def store(self, key, payload):
+        self.cache.set(self._payload_key(key), payload, self.timeout)
+
+    def bump(self, project_ids):
+        generation = time.time_ns()
+        self.cache.set_many(
+            {self._generation_key(pk): generation for pk in project_ids}, None
+        )
+
+
+_detail_cache = None
+_detail_cache_lock = threading.Lock()
+
+
+def get_detail_cache():
+    global _detail_cache
+    if _detail_cache is None:
+        with _detail_cache_lock:
+            if _detail_cache is None:
+                config = settings.PROJECT_DETAIL_CACHE
+                cache_class = import_string(config["BACKEND"])
+                _detail_cache = cache_class(**config.get("OPTIONS", {}))
+    return _detail_cache
+
+
+def invalidate_project_details(project_ids):
+    # Drop now and again after commit, as with membership caches.
+    project_ids = list(project_ids)
+    if not get_detail_cache().enabled:
+        return
+    get_detail_cache().invalidate(project_ids)
+    transaction.on_commit(lambda: get_detail_cache().bump(project_ids))
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    def __init__(self, broker, channel, max_queue):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def deliver(self, message):
+        if self.queue.full():
+            # A client that stops reading must not grow memory without bound;
+            # it is disconnected and has to resync through the change feed.
+            self.overflowed = True
+            return
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+    # In-process fan-out. Publishers may run in any thread; every subscriber
+    # is woken on its own event loop. Swap PROJECT_EVENTS["BROKER"] for a
+    # shared broker when running more than one worker process.
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.max_queue)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.channel, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscriptions.pop(subscription.channel, None)
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscriptions.get(channel, ()))
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                broker_class = import_string(settings.PROJECT_EVENTS["BROKER"])
+                _broker = broker_class(**settings.PROJECT_EVENTS.get("OPTIONS", {}))
+    return _broker
+
+
+def project_channel(project_id):
+    return f"project:{project_id}"
+
+
+def publish_project_event(project_id, event_type, data, using=None):
+    message = {"type": event_type, "project_id": project_id, **data}
+    transaction.on_commit(
+        lambda: get_broker().publish(project_channel(project_id), message),
+        using=using,
+    )
+
+
+def task_payload(task):
+    return {
+        "task": {
+            "id": task.pk,
+            "title": task.title,
+            "status": task.status,
+            "assigned_to_id": task.assigned_to_id,
+            "due_date": task.due_date.isoformat() if task.due_date else None,
+        }
+    }
+
+
+def publish_tasks_changed(tasks, event_type):
+    by_project = {}
+    for task in tasks:
+        by_project.setdefault(task.project_id, []).append(task_payload(task)["task"])
+    for project_id, payloads in by_project.items():
+        publish_project_event(project_id, event_type, {"tasks": payloads})
+
+
+def format_sse(message):
+    return f"event: {message['type']}\ndata: {json.dumps(message)}\n\n"
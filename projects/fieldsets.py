@@ -0,0 +1,99 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def _split(value):
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+class FieldSelection:
+    # ?fields=id,title,assigned_to.username&expand=project
+    # fields: top-level output fields, None meaning "all of them"; a dotted
+    # name also selects the relation and narrows its nested serializer.
+    # expand: optional relations to nest in addition to the defaults.
+
+    def __init__(self, fields=None, nested=None, expand=()):
+        self.fields = None if fields is None else set(fields)
+        self.nested = nested or {}
+        self.expand = set(expand)
+
+    @classmethod
+    def from_params(cls, params):
+        fields = None
+        if params.get(FIELDS_PARAM):
+            fields = _split(params.get(FIELDS_PARAM))
+        return cls.from_names(fields, _split(params.get(EXPAND_PARAM)))
+
+    @classmethod
+    def from_names(cls, names, expand=()):
+        if names is None:
+            return cls(expand=expand)
+        fields = {"id"}
+        nested = {}
+        for name in names:
+            head, _, rest = name.partition(".")
+            fields.add(head)
+            if rest:
+                nested.setdefault(head, []).append(rest)
+        return cls(fields, nested, expand)
+
+    def includes(self, name):
+        if name in self.expand:
+            return True
+        return self.fields is None or name in self.fields
+
+    def for_relation(self, name):
+        return FieldSelection.from_names(self.nested.get(name))
+
+    def key(self):
+        # Canonical form, so equivalent query strings share cache entries.
+        fields = "*" if self.fields is None else ",".join(sorted(self.fields))
+        nested = ";".join(
+            f"{name}({self.for_relation(name).key()})" for name in sorted(self.nested)
+        )
+        return f"{fields}|{nested}|{','.join(sorted(self.expand))}"
+
+    def only(self, model_fields, *required):
+        # Column names for QuerySet.only(), or None to load every column.
+        if self.fields is None:
+            return None
+        return {
+            "id",
+            *required,
+            *(name for name in model_fields if name in self.fields),
+        }
+
+
+def get_field_selection(params, serializer_class):
+    selection = FieldSelection.from_params(params)
+    # Unknown names fail here with a ValidationError, before they reach only().
+    serializer_class(selection=selection)
+    return selection
+
+
+def selection_parameters(serializer_class, expandable=()):
+    fields = ", ".join(serializer_class.Meta.fields)
+    parameters = [
+        OpenApiParameter(
+            name=FIELDS_PARAM,
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description=(
+                "Comma-separated fields to return; related fields can be narrowed "
+                f"with dots (assigned_to.username). Available: {fields}."
+            ),
+        )
+    ]
+    if expandable:
+        parameters.append(
+            OpenApiParameter(
+                name=EXPAND_PARAM,
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=f"Comma-separated relations to nest: {', '.join(expandable)}.",
+            )
+        )
+    return parameters
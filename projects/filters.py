@@ -0,0 +1,24 @@
+import django_filters
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+from .models import Task
+from .search import get_search_backend
+
+
+class TaskFilter(django_filters.FilterSet):
+    # Plain id filters: validating against Project/User querysets would cost
+    # a query per request and reveal which ids exist.
+    project = django_filters.NumberFilter(field_name="project_id")
+    assigned_to = django_filters.NumberFilter(field_name="assigned_to_id")
+    status = django_filters.ChoiceFilter(choices=Task.STATUS_CHOICES)
+
+    class Meta:
+        model = Task
+        fields = ["project", "status", "assigned_to"]
+
+
+class FullTextSearchFilter(SearchFilter):
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "")
+        ranked = not request.query_params.get(api_settings.ORDERING_PARAM)
+        return get_search_backend(queryset.db).search(queryset, query, ranked=ranked)
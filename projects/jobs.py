@@ -0,0 +1,179 @@
+import logging
+import os
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+from . import deletion
+from .export import export_lines, export_queryset
+from .models import Job, Project
+from .stats import rebuild_project_stats
+
+logger = logging.getLogger(__name__)
+
+# Queued jobs looked at per claim; others may win the first few.
+CLAIM_BATCH = 10
+
+JOB_HANDLERS = {}
+
+
+def job_handler(kind):
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+
+    return decorator
+
+
+def enqueue(kind, payload=None, user=None):
+    return Job.objects.create(
+        kind=kind,
+        payload=payload or {},
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+
+
+def active_job(kind, **payload):
+    # A queued or running job of kind whose payload contains payload.
+    jobs = Job.objects.filter(kind=kind, status__in=[Job.QUEUED, Job.RUNNING])
+    for key, value in payload.items():
+        jobs = jobs.filter(**{f"payload__{key}": value})
+    return jobs.order_by("id").first()
+
+
+def claim_job(worker, kinds=None):
+    # A conditional UPDATE claims the row, so any number of workers in any
+    # number of processes can poll the same table without a queue lock.
+    now = timezone.now()
+    queued = Job.objects.filter(status=Job.QUEUED, available_at__lte=now)
+    if kinds:
+        queued = queued.filter(kind__in=kinds)
+    candidates = queued.order_by("available_at", "id").values_list("id", flat=True)
+    for job_id in candidates[:CLAIM_BATCH]:
+        claimed = Job.objects.filter(pk=job_id, status=Job.QUEUED).update(
+            status=Job.RUNNING,
+            locked_by=worker,
+            started_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+def run_job(job):
+    config = settings.JOB_QUEUE
+    mine = Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by)
+    try:
+        result = JOB_HANDLERS[job.kind](job)
+    except Exception as exc:
+        logger.exception("Job %s failed on attempt %d", job, job.attempts)
+        error = f"{type(exc).__name__}: {exc}"
+        if job.attempts < config["MAX_ATTEMPTS"]:
+            delay = timedelta(seconds=config["RETRY_DELAY"] * job.attempts)
+            mine.update(
+                status=Job.QUEUED,
+                error=error,
+                locked_by="",
+                available_at=timezone.now() + delay,
+            )
+        else:
+            mine.update(status=Job.FAILED, error=error, finished_at=timezone.now())
+        return False
+    mine.update(
+        status=Job.SUCCEEDED, result=result, error="", finished_at=timezone.now()
+    )
+    return True
+
+
+def requeue_stale_jobs():
+    # Running longer than STALE_AFTER: the worker is assumed dead. Handlers
+    # are written to be safe to run again.
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.JOB_QUEUE["STALE_AFTER"])
+    return Job.objects.filter(status=Job.RUNNING, started_at__lt=cutoff).update(
+        status=Job.QUEUED, locked_by="", available_at=now
+    )
+
+
+def work(worker, stop, kinds=None, poll_interval=1.0, once=False):
+    # Until stop is set, or with once until no job is ready.
+    try:
+        while not stop.is_set():
+            job = claim_job(worker, kinds)
+            if job is None:
+                if once:
+                    return
+                stop.wait(poll_interval)
+                continue
+            run_job(job)
+    finally:
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+def run_pending_jobs(kinds=None):
+    work(f"inline:{os.getpid()}", threading.Event(), kinds, once=True)
+
+
+@job_handler(Job.DELETE_PROJECT)
+def delete_project(job):
+    project = Project.objects.filter(pk=job.payload["project_id"]).first()
+    if project is None:
+        return {"deleted_tasks": 0}
+    return deletion.delete_project(project)
+
+
+def export_path(job):
+    return os.path.join(
+        settings.JOB_QUEUE["EXPORT_DIR"], f"job-{job.pk}.{job.payload['format']}"
+    )
+
+
+@job_handler(Job.EXPORT)
+def export(job):
+    payload = job.payload
+    user = User.objects.get(pk=payload["user_id"])
+    queryset, columns = export_queryset(payload["kind"], payload["filters"], user)
+    path = export_path(job)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rows = -1 if payload["format"] == "csv" else 0
+    with open(path, "w", newline="", encoding="utf-8") as output:
+        for line in export_lines(queryset, columns, payload["format"]):
+            output.write(line)
+            rows += 1
+    retention = timedelta(seconds=settings.JOB_QUEUE["EXPORT_RETENTION"])
+    return {
+        "rows": rows,
+        "size": os.path.getsize(path),
+        "expires_at": (timezone.now() + retention).isoformat(),
+    }
+
+
+def expire_exports():
+    # Removes export files older than EXPORT_RETENTION and marks their jobs,
+    # so later passes skip them and downloads answer 410.
+    cutoff = timezone.now() - timedelta(seconds=settings.JOB_QUEUE["EXPORT_RETENTION"])
+    jobs = Job.objects.filter(
+        kind=Job.EXPORT, status=Job.SUCCEEDED, finished_at__lt=cutoff
+    ).exclude(result__has_key="expired")
+    expired = 0
+    for job in jobs.iterator():
+        try:
+            os.remove(export_path(job))
+        except FileNotFoundError:
+            pass
+        Job.objects.filter(pk=job.pk).update(result={**job.result, "expired": True})
+        expired += 1
+    return expired
+
+
+@job_handler(Job.REBUILD_STATS)
+def rebuild_stats(job):
+    project_ids = job.payload.get("project_ids")
+    rebuild_project_stats(project_ids)
+    return {"projects": len(project_ids) if project_ids is not None else None}
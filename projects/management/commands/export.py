@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+from projects.export import EXPORT_FORMATS, export_lines, export_queryset
+
+
+class Command(BaseCommand):
+    help = "Stream tasks or projects as NDJSON or CSV, optionally as seen by one user."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=["tasks", "projects"])
+        parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+        parser.add_argument("--output", help="File to write to. Defaults to stdout.")
+        parser.add_argument("--user", help="Only export rows visible to this username.")
+        parser.add_argument("--project")
+        parser.add_argument("--status")
+        parser.add_argument("--assigned-to")
+        parser.add_argument("--member")
+        parser.add_argument("--search")
+        parser.add_argument("--ordering")
+
+    def get_user(self, username):
+        try:
+            return User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"User {username!r} does not exist")
+
+    def build_queryset(self, options):
+        user = self.get_user(options["user"]) if options["user"] else None
+        params = {
+            "project": options["project"],
+            "status": options["status"],
+            "assigned_to": options["assigned_to"],
+            "member": options["member"],
+            "search": options["search"],
+            "ordering": options["ordering"],
+        }
+        params = {key: value for key, value in params.items() if value}
+        try:
+            return export_queryset(options["kind"], params, user)
+        except ValidationError as exc:
+            raise CommandError(exc.detail)
+
+    def handle(self, *args, **options):
+        queryset, columns = self.build_queryset(options)
+        lines = export_lines(queryset, columns, options["format"])
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        count = -1 if options["format"] == "csv" else 0
+        with open(options["output"], "w", newline="", encoding="utf-8") as output:
+            for line in lines:
+                output.write(line)
+                count += 1
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Exported {count} {options['kind']} to {options['output']}"
+            )
+        )
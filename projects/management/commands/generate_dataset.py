@@ -0,0 +1,55 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from projects.dataset import generate
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic dataset for benchmarks and load tests: users named "
+        "bench-<seed>-<n>, projects with varying membership, and tasks spread "
+        "over projects with a long tail and weighted statuses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--projects", type=int, default=50)
+        parser.add_argument("--tasks", type=int, default=100_000)
+        parser.add_argument(
+            "--members-per-project",
+            type=int,
+            default=8,
+            help="Mean project size; boards get half to one and a half times this.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--password",
+            help="Password for every generated user, so load tests can log in.",
+        )
+
+    def handle(self, *args, **options):
+        prefix = f"bench-{options['seed']}-"
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(
+                f"Users named {prefix}* already exist; pick another --seed"
+            )
+
+        started = time.perf_counter()
+        generate(
+            users=options["users"],
+            projects=options["projects"],
+            tasks=options["tasks"],
+            members_per_project=options["members_per_project"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            password=options["password"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {options['users']} users, {options['projects']} "
+                f"projects and {options['tasks']} tasks in "
+                f"{time.perf_counter() - started:.1f}s"
+            )
+        )
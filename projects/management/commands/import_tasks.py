@@ -0,0 +1,120 @@
+import itertools
+import json
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from projects.importer import IMPORT_BATCH_SIZE, TaskImporter, read_rows
+from projects.models import ImportCheckpoint
+
+MAX_REPORTED_ERRORS = 50
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import tasks from CSV or NDJSON (a file, or - for stdin). Each row "
+        "needs title and project_id or project (name); optional description, "
+        "status, due_date, assigned_to_id or assignee (username). Progress is "
+        "checkpointed per batch, so re-running the same import resumes it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Path to the file, or - for stdin.")
+        parser.add_argument("--format", choices=["csv", "ndjson"])
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint name. Defaults to the absolute path of the source.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore an existing checkpoint and start from the first row.",
+        )
+        parser.add_argument(
+            "--create-projects",
+            action="store_true",
+            help="Create projects referenced by name that do not exist yet.",
+        )
+        parser.add_argument(
+            "--add-members",
+            action="store_true",
+            help="Add assignees to the project instead of rejecting the row.",
+        )
+
+    def get_format(self, options):
+        if options["format"]:
+            return options["format"]
+        return "csv" if options["source"].lower().endswith(".csv") else "ndjson"
+
+    def get_checkpoint(self, options):
+        name = options["checkpoint"]
+        if not name:
+            if options["source"] == "-":
+                raise CommandError("--checkpoint is required when reading stdin")
+            name = f"import_tasks:{os.path.abspath(options['source'])}"
+        checkpoint, _ = ImportCheckpoint.objects.get_or_create(name=name)
+        if options["restart"]:
+            checkpoint.position = checkpoint.created = checkpoint.rejected = 0
+            checkpoint.save()
+        return checkpoint
+
+    def open_source(self, source):
+        if source == "-":
+            return sys.stdin
+        try:
+            return open(source, newline="", encoding="utf-8")
+        except OSError as exc:
+            raise CommandError(f"Cannot read {source}: {exc}")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        checkpoint = self.get_checkpoint(options)
+        importer = TaskImporter(
+            checkpoint,
+            create_projects=options["create_projects"],
+            add_members=options["add_members"],
+        )
+        if checkpoint.position:
+            self.stderr.write(
+                f"Resuming {checkpoint.name} after row {checkpoint.position}"
+            )
+
+        stream = self.open_source(options["source"])
+        try:
+            self.run(importer, read_rows(stream, self.get_format(options)), options)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {checkpoint.created} tasks from {checkpoint.position} "
+                f"rows ({checkpoint.rejected} rejected)"
+            )
+        )
+
+    def run(self, importer, rows, options):
+        checkpoint = importer.checkpoint
+        rows = itertools.islice(rows, checkpoint.position, None)
+        reported = 0
+        processed = 0
+        started = time.monotonic()
+        while batch := list(itertools.islice(rows, options["batch_size"])):
+            _, rejected = importer.import_batch(batch, checkpoint.position)
+            processed += len(batch)
+            for number, errors in rejected:
+                if reported < MAX_REPORTED_ERRORS:
+                    self.stderr.write(f"row {number}: {json.dumps(errors)}")
+                reported += 1
+            rate = processed / max(time.monotonic() - started, 1e-9)
+            self.stderr.write(
+                f"{checkpoint.position} rows, {checkpoint.created} created, "
+                f"{checkpoint.rejected} rejected, {rate:.0f} rows/s"
+            )
+        if reported > MAX_REPORTED_ERRORS:
+            self.stderr.write(
+                f"... {reported - MAX_REPORTED_ERRORS} more rejected rows"
+            )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from projects.changelog import prune_change_log
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete change log entries older than CHANGE_FEED['RETENTION_DAYS']. "
+        "Feed cursors from before the cutoff then answer 410 Gone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        deleted = prune_change_log(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} change log entries"))
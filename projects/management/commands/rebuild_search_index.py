@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from projects.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Create the full-text search index if missing and rebuild it from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        backend = get_search_backend(using)
+        backend.rebuild(connections[using])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt search index with {type(backend).__name__}")
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from projects.stats import find_drift, rebuild_project_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the project stats tables with a GROUP BY over tasks and report "
+        "projects that drifted. --fix rebuilds the drifted projects, --rebuild "
+        "rebuilds everything in bulk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, action="append", dest="projects")
+        parser.add_argument("--fix", action="store_true")
+        parser.add_argument("--rebuild", action="store_true")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        project_ids = options["projects"]
+        if options["rebuild"]:
+            rebuild_project_stats(project_ids, using=using)
+            self.stdout.write(self.style.SUCCESS("Rebuilt project stats"))
+            return
+
+        drifted = find_drift(project_ids, using=using)
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("Project stats are consistent"))
+            return
+        self.stdout.write(
+            f"Drift in {len(drifted)} projects: {', '.join(map(str, drifted))}"
+        )
+        if options["fix"]:
+            rebuild_project_stats(drifted, using=using)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(drifted)} projects"))
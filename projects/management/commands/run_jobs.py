@@ -0,0 +1,69 @@
+import os
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from projects.jobs import expire_exports, requeue_stale_jobs, run_pending_jobs, work
+from projects.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs (project deletion, exports, stats rebuilds) "
+        "on a pool of worker threads until interrupted, removing export files "
+        "past their retention. --once drains the queue and exits."
+    )
+
+    def add_arguments(self, parser):
+        config = settings.JOB_QUEUE
+        parser.add_argument("--workers", type=int, default=config["WORKERS"])
+        parser.add_argument(
+            "--poll-interval", type=float, default=config["POLL_INTERVAL"]
+        )
+        parser.add_argument(
+            "--kind",
+            action="append",
+            dest="kinds",
+            choices=[kind for kind, _ in Job.KIND_CHOICES],
+        )
+        parser.add_argument("--once", action="store_true")
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stderr.write(f"Requeued {requeued} stale jobs")
+        expired = expire_exports()
+        if expired:
+            self.stderr.write(f"Removed {expired} expired exports")
+        if options["once"]:
+            run_pending_jobs(options["kinds"])
+            return
+
+        stop = threading.Event()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        threads = [
+            threading.Thread(
+                target=work,
+                args=(
+                    f"{prefix}:{n}",
+                    stop,
+                    options["kinds"],
+                    options["poll_interval"],
+                ),
+                name=f"job-worker-{n}",
+            )
+            for n in range(options["workers"])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stderr.write(f"Started {len(threads)} job workers")
+        try:
+            while not stop.wait(settings.JOB_QUEUE["STALE_AFTER"] / 4):
+                requeue_stale_jobs()
+                expire_exports()
+        except KeyboardInterrupt:
+            self.stderr.write("Stopping after the running jobs finish")
+            stop.set()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,129 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Q
+from .models import Project
+
+MAX_INLINE_PROJECT_IDS = 500
+
+
+def project_ids_key(user_id):
+    return f"projects:user-project-ids:{user_id}"
+
+
+def _memberships():
+    # Cached for minutes and trusted for access checks, so always filled
+    # from the primary rather than a replica that may still lag.
+    return Project.members.through.objects.using(DEFAULT_DB_ALIAS)
+
+
+def get_user_project_ids(user):
+    # CachedJWTAuthentication fetches the set along with the user.
+    project_ids = getattr(user, "_project_ids", None)
+    if project_ids is not None:
+        return project_ids
+    # Only cached across requests when every worker shares the cache: a
+    # process-local entry would outlive a removal made through another one.
+    key = project_ids_key(user.pk)
+    if settings.CACHE_SHARED:
+        project_ids = cache.get(key)
+    if project_ids is None:
+        project_ids = frozenset(
+            _memberships().filter(user_id=user.pk).values_list("project_id", flat=True)
+        )
+        if settings.CACHE_SHARED:
+            cache.set(key, project_ids, settings.PROJECT_MEMBERSHIP_CACHE_TIMEOUT)
+    return project_ids
+
+
+async def aget_user_project_ids(user):
+    project_ids = getattr(user, "_project_ids", None)
+    if project_ids is not None:
+        return project_ids
+    key = project_ids_key(user.pk)
+    if settings.CACHE_SHARED:
+        project_ids = await cache.aget(key)
+    if project_ids is None:
+        project_ids = frozenset(
+            [
+                project_id
+                async for project_id in _memberships()
+                .filter(user_id=user.pk)
+                .values_list("project_id", flat=True)
+            ]
+        )
+        if settings.CACHE_SHARED:
+            await cache.aset(
+                key, project_ids, settings.PROJECT_MEMBERSHIP_CACHE_TIMEOUT
+            )
+    return project_ids
+
+
+def invalidate_user_project_ids(user_ids):
+    cache.delete_many([project_ids_key(user_id) for user_id in user_ids])
+
+
+def visible_projects_q(user, prefix="", project_ids=None):
+    if project_ids is None:
+        project_ids = get_user_project_ids(user)
+    if len(project_ids) > MAX_INLINE_PROJECT_IDS:
+        return Q(**{f"{prefix}members": user})
+    return Q(**{f"{prefix}id__in": project_ids})
+
+
+class MembershipResolver:
+    def __init__(self):
+        self._member_ids = {}
+        self._user_project_ids = {}
+
+    def prime(self, project_ids):
+        missing = set(project_ids) - self._member_ids.keys()
+        if not missing:
+            return
+        for project_id in missing:
+            self._member_ids[project_id] = set()
+        rows = Project.members.through.objects.filter(
+            project_id__in=missing
+        ).values_list("project_id", "user_id")
+        for project_id, user_id in rows:
+            self._member_ids[project_id].add(user_id)
+
+    def member_ids(self, project):
+        if project.pk not in self._member_ids:
+            prefetched = getattr(project, "_prefetched_objects_cache", {})
+            if "members" in prefetched:
+                ids = {member.pk for member in prefetched["members"]}
+            else:
+                ids = set(project.members.values_list("id", flat=True))
+            self._member_ids[project.pk] = ids
+        return self._member_ids[project.pk]
+
+    def is_member(self, user, project):
+        return user.pk in self.member_ids(project)
+
+    def user_project_ids(self, user):
+        if user.pk not in self._user_project_ids:
+            self._user_project_ids[user.pk] = get_user_project_ids(user)
+        return self._user_project_ids[user.pk]
+
+    def can_access(self, user, project):
+        return user.is_staff or project.pk in self.user_project_ids(user)
+
+    def get_member(self, project, user_id):
+        prefetched = getattr(project, "_prefetched_objects_cache", {})
+        if "members" in prefetched:
+            for member in prefetched["members"]:
+                if member.pk == user_id:
+                    return member
+            return None
+        return project.members.filter(pk=user_id).first()
+
+
+def get_membership_resolver(request):
+    if request is None:
+        return MembershipResolver()
+    resolver = getattr(request, "_membership_resolver", None)
+    if resolver is None:
+        resolver = MembershipResolver()
+        request._membership_resolver = resolver
+    return resolver
@@ -0,0 +1,242 @@
+import hmac
+import logging
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+from .detail_cache import get_detail_cache
+
+logger = logging.getLogger(__name__)
+
+# Per-request query recording. Every connection carries record_query as an
+# execute wrapper; it is a pass-through unless MetricsMiddleware has put a
+# RequestRecorder into the context, which sync_to_async threads inherit.
+_recorder = ContextVar("request_recorder", default=None)
+
+
+class RequestRecorder:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements = Counter()
+
+    @property
+    def duplicates(self):
+        # Repeats of the same SQL text within one request, whatever the
+        # parameters: the shape of an N+1 loop.
+        return sum(count - 1 for count in self.statements.values())
+
+
+def record_query(execute, sql, params, many, context):
+    recorder = _recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.db_seconds += time.perf_counter() - started
+        recorder.queries += 1
+        recorder.statements[sql] += 1
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def start_recording():
+    recorder = RequestRecorder()
+    return recorder, _recorder.set(recorder)
+
+
+def stop_recording(token):
+    _recorder.reset(token)
+
+
+def log_linear_bounds(lowest, highest, sub_buckets, integer=False):
+    # HDR-style buckets: each power of two split into sub_buckets linear
+    # steps, so relative precision is the same across the whole range.
+    bounds = []
+    octave = lowest
+    while octave < highest:
+        step = octave / sub_buckets
+        bounds.extend(octave + step * i for i in range(sub_buckets))
+        octave *= 2
+    bounds.append(octave)
+    if integer:
+        return sorted({math.ceil(bound) for bound in bounds})
+    return [float(f"{bound:.6g}") for bound in bounds]
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+# name -> (help, bucket bounds)
+HISTOGRAMS = {
+    "http_request_duration_seconds": (
+        "Wall time from the first middleware to the response.",
+        log_linear_bounds(0.001, 60, 2),
+    ),
+    "http_request_db_seconds": (
+        "Time spent executing database queries.",
+        log_linear_bounds(0.0001, 60, 2),
+    ),
+    "http_request_queries": (
+        "Database queries per request.",
+        [0, *log_linear_bounds(1, 1024, 4, integer=True)],
+    ),
+    "http_request_duplicate_queries": (
+        "Queries per request repeating SQL already run in that request.",
+        [0, *log_linear_bounds(1, 1024, 4, integer=True)],
+    ),
+    "http_response_size_bytes": (
+        "Response body size; streaming responses are not observed.",
+        log_linear_bounds(64, 64 * 1024 * 1024, 2),
+    ),
+}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._requests = Counter()
+
+    def observe(self, labels, status, values):
+        # One lock per request for all of its observations.
+        with self._lock:
+            self._requests[(*labels, str(status))] += 1
+            for name, value in values.items():
+                if value is None:
+                    continue
+                histogram = self._histograms.get((name, labels))
+                if histogram is None:
+                    histogram = Histogram(HISTOGRAMS[name][1])
+                    self._histograms[(name, labels)] = histogram
+                histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+
+    def render(self):
+        with self._lock:
+            histograms = {
+                key: (list(h.counts), h.sum, h.count)
+                for key, h in self._histograms.items()
+            }
+            requests = dict(self._requests)
+
+        lines = [
+            "# HELP http_requests_total Requests by URL name, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (url_name, method, status), count in sorted(requests.items()):
+            labels = format_labels(url_name=url_name, method=method, status=status)
+            lines.append(f"http_requests_total{{{labels}}} {count}")
+
+        for name, (help_text, bounds) in HISTOGRAMS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (metric, (url_name, method)), data in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                counts, total, count = data
+                labels = format_labels(url_name=url_name, method=method)
+                cumulative = 0
+                for bound, bucket in zip([*bounds, "+Inf"], counts):
+                    cumulative += bucket
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {total}")
+                lines.append(f"{name}_count{{{labels}}} {count}")
+
+        stats = get_detail_cache().stats()
+        for name in ("hits", "misses", "invalidations"):
+            lines += [
+                f"# HELP project_detail_cache_{name}_total Project detail cache "
+                f"{name} in this process.",
+                f"# TYPE project_detail_cache_{name}_total counter",
+                f"project_detail_cache_{name}_total {stats[name]}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(**labels):
+    return ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items())
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+def observe_request(request, response, recorder, duration):
+    match = request.resolver_match
+    url_name = match.url_name if match is not None and match.url_name else "unmatched"
+    size = None
+    if not response.streaming:
+        size = len(response.content)
+    registry.observe(
+        (url_name, request.method),
+        response.status_code,
+        {
+            "http_request_duration_seconds": duration,
+            "http_request_db_seconds": recorder.db_seconds,
+            "http_request_queries": recorder.queries,
+            "http_request_duplicate_queries": recorder.duplicates,
+            "http_response_size_bytes": size,
+        },
+    )
+
+    budget = settings.REQUEST_METRICS.get("QUERY_BUDGET")
+    if budget is not None and recorder.queries > budget:
+        repeated = [(count, sql) for sql, count in recorder.statements.most_common(3)]
+        logger.warning(
+            "%s %s (%s) ran %d queries (budget %d, %d duplicates) in %.1f ms; "
+            "most repeated: %s",
+            request.method,
+            request.path,
+            url_name,
+            recorder.queries,
+            budget,
+            recorder.duplicates,
+            duration * 1000,
+            repeated,
+        )
+
+
+def metrics_view(request):
+    token = settings.REQUEST_METRICS.get("TOKEN")
+    if not token:
+        # Per-route latencies and query counts are not for the public; only
+        # a development server serves them without a token.
+        if not settings.DEBUG:
+            return HttpResponse(status=403)
+    else:
+        expected = f"Bearer {token}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
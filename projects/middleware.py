@@ -0,0 +1,147 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework.permissions import SAFE_METHODS
+from .metrics import observe_request, start_recording, stop_recording
+from .routers import begin_request, end_request
+from .throttling import ConcurrencyLimiter
+
+REPLICA_PIN_COOKIE = "primary_pin"
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = begin_request(request, self.is_pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        return self.pin(state, response)
+
+    async def __acall__(self, request):
+        state, token = begin_request(request, self.is_pinned(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        return self.pin(state, response)
+
+    def is_pinned(self, request):
+        return request.method not in SAFE_METHODS or (
+            REPLICA_PIN_COOKIE in request.COOKIES
+        )
+
+    def pin(self, state, response):
+        # Reads in the same session stay on the primary until the replicas
+        # have had DATABASE_REPLICA_LAG_SECONDS to catch up with the write.
+        if state.wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_LAG_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class MetricsMiddleware:
+    # Outermost middleware: wall time, DB time, query and duplicate counts
+    # and response size per URL name, exposed by projects.metrics at /metrics.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        recorder, token = start_recording()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_recording(token)
+        observe_request(request, response, recorder, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        recorder, token = start_recording()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_recording(token)
+        observe_request(request, response, recorder, time.perf_counter() - started)
+        return response
+
+
+class WriteAdmissionMiddleware:
+    # Caps concurrent unsafe requests per process at WRITE_CONCURRENCY
+    # MAX_IN_FLIGHT. Up to MAX_QUEUED more wait QUEUE_TIMEOUT seconds for a
+    # slot; the rest get 503 with Retry-After instead of piling up on the
+    # database's writer lock.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        config = settings.WRITE_CONCURRENCY
+        self.limiter = ConcurrencyLimiter(config["MAX_IN_FLIGHT"], config["MAX_QUEUED"])
+        self.timeout = config["QUEUE_TIMEOUT"]
+        self.retry_after = config["RETRY_AFTER"]
+        self.exempt_paths = tuple(config.get("EXEMPT_PATHS", ()))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.is_write(request):
+            return self.get_response(request)
+        if not self.limiter.acquire(self.timeout):
+            return self.overloaded()
+        try:
+            return self.get_response(request)
+        finally:
+            self.limiter.release()
+
+    async def __acall__(self, request):
+        if not self.is_write(request):
+            return await self.get_response(request)
+        admitted = self.limiter.acquire(0) or await sync_to_async(
+            self.limiter.acquire, thread_sensitive=False
+        )(self.timeout)
+        if not admitted:
+            return self.overloaded()
+        try:
+            return await self.get_response(request)
+        finally:
+            self.limiter.release()
+
+    def is_write(self, request):
+        return request.method not in SAFE_METHODS and not request.path.startswith(
+            self.exempt_paths
+        )
+
+    def overloaded(self):
+        return JsonResponse(
+            {"detail": "Too many writes in progress; retry shortly."},
+            status=503,
+            headers={"Retry-After": str(self.retry_after)},
+        )
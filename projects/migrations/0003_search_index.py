@@ -0,0 +1,82 @@
+from django.db import migrations
+
+# The search schema as it stood when this migration was written; later
+# changes to projects.search get migrations of their own.
+
+SQLITE_FORWARD = []
+SQLITE_BACKWARD = []
+for table, columns in (
+    ("projects_task", ("title", "description")),
+    ("projects_project", ("name", "description")),
+):
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    SQLITE_FORWARD += [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{names}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} "
+        f"BEGIN INSERT INTO {fts}(rowid, {names}) "
+        f"VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} "
+        f"BEGIN INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au "
+        f"AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) "
+        f"VALUES (new.id, {new_values}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+    SQLITE_BACKWARD += [
+        f"DROP TRIGGER IF EXISTS {fts}_ai",
+        f"DROP TRIGGER IF EXISTS {fts}_ad",
+        f"DROP TRIGGER IF EXISTS {fts}_au",
+        f"DROP TABLE IF EXISTS {fts}",
+    ]
+
+POSTGRES_FORWARD = [
+    "CREATE INDEX IF NOT EXISTS projects_task_search_idx ON projects_task "
+    "USING GIN ((to_tsvector('simple', coalesce(projects_task.title, '') "
+    "|| ' ' || coalesce(projects_task.description, ''))))",
+    "CREATE INDEX IF NOT EXISTS projects_project_search_idx ON projects_project "
+    "USING GIN ((to_tsvector('simple', coalesce(projects_project.name, '') "
+    "|| ' ' || coalesce(projects_project.description, ''))))",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS projects_task_search_idx",
+    "DROP INDEX IF EXISTS projects_project_search_idx",
+]
+
+STATEMENTS = {
+    "sqlite": (SQLITE_FORWARD, SQLITE_BACKWARD),
+    "postgresql": (POSTGRES_FORWARD, POSTGRES_BACKWARD),
+}
+
+
+def run_statements(schema_editor, direction):
+    statements = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for statement in statements[direction]:
+        schema_editor.execute(statement)
+
+
+def install_search_schema(apps, schema_editor):
+    run_statements(schema_editor, 0)
+
+
+def remove_search_schema(apps, schema_editor):
+    run_statements(schema_editor, 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0002_task_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_schema, remove_search_schema),
+    ]
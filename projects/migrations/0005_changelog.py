@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0004_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("task_upsert", "Task created or updated"),
+                            ("task_delete", "Task deleted"),
+                            ("project_delete", "Project deleted"),
+                            ("member_added", "Member added"),
+                            ("member_removed", "Member removed"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("project_id", models.BigIntegerField()),
+                ("task_id", models.BigIntegerField(blank=True, null=True)),
+                ("user_id", models.IntegerField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["project_id", "id"], name="changelog_project_idx"
+                    ),
+                    models.Index(fields=["user_id", "id"], name="changelog_user_idx"),
+                ],
+            },
+        ),
+    ]
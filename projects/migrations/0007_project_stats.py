@@ -0,0 +1,158 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:35
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+STATUS_COLUMNS = {
+    "TODO": "todo_count",
+    "IN_PROGRESS": "in_progress_count",
+    "DONE": "done_count",
+}
+
+
+def backfill_project_stats(apps, schema_editor):
+    # Against the historical models, so later model or projects.stats
+    # changes cannot alter what this migration does.
+    using = schema_editor.connection.alias
+    Task = apps.get_model("projects", "Task")
+    ProjectStats = apps.get_model("projects", "ProjectStats")
+    ProjectAssigneeStats = apps.get_model("projects", "ProjectAssigneeStats")
+    ProjectDueDateStats = apps.get_model("projects", "ProjectDueDateStats")
+    tasks = Task.objects.using(using).order_by()
+
+    projects = defaultdict(dict)
+    for row in tasks.values("project_id", "status").annotate(n=Count("id")):
+        projects[row["project_id"]][STATUS_COLUMNS[row["status"]]] = row["n"]
+    ProjectStats.objects.using(using).bulk_create(
+        ProjectStats(project_id=project_id, **columns)
+        for project_id, columns in projects.items()
+    )
+
+    assignees = defaultdict(dict)
+    for row in (
+        tasks.filter(assigned_to__isnull=False)
+        .values("project_id", "assigned_to_id", "status")
+        .annotate(n=Count("id"))
+    ):
+        key = (row["project_id"], row["assigned_to_id"])
+        assignees[key][STATUS_COLUMNS[row["status"]]] = row["n"]
+    ProjectAssigneeStats.objects.using(using).bulk_create(
+        ProjectAssigneeStats(project_id=project_id, user_id=user_id, **columns)
+        for (project_id, user_id), columns in assignees.items()
+    )
+
+    ProjectDueDateStats.objects.using(using).bulk_create(
+        ProjectDueDateStats(
+            project_id=row["project_id"], due_date=row["due_date"], open_count=row["n"]
+        )
+        for row in tasks.filter(due_date__isnull=False)
+        .exclude(status="DONE")
+        .values("project_id", "due_date")
+        .annotate(n=Count("id"))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0006_import_checkpoint"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectStats",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="projects.project",
+                    ),
+                ),
+                ("todo_count", models.IntegerField(default=0)),
+                ("in_progress_count", models.IntegerField(default=0)),
+                ("done_count", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProjectAssigneeStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("todo_count", models.IntegerField(default=0)),
+                ("in_progress_count", models.IntegerField(default=0)),
+                ("done_count", models.IntegerField(default=0)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="assignee_stats",
+                        to="projects.project",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="project_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("project", "user"), name="assignee_stats_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ProjectDueDateStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("due_date", models.DateField()),
+                ("open_count", models.IntegerField(default=0)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="due_date_stats",
+                        to="projects.project",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("project", "due_date"), name="due_date_stats_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_project_stats, migrations.RunPython.noop),
+    ]
@@ -1,17 +1,54 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
 from django.contrib.auth.models import User
 
 
+class ProjectQuerySet(models.QuerySet):
+    def with_task_counts(self):
+        annotations = {
+            f"{code.lower()}_count": Count(
+                "tasks", filter=Q(tasks__status=code), distinct=True
+            )
+            for code, _ in Task.STATUS_CHOICES
+        }
+        return self.annotate(**annotations)
+
+    def touch(self):
+        return self.update(updated_at=timezone.now())
+
+
 class Project(models.Model):
     name = models.CharField(max_length=150)
     description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     members = models.ManyToManyField(User, related_name="projects")
 
+    objects = ProjectQuerySet.as_manager()
+
     def __str__(self):
         return self.name.title()
 
 
+STATS_KEY_ATTNAMES = ("project_id", "status", "assigned_to_id", "due_date")
+
+
+def locked_stats_keys(task_ids, using):
+    # What the stats tables count each row as, read under a row lock in the
+    # writer's transaction. A key remembered from when the row was loaded
+    # may be stale: two concurrent updates of the same TODO task would both
+    # move it out of TODO. SQLite takes the database lock at BEGIN instead.
+    rows = (
+        Task.objects.using(using)
+        .select_for_update()
+        .filter(pk__in=task_ids)
+        .order_by("pk")
+        .values_list("pk", *STATS_KEY_ATTNAMES)
+    )
+    return {pk: tuple(key) for pk, *key in rows}
+
+
 class Task(models.Model):
     STATUS_CHOICES = (
         ("TODO", "Do zrobienia"),
@@ -27,6 +64,193 @@ class Task(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="TODO")
     due_date = models.DateField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "status", "due_date"],
+                name="task_project_status_due_idx",
+            ),
+            models.Index(
+                fields=["assigned_to", "status"], name="task_assignee_status_idx"
+            ),
+            models.Index(
+                fields=["project", "created_at"], name="task_project_created_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the stats tables counted this row as, for deletes
+        # that bypass Task.delete (QuerySet.delete). Task.save and
+        # Task.delete read it again under a row lock.
+        if all(name in field_names for name in STATS_KEY_ATTNAMES):
+            instance._stats_key = instance.stats_key()
+        return instance
+
+    def stats_key(self):
+        return (self.project_id, self.status, self.assigned_to_id, self.due_date)
+
+    def save(self, *args, **kwargs):
+        # post_save receivers (project bump, change log) must commit together
+        # with the row itself.
+        using = kwargs.get("using") or router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            if self.pk is not None:
+                self._stats_key = locked_stats_keys([self.pk], using).get(self.pk)
+            super().save(*args, **kwargs)
+
+    def delete(self, using=None, keep_parents=False):
+        using = using or router.db_for_write(Task, instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            self._stats_key = locked_stats_keys([self.pk], using).get(self.pk)
+            if self._stats_key is None:
+                # Deleted concurrently; its signals already ran once.
+                return 0, {}
+            return super().delete(using=using, keep_parents=keep_parents)
 
     def __str__(self):
         return f"{self.title} @{self.status}"
+
+
+class ChangeLog(models.Model):
+    TASK_UPSERT = "task_upsert"
+    TASK_DELETE = "task_delete"
+    PROJECT_DELETE = "project_delete"
+    MEMBER_ADDED = "member_added"
+    MEMBER_REMOVED = "member_removed"
+    KIND_CHOICES = (
+        (TASK_UPSERT, "Task created or updated"),
+        (TASK_DELETE, "Task deleted"),
+        (PROJECT_DELETE, "Project deleted"),
+        (MEMBER_ADDED, "Member added"),
+        (MEMBER_REMOVED, "Member removed"),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    project_id = models.BigIntegerField()
+    task_id = models.BigIntegerField(blank=True, null=True)
+    user_id = models.IntegerField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project_id", "id"], name="changelog_project_idx"),
+            models.Index(fields=["user_id", "id"], name="changelog_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.kind} project={self.project_id}"
+
+
+class ImportCheckpoint(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    position = models.PositiveBigIntegerField(default=0)
+    created = models.PositiveBigIntegerField(default=0)
+    rejected = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @{self.position}"
+
+
+class ProjectStats(models.Model):
+    project = models.OneToOneField(
+        Project, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    todo_count = models.IntegerField(default=0)
+    in_progress_count = models.IntegerField(default=0)
+    done_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"stats for project={self.project_id}"
+
+
+class ProjectAssigneeStats(models.Model):
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="assignee_stats"
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="project_stats"
+    )
+    todo_count = models.IntegerField(default=0)
+    in_progress_count = models.IntegerField(default=0)
+    done_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "user"], name="assignee_stats_unique"
+            )
+        ]
+
+    def __str__(self):
+        return f"stats for project={self.project_id} user={self.user_id}"
+
+
+class ProjectDueDateStats(models.Model):
+    # Open (not DONE) tasks per due date; overdue is a sum over past dates,
+    # so the count stays correct as days pass without touching any row.
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="due_date_stats"
+    )
+    due_date = models.DateField()
+    open_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "due_date"], name="due_date_stats_unique"
+            )
+        ]
+
+    def __str__(self):
+        return f"stats for project={self.project_id} due={self.due_date}"
+
+
+class Job(models.Model):
+    DELETE_PROJECT = "delete_project"
+    EXPORT = "export"
+    REBUILD_STATS = "rebuild_stats"
+    KIND_CHOICES = (
+        (DELETE_PROJECT, "Delete project"),
+        (EXPORT, "Export"),
+        (REBUILD_STATS, "Rebuild project stats"),
+    )
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    payload = models.JSONField(default=dict)
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    created_by = models.ForeignKey(
+        User, blank=True, null=True, on_delete=models.SET_NULL, related_name="jobs"
+    )
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "available_at", "id"], name="job_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.kind} {self.status}"
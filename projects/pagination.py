@@ -0,0 +1,281 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+    _positive_int,
+)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class ProjectCursorPagination(CursorPagination):
+    ordering = ("-created_at", "-id")
+    allowed_orderings = ("name", "-name", "created_at", "-created_at")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        ordering = request.query_params.get("ordering")
+        if ordering in self.allowed_orderings:
+            tiebreaker = "-id" if ordering.startswith("-") else "id"
+            return (ordering, tiebreaker)
+        return self.ordering
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        # DRF's own page building, with the query run off the event loop.
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+
+
+class TaskKeysetPagination(BasePagination):
+    # Keyset pagination over whatever ordering the filter backends left on
+    # the queryset, completed with an id tiebreaker. Each page filters on the
+    # last row's sort key instead of using OFFSET, so deep pages cost the
+    # same as the first and concurrent inserts do not shift rows between
+    # pages. NULLs sort as the largest value in both directions.
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+    legacy_class = PageNumberPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.legacy = None
+        if self.legacy_class.page_query_param in request.query_params:
+            # ?page=N keeps the old numbered pages for existing clients.
+            self.legacy = self.legacy_class()
+            if not queryset.ordered:
+                queryset = queryset.order_by("id")
+            return self.legacy.paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        self.count = queryset.order_by().count() if self.wants_count(request) else None
+
+        cursor = self.decode_cursor(request, queryset)
+        reverse = cursor is not None and cursor["reverse"]
+        terms = self.reversed_terms() if reverse else self.ordering
+        queryset = queryset.order_by(*self.order_by(queryset, terms))
+        if cursor is not None:
+            queryset = queryset.filter(self.after(queryset, terms, cursor["position"]))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        return self.page
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+
+    def wants_count(self, request):
+        # A first page without ?count= is what clients from before cursors
+        # send, and they read count from it. Pages reached through a cursor
+        # skip the COUNT(*) unless asked, and ?count=false skips it always.
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return self.cursor_query_param not in request.query_params
+        return value.lower() in ("1", "true")
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, queryset):
+        terms = []
+        for term in queryset.query.order_by or ("id",):
+            name = term.lstrip("-")
+            descending = term.startswith("-")
+            if name in ("id", "pk"):
+                terms.append(("id", descending))
+                return terms
+            terms.append((name, descending))
+        terms.append(("id", terms[-1][1]))
+        return terms
+
+    def reversed_terms(self):
+        return [(name, not descending) for name, descending in self.ordering]
+
+    def is_nullable(self, queryset, name):
+        try:
+            return queryset.model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            return False
+
+    def order_by(self, queryset, terms):
+        expressions = []
+        for name, descending in terms:
+            if not self.is_nullable(queryset, name):
+                expressions.append(f"-{name}" if descending else name)
+            elif descending:
+                expressions.append(F(name).desc(nulls_first=True))
+            else:
+                expressions.append(F(name).asc(nulls_last=True))
+        return expressions
+
+    def after(self, queryset, terms, position):
+        # (a, b) after (x, y) == a after x OR (a = x AND b after y), with
+        # NULL treated as larger than every value.
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (name, descending), value in zip(terms, position):
+            nullable = self.is_nullable(queryset, name)
+            if value is None:
+                if descending:
+                    condition |= equal & Q(**{f"{name}__isnull": False})
+                equal &= Q(**{f"{name}__isnull": True})
+                continue
+            lookup = "lt" if descending else "gt"
+            beyond = Q(**{f"{name}__{lookup}": value})
+            if nullable and not descending:
+                beyond |= Q(**{f"{name}__isnull": True})
+            condition |= equal & beyond
+            equal &= Q(**{name: value})
+        return condition
+
+    def get_position(self, obj):
+        # isoformat() keeps microseconds, which DjangoJSONEncoder would cut
+        # to milliseconds and so break equality on created_at.
+        return [
+            value.isoformat() if isinstance(value, (date, datetime)) else value
+            for value in (getattr(obj, name) for name, _ in self.ordering)
+        ]
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps(
+            {"o": self.ordering_key(), "p": position, "r": reverse},
+        )
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if payload["o"] != self.ordering_key():
+                raise ValueError("cursor was made for another ordering")
+            position = [
+                self.to_python(queryset, name, value)
+                for (name, _), value in zip(self.ordering, payload["p"], strict=True)
+            ]
+            return {"position": position, "reverse": bool(payload["r"])}
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def to_python(self, queryset, name, value):
+        if value is None:
+            return None
+        try:
+            field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+    def ordering_key(self):
+        return ",".join(("-" if desc else "") + name for name, desc in self.ordering)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def get_paginated_response(self, data):
+        if self.legacy is not None:
+            return self.legacy.get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "count": self.count,
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {
+                    "type": "integer",
+                    "nullable": True,
+                    "description": (
+                        "Total matching tasks. Computed on the first page unless "
+                        f"?{self.count_query_param}=false, and on cursor pages "
+                        f"only with ?{self.count_query_param}=true; null otherwise."
+                    ),
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor taken from next/previous links.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Results per page, at most {self.max_page_size}.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Include the total count (one extra query). Defaults to true "
+                    "without a cursor and false with one."
+                ),
+                "schema": {"type": "boolean"},
+            },
+            {
+                "name": self.legacy_class.page_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Deprecated numbered page; costs OFFSET plus COUNT(*).",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -1,6 +1,7 @@
 from rest_framework.permissions import BasePermission
+from .membership import get_membership_resolver
 
 
 class IsProjectMember(BasePermission):
     def has_object_permission(self, request, view, obj):
-        return request.user in obj.members.all() or request.user.is_staff
+        return get_membership_resolver(request).can_access(request.user, obj)
@@ -0,0 +1,129 @@
+from django.contrib.auth.models import User
+from django.db.models import Prefetch
+from django_filters.utils import translate_validation
+from rest_framework.settings import api_settings
+from .fieldsets import FieldSelection
+from .filters import TaskFilter
+from .membership import visible_projects_q
+from .models import Project, Task
+from .search import get_search_backend
+
+TASK_ORDERING_FIELDS = ("due_date", "created_at", "title")
+
+# Serializer fields backed by a column, for pushing ?fields= into only().
+TASK_COLUMNS = ("title", "description", "status", "due_date", "created_at")
+PROJECT_COLUMNS = ("name", "description", "created_at")
+USER_COLUMNS = ("username", "email")
+
+
+# project_ids lets async callers pass a set fetched with aget_user_project_ids.
+
+
+def visible_projects(user, project_ids=None):
+    if user.is_staff:
+        return Project.objects.all()
+    return Project.objects.filter(visible_projects_q(user, project_ids=project_ids))
+
+
+def visible_tasks(user, project_ids=None):
+    queryset = Task.objects.select_related("project", "assigned_to")
+    if user.is_staff:
+        return queryset
+    return queryset.filter(
+        visible_projects_q(user, prefix="project__", project_ids=project_ids)
+    )
+
+
+def filter_projects(projects, params):
+    member_id = params.get("member")
+    if member_id:
+        if not member_id.isdigit():
+            return projects.none()
+        projects = projects.filter(members__id=member_id)
+
+    search = params.get("search")
+    if search:
+        projects = get_search_backend(projects.db).search(
+            projects, search, ranked=False
+        )
+    return projects
+
+
+def filter_tasks(tasks, params):
+    filterset = TaskFilter(params, queryset=tasks)
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+    tasks = filterset.qs
+
+    ordering = task_ordering(params)
+    search = params.get(api_settings.SEARCH_PARAM)
+    if search:
+        tasks = get_search_backend(tasks.db).search(tasks, search, ranked=not ordering)
+    if ordering:
+        return tasks.order_by(*ordering)
+    return tasks if tasks.ordered else tasks.order_by("id")
+
+
+def select_user_fields(users, selection):
+    only = selection.only(USER_COLUMNS)
+    return users.only(*only) if only else users
+
+
+def select_task_fields(tasks, selection):
+    # Joins and columns follow the selection: a task listing asked for
+    # ?fields=id,title never touches auth_user or the description column.
+    tasks = tasks.select_related(None)
+    related = ["assigned_to"] if selection.includes("assigned_to") else []
+    if "project" in selection.expand:
+        related.append("project")
+    if related:
+        tasks = tasks.select_related(*related)
+    only = selection.only(TASK_COLUMNS, "project", *TASK_ORDERING_FIELDS)
+    if only is None:
+        return tasks
+    if "assigned_to" in related:
+        nested = selection.for_relation("assigned_to").only(USER_COLUMNS)
+        only |= (
+            {f"assigned_to__{name}" for name in nested} if nested else {"assigned_to"}
+        )
+    if "project" in related:
+        only.add("project__name")
+    return tasks.only(*only)
+
+
+def _with_members(projects, selection):
+    if not selection.includes("members"):
+        return projects
+    users = select_user_fields(User.objects.all(), selection.for_relation("members"))
+    return projects.prefetch_related(Prefetch("members", queryset=users))
+
+
+def _with_tasks(projects, selection):
+    if not selection.includes("tasks"):
+        return projects
+    tasks = select_task_fields(Task.objects.all(), selection.for_relation("tasks"))
+    return projects.prefetch_related(Prefetch("tasks", queryset=tasks))
+
+
+def project_list_queryset(user, params, project_ids=None, selection=None):
+    selection = selection or FieldSelection()
+    projects = filter_projects(visible_projects(user, project_ids), params)
+    if selection.includes("task_counts"):
+        projects = projects.with_task_counts()
+    projects = _with_members(projects, selection).distinct()
+    if "tasks" in selection.expand:
+        projects = _with_tasks(projects, selection)
+    only = selection.only(PROJECT_COLUMNS, "name", "created_at")
+    return projects.only(*only) if only else projects
+
+
+def project_detail_queryset(selection=None):
+    selection = selection or FieldSelection()
+    projects = _with_tasks(_with_members(Project.objects.all(), selection), selection)
+    only = selection.only(PROJECT_COLUMNS)
+    return projects.only(*only) if only else projects
+
+
+def task_ordering(params):
+    terms = [term.strip() for term in params.get("ordering", "").split(",")]
+    return [term for term in terms if term.lstrip("-") in TASK_ORDERING_FIELDS]
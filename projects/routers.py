@@ -0,0 +1,73 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Per-request read/write split. ReplicaRoutingMiddleware opens a
+# RequestState; ReplicaRouter sends reads to a replica only while the
+# request is a safe-method hit on DATABASE_REPLICA_ROUTES and nothing has
+# pinned it to the primary (a write earlier in the request, or the pin
+# cookie left by a write within DATABASE_REPLICA_LAG_SECONDS).
+
+_request_state = ContextVar("replica_request_state", default=None)
+
+
+def pick_replica(aliases):
+    return random.choice(aliases)
+
+
+class RequestState:
+    def __init__(self, request, pinned=False):
+        self.request = request
+        self.pinned = pinned
+        self.wrote = False
+        self.replica = None
+
+    def read_alias(self):
+        if self.pinned or self.wrote or not settings.DATABASE_REPLICAS:
+            return None
+        match = self.request.resolver_match
+        if match is None or match.url_name not in settings.DATABASE_REPLICA_ROUTES:
+            return None
+        if self.replica is None:
+            self.replica = pick_replica(settings.DATABASE_REPLICAS)
+        return self.replica
+
+
+def begin_request(request, pinned=False):
+    state = RequestState(request, pinned)
+    return state, _request_state.set(state)
+
+
+def end_request(token):
+    _request_state.reset(token)
+
+
+def reading_from_replica():
+    state = _request_state.get()
+    return state is not None and state.read_alias() is not None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        return None if state is None else state.read_alias()
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows, so objects read from any of them may
+        # be related to objects written to the primary.
+        databases = {"default", *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,28 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from drf_spectacular.extensions import OpenApiSerializerExtension
+
+
+class SparseFieldsExtension(OpenApiSerializerExtension):
+    # Responses of sparse serializers may omit any field except id, and may
+    # carry expandable relations, so the schema says exactly that.
+    target_class = "projects.serializers.SparseFieldsMixin"
+    match_subclasses = True
+
+    def map_serializer(self, auto_schema, direction):
+        schema = auto_schema._map_serializer(
+            self.target, direction, bypass_extensions=True
+        )
+        if direction != "response":
+            return schema
+        for name, factory in self.target.expandable_fields.items():
+            field = factory()
+            field.bind(name, self.target)
+            schema["properties"][name] = auto_schema._map_serializer_field(
+                field, direction
+            )
+        schema["required"] = [n for n in schema.get("required", []) if n == "id"]
+        return schema
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    target_class = "projects.authentication.CachedJWTAuthentication"
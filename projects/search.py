@@ -0,0 +1,169 @@
+import re
+
+from django.db import connections
+from django.db.models import F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from .models import Project, Task
+
+SEARCH_FIELDS = {
+    Task: ("title", "description"),
+    Project: ("name", "description"),
+}
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(query):
+    return TOKEN_RE.findall(query or "")
+
+
+class ContainsSearchBackend:
+    def install(self, connection):
+        pass
+
+    def rebuild(self, connection):
+        pass
+
+    def search(self, queryset, query, ranked=True):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+        for token in tokens:
+            condition = Q()
+            for field in SEARCH_FIELDS[queryset.model]:
+                condition |= Q(**{f"{field}__icontains": token})
+            queryset = queryset.filter(condition)
+        return queryset
+
+
+class SQLiteSearchBackend(ContainsSearchBackend):
+    def fts_table(self, model):
+        return f"{model._meta.db_table}_fts"
+
+    def install(self, connection):
+        with connection.cursor() as cursor:
+            for model, fields in SEARCH_FIELDS.items():
+                table = model._meta.db_table
+                fts = self.fts_table(model)
+                columns = ", ".join(fields)
+                new_values = ", ".join(f"new.{f}" for f in fields)
+                old_values = ", ".join(f"old.{f}" for f in fields)
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                    f"{columns}, content='{table}', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} "
+                    f"BEGIN INSERT INTO {fts}(rowid, {columns}) "
+                    f"VALUES (new.id, {new_values}); END"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} "
+                    f"BEGIN INSERT INTO {fts}({fts}, rowid, {columns}) "
+                    f"VALUES ('delete', old.id, {old_values}); END"
+                )
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {fts}_au "
+                    f"AFTER UPDATE OF {columns} ON {table} "
+                    f"BEGIN INSERT INTO {fts}({fts}, rowid, {columns}) "
+                    f"VALUES ('delete', old.id, {old_values}); "
+                    f"INSERT INTO {fts}(rowid, {columns}) "
+                    f"VALUES (new.id, {new_values}); END"
+                )
+
+    def rebuild(self, connection):
+        self.install(connection)
+        with connection.cursor() as cursor:
+            for model in SEARCH_FIELDS:
+                fts = self.fts_table(model)
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def search(self, queryset, query, ranked=True):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+        match = " ".join(f'"{token}"*' for token in tokens)
+        table = queryset.model._meta.db_table
+        fts = self.fts_table(queryset.model)
+        queryset = queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [match])
+        )
+        if not ranked:
+            return queryset
+        rank = RawSQL(
+            f"SELECT bm25({fts}) FROM {fts} "
+            f"WHERE {fts} MATCH %s AND {fts}.rowid = {table}.id",
+            [match],
+            output_field=FloatField(),
+        )
+        return queryset.annotate(search_rank=rank).order_by("search_rank", "-id")
+
+
+class PostgresSearchBackend(ContainsSearchBackend):
+    config = "simple"
+
+    def document(self, model):
+        table = model._meta.db_table
+        parts = " || ' ' || ".join(
+            f"coalesce({table}.{field}, '')" for field in SEARCH_FIELDS[model]
+        )
+        return f"to_tsvector('{self.config}', {parts})"
+
+    def install(self, connection):
+        with connection.cursor() as cursor:
+            for model in SEARCH_FIELDS:
+                table = model._meta.db_table
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_search_idx "
+                    f"ON {table} USING GIN (({self.document(model)}))"
+                )
+
+    def rebuild(self, connection):
+        self.install(connection)
+        with connection.cursor() as cursor:
+            for model in SEARCH_FIELDS:
+                cursor.execute(f"REINDEX INDEX {model._meta.db_table}_search_idx")
+
+    def search(self, queryset, query, ranked=True):
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVectorField,
+        )
+
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+        search_query = SearchQuery(
+            " & ".join(f"{token}:*" for token in tokens),
+            search_type="raw",
+            config=self.config,
+        )
+        queryset = queryset.alias(
+            search_document=RawSQL(
+                self.document(queryset.model), [], output_field=SearchVectorField()
+            )
+        ).filter(search_document=search_query)
+        if not ranked:
+            return queryset
+        return queryset.annotate(
+            search_rank=SearchRank(F("search_document"), search_query)
+        ).order_by("-search_rank", "-id")
+
+
+BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_search_backend(using="default"):
+    vendor = connections[using].vendor
+    return BACKENDS.get(vendor, ContainsSearchBackend)()
+
+
+def install_search_schema(using="default", **kwargs):
+    # SQLite drops triggers when a migration remakes a table, so this also
+    # runs on post_migrate; every statement is idempotent.
+    get_search_backend(using).install(connections[using])
@@ -1,12 +1,175 @@
-from rest_framework import serializers
-from .models import Project, Task
+from operator import attrgetter
+
+from django.db import models
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.settings import api_settings
+from .export import EXPORT_FORMATS
+from .models import Job, Project, Task
+from .membership import get_membership_resolver
 from django.contrib.auth.models import User
 
 
-class UserSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    # Serializers taking selection=FieldSelection(...) drop unselected
+    # output fields and add requested expandable_fields.
+    expandable_fields = {}
+
+    def __init__(self, *args, selection=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if selection is not None:
+            self.apply_selection(selection)
+
+    def apply_selection(self, selection):
+        unknown = selection.expand - set(self.expandable_fields)
+        if unknown:
+            raise serializers.ValidationError(
+                {"expand": [f"Cannot expand {name}" for name in sorted(unknown)]}
+            )
+        for name in selection.expand:
+            self.fields[name] = self.expandable_fields[name]()
+
+        if selection.fields is not None:
+            unknown = selection.fields - set(self.fields)
+            if unknown:
+                raise serializers.ValidationError(
+                    {"fields": [f"Unknown field {name}" for name in sorted(unknown)]}
+                )
+            for name, field in list(self.fields.items()):
+                if not field.write_only and not selection.includes(name):
+                    del self.fields[name]
+
+        for name in selection.nested:
+            field = self.fields.get(name)
+            child = getattr(field, "child", field)
+            if isinstance(child, SparseFieldsMixin):
+                child.apply_selection(selection.for_relation(name))
+
+
+# Read fields whose to_representation is the identity on model values.
+PLAIN_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.ChoiceField,
+)
+
+
+def compile_field(field):
+    if len(field.source_attrs) != 1:
+        return None
+    get = attrgetter(field.source_attrs[0])
+
+    if isinstance(field, serializers.ListSerializer):
+        represent = compile_serializer(field.child)
+
+        def get_list(instance):
+            value = get(instance)
+            if isinstance(value, models.manager.BaseManager):
+                value = value.all()
+            return [represent(item) for item in value]
+
+        return get_list
+    if isinstance(field, serializers.Serializer):
+        represent = compile_serializer(field)
+
+        def get_nested(instance):
+            value = get(instance)
+            return None if value is None else represent(value)
+
+        return get_nested
+    if isinstance(field, serializers.SerializerMethodField):
+        return getattr(field.parent, field.method_name)
+    if type(field) in PLAIN_FIELDS:
+        return get
+    if type(field) is serializers.BigIntegerField and not getattr(
+        field, "coerce_to_string", api_settings.COERCE_BIGINT_TO_STRING
+    ):
+        return get
+    date_format = getattr(field, "format", api_settings.DATE_FORMAT)
+    if type(field) is serializers.DateField and date_format == ISO_8601:
+
+        def get_date(instance):
+            value = get(instance)
+            return value.isoformat() if value else None
+
+        return get_date
+    datetime_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if type(field) is serializers.DateTimeField and datetime_format == ISO_8601:
+        # DateTimeField.to_representation with the field timezone looked up
+        # once instead of per row; naive values keep the DRF path.
+        to_representation = field.to_representation
+        if hasattr(field, "timezone"):
+            field_timezone = field.timezone
+        else:
+            field_timezone = field.default_timezone()
+
+        def get_datetime(instance):
+            value = get(instance)
+            if value is None or field_timezone is None or timezone.is_naive(value):
+                return None if value is None else to_representation(value)
+            value = value.astimezone(field_timezone).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return get_datetime
+    return None
+
+
+def generic_getter(field):
+    def get(instance):
+        attribute = field.get_attribute(instance)
+        if isinstance(attribute, PKOnlyObject):
+            check_for_none = attribute.pk
+        else:
+            check_for_none = attribute
+        return None if check_for_none is None else field.to_representation(attribute)
+
+    return get
+
+
+def compile_serializer(serializer):
+    # Serializer.to_representation with the per-field dispatch done once:
+    # every readable field becomes a getter closed over its attribute.
+    plan = []
+    generic = False
+    for field in serializer._readable_fields:
+        get = compile_field(field)
+        if get is None:
+            get, generic = generic_getter(field), True
+        plan.append((field.field_name, get))
+
+    if not generic:
+        return lambda instance: {name: get(instance) for name, get in plan}
+
+    def represent(instance):
+        ret = {}
+        for name, get in plan:
+            try:
+                ret[name] = get(instance)
+            except SkipField:
+                continue
+        return ret
+
+    return represent
+
+
+class CompiledListSerializer(serializers.ListSerializer):
+    # many=True output for the read-heavy list endpoints; writes and
+    # validation stay on ListSerializer.
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        represent = compile_serializer(self.child)
+        return [represent(item) for item in iterable]
+
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "email"]
+        list_serializer_class = CompiledListSerializer
 
 
 class UserRegisterSerializer(serializers.ModelSerializer):
@@ -25,7 +188,14 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         return user
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class ProjectBriefSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Project
+        fields = ["id", "name"]
+        list_serializer_class = CompiledListSerializer
+
+
+class TaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     assigned_to = UserSerializer(read_only=True)
     assigned_to_id = serializers.PrimaryKeyRelatedField(
         source="assigned_to",
@@ -38,6 +208,8 @@ class TaskSerializer(serializers.ModelSerializer):
         source="project", queryset=Project.objects.all(), write_only=True, required=True
     )
 
+    expandable_fields = {"project": lambda: ProjectBriefSerializer(read_only=True)}
+
     class Meta:
         model = Task
         fields = [
@@ -51,27 +223,29 @@ class TaskSerializer(serializers.ModelSerializer):
             "assigned_to_id",
             "project_id",
         ]
+        list_serializer_class = CompiledListSerializer
 
     def validate(self, attrs):
         project = attrs.get("project") or getattr(self.instance, "project", None)
         assignee = attrs.get("assigned_to")
 
         if assignee and project:
-            is_member = project.members.filter(id=assignee.id).exists()
-            if not is_member:
+            resolver = get_membership_resolver(self.context.get("request"))
+            if not resolver.is_member(assignee, project):
                 raise serializers.ValidationError(
                     {"assigned_to_id": "Assignee must be a member of the project"}
                 )
         return attrs
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     members = UserSerializer(many=True, read_only=True)
     tasks = TaskSerializer(many=True, read_only=True)
 
     class Meta:
         model = Project
         fields = ["id", "name", "description", "created_at", "members", "tasks"]
+        list_serializer_class = CompiledListSerializer
 
     def create(self, validated_data):
         request = self.context.get("request")
@@ -82,3 +256,74 @@ class ProjectSerializer(serializers.ModelSerializer):
             project.members.add(request.user)
 
         return project
+
+
+class ProjectSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    members = UserSerializer(many=True, read_only=True)
+    task_counts = serializers.SerializerMethodField()
+
+    expandable_fields = {"tasks": lambda: TaskSerializer(many=True, read_only=True)}
+
+    class Meta:
+        model = Project
+        fields = ["id", "name", "description", "created_at", "members", "task_counts"]
+        list_serializer_class = CompiledListSerializer
+
+    def get_task_counts(self, obj) -> dict[str, int]:
+        return {
+            code: getattr(obj, f"{code.lower()}_count", 0)
+            for code, _ in Task.STATUS_CHOICES
+        }
+
+
+class TaskChangesSerializer(serializers.Serializer):
+    changed = TaskSerializer(many=True, read_only=True)
+    deleted = serializers.ListField(child=serializers.IntegerField())
+    deleted_projects = serializers.ListField(child=serializers.IntegerField())
+    resync_projects = serializers.ListField(child=serializers.IntegerField())
+    cursor = serializers.CharField()
+    has_more = serializers.BooleanField()
+
+
+class WorkloadSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField()
+    username = serializers.CharField()
+    task_counts = serializers.DictField(child=serializers.IntegerField())
+
+
+class ProjectStatsSerializer(serializers.Serializer):
+    project_id = serializers.IntegerField()
+    task_counts = serializers.DictField(child=serializers.IntegerField())
+    overdue_count = serializers.IntegerField()
+    workloads = WorkloadSerializer(many=True)
+    updated_at = serializers.DateTimeField(allow_null=True)
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "payload",
+            "result",
+            "error",
+            "attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class ExportJobSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=["tasks", "projects"])
+    format = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default="ndjson")
+    filters = serializers.DictField(child=serializers.CharField(), default=dict)
+
+
+class StatsRebuildJobSerializer(serializers.Serializer):
+    project_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_null=True
+    )
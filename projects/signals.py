@@ -0,0 +1,171 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .authentication import AUTH_FIELDS, invalidate_user_auth
+from .changelog import (
+    record_membership,
+    record_project_delete,
+    record_task_delete,
+    record_task_upserts,
+)
+from .detail_cache import invalidate_project_details
+from .events import publish_project_event, task_payload
+from .membership import invalidate_user_project_ids
+from .models import ChangeLog, Project, Task
+from .stats import record_task_removed, record_task_saved
+
+
+def invalidate_memberships(user_ids):
+    # Drop now for this connection and again after commit, so a concurrent
+    # request cannot re-cache the pre-commit membership.
+    user_ids = list(user_ids)
+    invalidate_user_project_ids(user_ids)
+    transaction.on_commit(lambda: invalidate_user_project_ids(user_ids))
+
+
+MEMBERSHIP_KINDS = {
+    "post_add": ChangeLog.MEMBER_ADDED,
+    "post_remove": ChangeLog.MEMBER_REMOVED,
+    "post_clear": ChangeLog.MEMBER_REMOVED,
+}
+
+MEMBERSHIP_EVENTS = {
+    "post_add": "members.added",
+    "post_remove": "members.removed",
+    "post_clear": "members.removed",
+}
+
+
+def membership_updated(action, project_ids, user_ids):
+    invalidate_memberships(user_ids)
+    Project.objects.filter(pk__in=project_ids).touch()
+    invalidate_project_details(project_ids)
+    record_membership(MEMBERSHIP_KINDS[action], project_ids, user_ids)
+    for project_id in project_ids:
+        publish_project_event(
+            project_id, MEMBERSHIP_EVENTS[action], {"user_ids": sorted(user_ids)}
+        )
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        related = instance.projects if reverse else instance.members
+        instance._cleared_ids = list(related.values_list("id", flat=True))
+        return
+    if action not in MEMBERSHIP_KINDS:
+        return
+    related_ids = (
+        getattr(instance, "_cleared_ids", []) if action == "post_clear" else pk_set
+    )
+    if reverse:
+        membership_updated(action, related_ids, [instance.pk])
+    else:
+        membership_updated(action, [instance.pk], related_ids)
+
+
+@receiver(pre_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    member_ids = list(instance.members.values_list("id", flat=True))
+    invalidate_memberships(member_ids)
+    invalidate_project_details([instance.pk])
+    record_project_delete(instance, member_ids)
+    publish_project_event(instance.pk, "project.deleted", {})
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_project_details([instance.pk])
+
+
+def previous_project_id(task, created):
+    # What the row belonged to before this save; differs when it was moved.
+    previous = None if created else getattr(task, "_stats_key", None)
+    return task.project_id if previous is None else previous[0]
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, update_fields=None, **kwargs):
+    # The project bumps come first: their row locks order this write against
+    # a concurrent stats rebuild of the same projects. A moved task also
+    # bumps the project it left, whose listings and ETags change too.
+    left = previous_project_id(instance, created)
+    project_ids = sorted({left, instance.project_id})
+    Project.objects.filter(pk__in=project_ids).touch()
+    invalidate_project_details(project_ids)
+    record_task_saved(instance, created, update_fields)
+    if left != instance.project_id:
+        # Members of only the old project need a tombstone for it.
+        record_task_delete(instance, project_id=left)
+        publish_project_event(left, "task.deleted", {"task_id": instance.pk})
+    record_task_upserts([(instance.pk, instance.project_id)])
+    publish_project_event(
+        instance.project_id,
+        "task.created" if created else "task.updated",
+        task_payload(instance),
+    )
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    # A cascade from Project is covered by its project_delete tombstone.
+    if isinstance(origin, Project):
+        return
+    Project.objects.filter(pk=instance.project_id).touch()
+    invalidate_project_details([instance.project_id])
+    record_task_removed(instance)
+    record_task_delete(instance)
+    publish_project_event(instance.project_id, "task.deleted", {"task_id": instance.pk})
+
+
+def user_project_ids(user):
+    return set(
+        Project.objects.filter(
+            Q(members=user) | Q(tasks__assigned_to=user)
+        ).values_list("id", flat=True)
+    )
+
+
+# Fields a project detail payload shows for members and assignees.
+DETAIL_USER_FIELDS = {"username", "email"}
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    changed = DETAIL_USER_FIELDS | AUTH_FIELDS
+    if update_fields is not None:
+        changed &= set(update_fields)
+    if changed & AUTH_FIELDS:
+        invalidate_user_auth([instance.pk])
+    if changed & DETAIL_USER_FIELDS:
+        # Project and task payloads show the name, and their ETags come from
+        # updated_at.
+        project_ids = user_project_ids(instance)
+        Project.objects.filter(pk__in=project_ids).touch()
+        invalidate_project_details(project_ids)
+        assigned = Task.objects.filter(assigned_to=instance)
+        record_task_upserts(assigned.values_list("id", "project_id"))
+        assigned.update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=User)
+def user_deleting(sender, instance, **kwargs):
+    project_ids = user_project_ids(instance)
+    Project.objects.filter(pk__in=project_ids).touch()
+    invalidate_project_details(project_ids)
+    # SET_NULL on Task.assigned_to is a plain UPDATE without signals.
+    record_task_upserts(
+        Task.objects.filter(assigned_to=instance).values_list("id", "project_id")
+    )
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    invalidate_memberships([instance.pk])
+    invalidate_user_auth([instance.pk])
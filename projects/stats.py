@@ -0,0 +1,306 @@
+from collections import Counter, defaultdict
+
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, router, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from .models import (
+    Project,
+    ProjectAssigneeStats,
+    ProjectDueDateStats,
+    ProjectStats,
+    Task,
+)
+
+STATUS_COLUMNS = {code: f"{code.lower()}_count" for code, _ in Task.STATUS_CHOICES}
+STATS_KEY_FIELDS = ("project", "status", "assigned_to", "due_date")
+
+
+def stats_deltas(removed=(), added=()):
+    deltas = Counter()
+    for key in removed:
+        deltas[key] -= 1
+    for key in added:
+        deltas[key] += 1
+    return deltas
+
+
+UPSERT_VENDORS = {"sqlite", "postgresql"}
+UPSERT_BATCH_SIZE = 200
+
+
+def _increment(model, lookup, columns, extra):
+    columns = {column: n for column, n in columns.items() if n}
+    if not columns:
+        return
+    updates = {column: F(column) + n for column, n in columns.items()}
+    if model.objects.filter(**lookup).update(**updates, **extra):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **columns, **extra)
+    except IntegrityError:
+        # Created concurrently since the update above.
+        model.objects.filter(**lookup).update(**updates, **extra)
+
+
+def _upsert(connection, model, keys, counters, rows, extra):
+    # One INSERT ... ON CONFLICT DO UPDATE adding to the counters, instead
+    # of an UPDATE that may miss followed by an INSERT in a savepoint.
+    qn = connection.ops.quote_name
+    fields = [model._meta.get_field(name) for name in [*keys, *counters, *extra]]
+    table = qn(model._meta.db_table)
+    columns = ", ".join(qn(field.column) for field in fields)
+    conflict = ", ".join(qn(model._meta.get_field(name).column) for name in keys)
+    assignments = [
+        f"{qn(column)} = {table}.{qn(column)} + EXCLUDED.{qn(column)}"
+        for column in counters
+    ] + [f"{qn(column)} = EXCLUDED.{qn(column)}" for column in extra]
+    row_sql = f"({', '.join(['%s'] * len(fields))})"
+    items = list(rows.items())
+    with connection.cursor() as cursor:
+        for start in range(0, len(items), UPSERT_BATCH_SIZE):
+            batch = items[start : start + UPSERT_BATCH_SIZE]
+            params = []
+            for key, deltas in batch:
+                values = [*key, *(deltas.get(c, 0) for c in counters)]
+                values += extra.values()
+                params += [
+                    field.get_db_prep_value(value, connection)
+                    for field, value in zip(fields, values)
+                ]
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) "
+                f"VALUES {', '.join([row_sql] * len(batch))} "
+                f"ON CONFLICT ({conflict}) DO UPDATE SET {', '.join(assignments)}",
+                params,
+            )
+
+
+def _add_to_counters(model, keys, counters, rows, extra=None):
+    extra = extra or {}
+    rows = {key: deltas for key, deltas in rows.items() if any(deltas.values())}
+    if not rows:
+        return
+    connection = connections[router.db_for_write(model)]
+    if connection.vendor in UPSERT_VENDORS:
+        _upsert(connection, model, keys, counters, rows, extra)
+        return
+    for key, deltas in rows.items():
+        _increment(model, dict(zip(keys, key)), deltas, extra)
+
+
+def apply_stats_deltas(deltas):
+    project_deltas = defaultdict(Counter)
+    assignee_deltas = defaultdict(Counter)
+    due_date_deltas = defaultdict(Counter)
+    for (project_id, status, assignee_id, due_date), n in deltas.items():
+        if not n:
+            continue
+        column = STATUS_COLUMNS[status]
+        project_deltas[(project_id,)][column] += n
+        if assignee_id is not None:
+            assignee_deltas[project_id, assignee_id][column] += n
+        if due_date is not None and status != "DONE":
+            due_date_deltas[project_id, due_date]["open_count"] += n
+
+    counters = list(STATUS_COLUMNS.values())
+    _add_to_counters(
+        ProjectStats,
+        ["project_id"],
+        counters,
+        project_deltas,
+        {"updated_at": timezone.now()},
+    )
+    _add_to_counters(
+        ProjectAssigneeStats, ["project_id", "user_id"], counters, assignee_deltas
+    )
+    _add_to_counters(
+        ProjectDueDateStats, ["project_id", "due_date"], ["open_count"], due_date_deltas
+    )
+
+    shrunk = {key[0] for key, c in assignee_deltas.items() if sum(c.values()) < 0}
+    if shrunk:
+        ProjectAssigneeStats.objects.filter(
+            project_id__in=shrunk, todo_count=0, in_progress_count=0, done_count=0
+        ).delete()
+    shrunk = {key[0] for key, c in due_date_deltas.items() if c["open_count"] < 0}
+    if shrunk:
+        ProjectDueDateStats.objects.filter(project_id__in=shrunk, open_count=0).delete()
+
+
+def saved_stats_key(task, previous, update_fields):
+    if previous is None or update_fields is None:
+        return task.stats_key()
+    saved = {name.removesuffix("_id") for name in update_fields}
+    return tuple(
+        current if field in saved else before
+        for field, current, before in zip(STATS_KEY_FIELDS, task.stats_key(), previous)
+    )
+
+
+def record_task_saved(task, created, update_fields=None):
+    previous = None if created else getattr(task, "_stats_key", None)
+    if previous is None and not created:
+        # The row was gone when Task.save locked it, so what it used to
+        # count as is unknown.
+        rebuild_project_stats([task.project_id])
+        task._stats_key = task.stats_key()
+        return
+    current = saved_stats_key(task, previous, update_fields)
+    if current != previous:
+        apply_stats_deltas(stats_deltas([previous] if previous else [], [current]))
+    task._stats_key = current
+
+
+def record_task_removed(task):
+    key = getattr(task, "_stats_key", None) or task.stats_key()
+    apply_stats_deltas(stats_deltas(removed=[key]))
+
+
+def record_tasks_changed(tasks, created=False, update_fields=None):
+    # Updated tasks carry the _stats_key locked_stats_keys() read for them.
+    if created:
+        removed, added = [], [task.stats_key() for task in tasks]
+    else:
+        removed = [task._stats_key for task in tasks]
+        added = [
+            saved_stats_key(task, task._stats_key, update_fields) for task in tasks
+        ]
+    apply_stats_deltas(stats_deltas(removed, added))
+    for task, key in zip(tasks, added):
+        task._stats_key = key
+
+
+def project_stats(project_id, today=None):
+    today = today or timezone.localdate()
+    stats = ProjectStats.objects.filter(project_id=project_id).first()
+    overdue = ProjectDueDateStats.objects.filter(
+        project_id=project_id, due_date__lt=today
+    ).aggregate(total=Sum("open_count"))["total"]
+    workloads = (
+        ProjectAssigneeStats.objects.filter(project_id=project_id)
+        .select_related("user")
+        .order_by("user_id")
+    )
+    return {
+        "project_id": project_id,
+        "task_counts": {
+            code: getattr(stats, column, 0) for code, column in STATUS_COLUMNS.items()
+        },
+        "overdue_count": overdue or 0,
+        "workloads": [
+            {
+                "user_id": workload.user_id,
+                "username": workload.user.username,
+                "task_counts": {
+                    code: getattr(workload, column)
+                    for code, column in STATUS_COLUMNS.items()
+                },
+            }
+            for workload in workloads
+        ],
+        "updated_at": stats.updated_at if stats else None,
+    }
+
+
+def _scoped(queryset, project_ids, using):
+    queryset = queryset.using(using)
+    if project_ids is not None:
+        queryset = queryset.filter(project_id__in=project_ids)
+    return queryset
+
+
+def expected_stats(project_ids=None, using=DEFAULT_DB_ALIAS):
+    # The same three tables, computed with GROUP BY over Task.
+    tasks = _scoped(Task.objects.order_by(), project_ids, using)
+    projects = defaultdict(dict)
+    for row in tasks.values("project_id", "status").annotate(n=Count("id")):
+        projects[row["project_id"]][STATUS_COLUMNS[row["status"]]] = row["n"]
+
+    assignees = defaultdict(dict)
+    for row in (
+        tasks.filter(assigned_to__isnull=False)
+        .values("project_id", "assigned_to_id", "status")
+        .annotate(n=Count("id"))
+    ):
+        key = (row["project_id"], row["assigned_to_id"])
+        assignees[key][STATUS_COLUMNS[row["status"]]] = row["n"]
+
+    due_dates = {
+        (row["project_id"], row["due_date"]): row["n"]
+        for row in tasks.filter(due_date__isnull=False)
+        .exclude(status="DONE")
+        .values("project_id", "due_date")
+        .annotate(n=Count("id"))
+    }
+    return dict(projects), dict(assignees), due_dates
+
+
+def current_stats(project_ids=None, using=DEFAULT_DB_ALIAS):
+    columns = list(STATUS_COLUMNS.values())
+
+    def nonzero(row):
+        return {column: row[column] for column in columns if row[column]}
+
+    projects = {
+        row["project_id"]: nonzero(row)
+        for row in _scoped(ProjectStats.objects, project_ids, using).values(
+            "project_id", *columns
+        )
+    }
+    assignees = {
+        (row["project_id"], row["user_id"]): nonzero(row)
+        for row in _scoped(ProjectAssigneeStats.objects, project_ids, using).values(
+            "project_id", "user_id", *columns
+        )
+    }
+    due_dates = {
+        (project_id, due_date): n
+        for project_id, due_date, n in _scoped(
+            ProjectDueDateStats.objects, project_ids, using
+        ).values_list("project_id", "due_date", "open_count")
+    }
+    return (
+        {key: value for key, value in projects.items() if value},
+        {key: value for key, value in assignees.items() if value},
+        {key: n for key, n in due_dates.items() if n},
+    )
+
+
+def find_drift(project_ids=None, using=DEFAULT_DB_ALIAS):
+    drifted = set()
+    for expected, current in zip(
+        expected_stats(project_ids, using), current_stats(project_ids, using)
+    ):
+        for key in expected.keys() | current.keys():
+            if expected.get(key) != current.get(key):
+                drifted.add(key[0] if isinstance(key, tuple) else key)
+    return sorted(drifted)
+
+
+def rebuild_project_stats(project_ids=None, using=DEFAULT_DB_ALIAS):
+    with transaction.atomic(using=using):
+        if project_ids is not None:
+            # Task writers bump their project row before touching the stats,
+            # so holding these locks keeps them out until the rebuild commits.
+            list(
+                Project.objects.using(using)
+                .select_for_update()
+                .filter(pk__in=project_ids)
+                .values_list("pk", flat=True)
+            )
+        projects, assignees, due_dates = expected_stats(project_ids, using)
+        for model in (ProjectStats, ProjectAssigneeStats, ProjectDueDateStats):
+            _scoped(model.objects, project_ids, using).delete()
+        ProjectStats.objects.using(using).bulk_create(
+            ProjectStats(project_id=project_id, **columns)
+            for project_id, columns in projects.items()
+        )
+        ProjectAssigneeStats.objects.using(using).bulk_create(
+            ProjectAssigneeStats(project_id=project_id, user_id=user_id, **columns)
+            for (project_id, user_id), columns in assignees.items()
+        )
+        ProjectDueDateStats.objects.using(using).bulk_create(
+            ProjectDueDateStats(project_id=project_id, due_date=due_date, open_count=n)
+            for (project_id, due_date), n in due_dates.items()
+        )
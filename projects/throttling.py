@@ -0,0 +1,200 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    # "120/min" -> tokens per second
+    count, period = rate.split("/")
+    return int(count) / PERIODS[period[0]]
+
+
+class LocalBucketStore:
+    # Exact token buckets in this process, behind one lock. Buckets that
+    # have refilled are dropped once there are more than max_entries.
+
+    def __init__(self, max_entries=10_000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def consume(self, key, rate, burst, now):
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (burst, now, None))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            wait = 0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            if len(self._buckets) > self.max_entries:
+                self._buckets = {
+                    key: bucket
+                    for key, bucket in self._buckets.items()
+                    if bucket[2] > now
+                }
+            return wait
+
+    def refund(self, key, rate, burst, now):
+        with self._lock:
+            if key not in self._buckets:
+                return
+            tokens, updated, _ = self._buckets[key]
+            tokens = min(burst, tokens + (now - updated) * rate + 1)
+            self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+
+
+class CacheBucketStore:
+    # Token buckets shared through a Django cache alias using only add and
+    # atomic incr/decr, so every worker draws from the same bucket. A bucket
+    # is a fixed origin and a count of used tokens; it holds
+    # burst + rate * (now - origin) - used tokens, and the origin moves
+    # forward whenever that would exceed burst. Concurrent requests can race
+    # that move, which at worst hands out a token early.
+
+    def __init__(self, alias="default", timeout=3600):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def consume(self, key, rate, burst, now):
+        origin_key, used_key = f"{key}:origin", f"{key}:used"
+        values = self.cache.get_many([origin_key, used_key])
+        origin = values.get(origin_key)
+        used = values.get(used_key)
+        if used is None:
+            self.cache.add(used_key, 0, self.timeout)
+            used = 0
+        if origin is None or rate * (now - origin) > used:
+            origin = now - used / rate
+            self.cache.set(origin_key, origin, self.timeout)
+
+        try:
+            used = self.cache.incr(used_key)
+        except ValueError:
+            # Evicted between add and incr: start a fresh bucket.
+            self.cache.set_many({origin_key: now, used_key: 1}, self.timeout)
+            return 0
+        available = burst + rate * (now - origin)
+        if used <= available:
+            return 0
+        self.cache.decr(used_key)
+        # Keep a bucket that is under pressure from expiring back to full.
+        self.cache.touch(origin_key, self.timeout)
+        self.cache.touch(used_key, self.timeout)
+        return (used - available) / rate
+
+    def refund(self, key, rate, burst, now):
+        try:
+            self.cache.decr(f"{key}:used")
+        except ValueError:
+            # Expired, so the bucket is full again anyway.
+            pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_bucket_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                config = settings.WRITE_THROTTLES["STORE"]
+                store_class = import_string(config["BACKEND"])
+                _store = store_class(**config.get("OPTIONS", {}))
+    return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    # Throttles unsafe requests to views whose throttle_scope is listed in
+    # WRITE_THROTTLES["SCOPES"]: first against the caller's own bucket, then
+    # against the endpoint's bucket shared by everyone. A caller refused by
+    # their own bucket does not drain the shared one, and a request the
+    # shared one refuses gives the caller's token back.
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_buckets(self, request):
+        if request.user and request.user.is_authenticated:
+            caller = f"user:{request.user.pk}"
+        else:
+            caller = f"anon:{self.get_ident(request)}"
+        return {"user": caller, "endpoint": "all"}
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        scope = getattr(view, "throttle_scope", None)
+        limits = settings.WRITE_THROTTLES["SCOPES"].get(scope)
+        if not limits:
+            return True
+        store = get_bucket_store()
+        now = time.time()
+        consumed = []
+        for name, bucket in self.get_buckets(request).items():
+            limit = limits.get(name)
+            if limit is None:
+                continue
+            args = (
+                f"throttle:{scope}:{bucket}",
+                parse_rate(limit["rate"]),
+                limit["burst"],
+                now,
+            )
+            self.wait_seconds = store.consume(*args)
+            if self.wait_seconds:
+                for taken in consumed:
+                    store.refund(*taken)
+                return False
+            consumed.append(args)
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class ConcurrencyLimiter:
+    # Admits up to max_in_flight holders; up to max_queued more wait for a
+    # slot, and anything beyond that is refused straight away.
+
+    def __init__(self, max_in_flight, max_queued):
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.in_flight = 0
+        self.queued = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout):
+        with self._condition:
+            if self.in_flight < self.max_in_flight:
+                self.in_flight += 1
+                return True
+            if not timeout or self.queued >= self.max_queued:
+                return False
+            self.queued += 1
+            try:
+                admitted = self._condition.wait_for(
+                    lambda: self.in_flight < self.max_in_flight, timeout
+                )
+                if admitted:
+                    self.in_flight += 1
+                return admitted
+            finally:
+                self.queued -= 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
@@ -1,7 +1,18 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .async_views import (
+    project_detail as async_project_detail,
+    project_events,
+    project_list as async_project_list,
+    task_detail as async_task_detail,
+    task_list as async_task_list,
+)
 from .views import (
+    JobViewSet,
     ProjectDetailApiView,
+    ProjectDetailCacheStatsApiView,
+    ProjectExportApiView,
+    ProjectStatsApiView,
     ProjectListCreateApiView,
     TaskViewSet,
     UserRegisterView,
@@ -11,9 +22,9 @@ from .views import (
     UserDeleteView,
 )
 
-
 router = DefaultRouter()
 router.register(r"tasks", TaskViewSet)
+router.register(r"jobs", JobViewSet)
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -21,11 +32,29 @@ urlpatterns = [
     path("users/register/", UserRegisterView.as_view(), name="user-register"),
     path("users/delete/<int:pk>/", UserDeleteView.as_view(), name="delete-user"),
     path("projects/", ProjectListCreateApiView.as_view(), name="project-list-create"),
+    path("projects/export/", ProjectExportApiView.as_view(), name="project-export"),
+    path(
+        "projects/cache-stats/",
+        ProjectDetailCacheStatsApiView.as_view(),
+        name="project-detail-cache-stats",
+    ),
     path("projects/<int:pk>/", ProjectDetailApiView.as_view(), name="project-detail"),
     path("projects/<int:pk>/add-member/", add_user_to_project, name="add-member"),
+    path(
+        "projects/<int:pk>/stats/", ProjectStatsApiView.as_view(), name="project-stats"
+    ),
+    path("projects/<int:pk>/events/", project_events, name="project-events"),
     path(
         "projects/<int:pk>/remove-member/",
         remove_member_from_project,
         name="remove-member",
     ),
+    path("async/projects/", async_project_list, name="async-project-list"),
+    path(
+        "async/projects/<int:pk>/",
+        async_project_detail,
+        name="async-project-detail",
+    ),
+    path("async/tasks/", async_task_list, name="async-task-list"),
+    path("async/tasks/<int:pk>/", async_task_detail, name="async-task-detail"),
 ]
@@ -1,26 +1,97 @@
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import (
+    api_view,
+    permission_classes,
+    action,
+    throttle_scope,
+)
 from rest_framework.response import Response
 from rest_framework.generics import CreateAPIView, DestroyAPIView, ListAPIView
 from rest_framework.views import APIView
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework import viewsets, status, serializers
-from .models import Project, Task
+from .models import Job, Project, Task
 from .serializers import (
+    ExportJobSerializer,
+    JobSerializer,
     ProjectSerializer,
+    ProjectStatsSerializer,
+    ProjectSummarySerializer,
+    StatsRebuildJobSerializer,
+    TaskChangesSerializer,
     TaskSerializer,
     UserRegisterSerializer,
     UserSerializer,
 )
 from .permissions import IsProjectMember
-from django.db.models import Q
+from .membership import get_membership_resolver
+from .bulk import (
+    BULK_MAX_ITEMS,
+    BulkAssignItem,
+    BulkStatusItem,
+    BulkTaskCreateItem,
+    bulk_assign,
+    bulk_create_tasks,
+    bulk_set_status,
+)
+from .fieldsets import get_field_selection, selection_parameters
+from .pagination import ProjectCursorPagination, TaskKeysetPagination
+from .filters import FullTextSearchFilter, TaskFilter
+from .queries import (
+    TASK_ORDERING_FIELDS,
+    filter_projects,
+    project_detail_queryset,
+    project_list_queryset,
+    select_task_fields,
+    select_user_fields,
+    visible_projects,
+    visible_tasks,
+)
+from .export import (
+    EXPORT_FORMATS,
+    PROJECT_EXPORT_COLUMNS,
+    TASK_EXPORT_COLUMNS,
+    export_queryset,
+    streaming_export,
+)
+from .jobs import active_job, enqueue, export_path
+from .deletion import delete_user
+from .stats import project_stats
+from .detail_cache import get_detail_cache
+from .routers import reading_from_replica
+from .changelog import (
+    CursorExpired,
+    InvalidCursor,
+    build_change_feed,
+    decode_cursor,
+    head_cursor,
+)
+from .conditional import (
+    conditional,
+    project_detail_state,
+    project_list_state,
+    task_detail_state,
+    task_list_state,
+)
+from django.conf import settings
+from django.http import FileResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.contrib.auth.models import User
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiExample,
+    OpenApiParameter,
+)
 from drf_spectacular.types import OpenApiTypes
 
+CHANGES_DEFAULT_LIMIT = 500
+CHANGES_MAX_LIMIT = 1000
+
 
 class AssignPayload(serializers.Serializer):
     assigned_to_id = serializers.IntegerField()
@@ -34,17 +105,69 @@ class UserIdPayload(serializers.Serializer):
     user_id = serializers.IntegerField()
 
 
+EXPORT_FORMAT_PARAMETER = OpenApiParameter(
+    name="export_format",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    enum=list(EXPORT_FORMATS),
+    description="ndjson (default) or csv.",
+)
+
+
+def get_export_format(request):
+    export_format = request.query_params.get("export_format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        raise serializers.ValidationError(
+            {"export_format": f"Choose one of: {', '.join(EXPORT_FORMATS)}"}
+        )
+    return export_format
+
+
+def parse_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 class UserRegisterView(CreateAPIView):
     queryset = User.objects.all()
     permission_classes = [AllowAny]
     serializer_class = UserRegisterSerializer
 
 
-class UserListView(ListAPIView):
-    queryset = User.objects.all().order_by("id")
+class FieldSelectionMixin:
+    # Views listing selection_actions honour ?fields= and ?expand= on their
+    # serializer and push the selection down into get_queryset().
+    selection_actions = ("list", "retrieve")
+
+    def get_selection(self):
+        # Plain generic views have no action; treat them as their list.
+        if getattr(self, "action", "list") not in self.selection_actions:
+            return None
+        if not hasattr(self, "_selection"):
+            self._selection = get_field_selection(
+                self.request.query_params, self.get_serializer_class()
+            )
+        return self._selection
+
+    def get_serializer(self, *args, **kwargs):
+        selection = self.get_selection()
+        if selection is not None:
+            kwargs.setdefault("selection", selection)
+        return super().get_serializer(*args, **kwargs)
+
+
+@extend_schema_view(list=extend_schema(parameters=selection_parameters(UserSerializer)))
+class UserListView(FieldSelectionMixin, ListAPIView):
     permission_classes = [IsAdminUser]
     serializer_class = UserSerializer
 
+    def get_queryset(self):
+        users = User.objects.all().order_by("id")
+        selection = self.get_selection()
+        return select_user_fields(users, selection) if selection else users
+
 
 class UserDeleteView(DestroyAPIView):
     queryset = User.objects.all()
@@ -52,31 +175,61 @@ class UserDeleteView(DestroyAPIView):
     permission_classes = [IsAdminUser]
     lookup_field = "pk"
 
+    def perform_destroy(self, instance):
+        delete_user(instance)
+
 
-class TaskViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(
+        parameters=selection_parameters(
+            TaskSerializer, TaskSerializer.expandable_fields
+        )
+    ),
+    retrieve=extend_schema(
+        parameters=selection_parameters(
+            TaskSerializer, TaskSerializer.expandable_fields
+        )
+    ),
+)
+class TaskViewSet(FieldSelectionMixin, viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskKeysetPagination
+    throttle_scope = "tasks"
 
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ["project", "status", "assigned_to"]
-    ordering_fields = ["due_date", "created_at", "title"]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
+    filterset_class = TaskFilter
+    ordering_fields = list(TASK_ORDERING_FIELDS)
     search_fields = ["title", "description"]
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = Task.objects.select_related("project", "assigned_to")
-        if user.is_staff:
-            return queryset
-        return queryset.filter(project__members=user)
+        queryset = visible_tasks(self.request.user)
+        selection = self.get_selection()
+        if selection is not None:
+            return select_task_fields(queryset, selection)
+        if self.detail:
+            queryset = queryset.prefetch_related("project__members")
+        return queryset
+
+    @method_decorator(conditional(task_list_state))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @method_decorator(conditional(task_detail_state))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def check_project_access(self, project, message):
+        resolver = get_membership_resolver(self.request)
+        if not resolver.can_access(self.request.user, project):
+            raise PermissionDenied(message)
 
     def perform_create(self, serializer):
         project = serializer.validated_data["project"]
-        user = self.request.user
-        if not (user.is_staff or project.members.filter(id=user.id).exists()):
-            raise PermissionDenied(
-                "You are not allowed to create tasks in this project"
-            )
+        self.check_project_access(
+            project, "You are not allowed to create tasks in this project"
+        )
         serializer.save()
 
     @extend_schema(
@@ -95,35 +248,31 @@ class TaskViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["patch"], url_path="assign")
     def assign(self, request, pk=None):
         task = self.get_object()
-        user_id = request.data.get("user_id")
-        user = request.user
-
-        if not (user.is_staff or task.project.members.filter(id=user.id).exists()):
-            raise PermissionDenied(
-                "You are not allowed to assign tasks in this project"
-            )
+        self.check_project_access(
+            task.project, "You are not allowed to assign tasks in this project"
+        )
 
+        user_id = parse_int(request.data.get("user_id"))
         if not user_id:
             return Response(
                 {"error": "User ID is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            assignee = User.objects.get(pk=user_id)
-        except User.DoesNotExist:
-            return Response(
-                {"error": "User not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-
-        if not task.project.members.filter(id=assignee.id).exists():
+        resolver = get_membership_resolver(request)
+        assignee = resolver.get_member(task.project, user_id)
+        if assignee is None:
+            if not User.objects.filter(pk=user_id).exists():
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_404_NOT_FOUND
+                )
             return Response(
                 {"error": "User is not project member"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        data = {"assigned_to_id": assignee.id}
-        serializer = TaskSerializer(task, data=data, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+
+        task.assigned_to = assignee
+        task.save(update_fields=["assigned_to", "updated_at"])
+        serializer = TaskSerializer(task, context=self.get_serializer_context())
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @extend_schema(
@@ -136,32 +285,27 @@ class TaskViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["patch"], url_path="unassign")
     def unassign(self, request, pk=None):
         task = self.get_object()
-        user = request.user
-
-        if not (user.is_staff or task.project.members.filter(id=user.id).exists()):
-            raise PermissionDenied(
-                "You are not allowed to unassign task in this project"
-            )
+        self.check_project_access(
+            task.project, "You are not allowed to unassign task in this project"
+        )
 
         if task.assigned_to_id is None:
             return Response(
                 {"error": "Task is not assigned"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        user_id = request.data.get("user_id")
+        user_id = parse_int(request.data.get("user_id"))
         if not user_id:
             return Response(
                 {"error": "User ID is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            assignee_to_remove = User.objects.get(pk=user_id)
-        except User.DoesNotExist:
-            return Response(
-                {"error": "User not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-
-        if assignee_to_remove.id != task.assigned_to_id:
+        if user_id != task.assigned_to_id:
+            assignee_to_remove = User.objects.filter(pk=user_id).first()
+            if assignee_to_remove is None:
+                return Response(
+                    {"error": "User not found"}, status=status.HTTP_404_NOT_FOUND
+                )
             return Response(
                 {
                     "error": f"{assignee_to_remove.username} is not current assignee to this task"
@@ -169,9 +313,9 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        serializer = TaskSerializer(task, data={"assigned_to_id": None}, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        task.assigned_to = None
+        task.save(update_fields=["assigned_to", "updated_at"])
+        serializer = TaskSerializer(task, context=self.get_serializer_context())
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @extend_schema(
@@ -185,12 +329,9 @@ class TaskViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["patch"], url_path="set-status")
     def set_status(self, request, pk=None):
         task = self.get_object()
-        user = request.user
-
-        if not (user.is_staff or task.project.members.filter(id=user.id).exists()):
-            raise PermissionDenied(
-                "You are not allowed to change task status in this project"
-            )
+        self.check_project_access(
+            task.project, "You are not allowed to change task status in this project"
+        )
 
         new_status = request.data.get("status")
 
@@ -199,22 +340,155 @@ class TaskViewSet(viewsets.ModelViewSet):
                 {"error": "Status is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        serializer = TaskSerializer(task, data={"status": new_status}, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        payload = StatusPayload(data={"status": new_status})
+        payload.is_valid(raise_exception=True)
+        task.status = payload.validated_data["status"]
+        task.save(update_fields=["status", "updated_at"])
+        serializer = TaskSerializer(task, context=self.get_serializer_context())
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise serializers.ValidationError(
+                {"error": "Expected a non-empty list of operations"}
+            )
+        if len(items) > BULK_MAX_ITEMS:
+            raise serializers.ValidationError(
+                {"error": f"At most {BULK_MAX_ITEMS} operations per request"}
+            )
+        return items
+
+    @extend_schema(
+        request=BulkTaskCreateItem(many=True),
+        responses=OpenApiTypes.OBJECT,
+        description="Create many tasks in one transaction. Returns per-item results.",
+        tags=["tasks"],
+        operation_id="task_bulk_create",
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-create")
+    def bulk_create(self, request):
+        results = bulk_create_tasks(request, self.get_bulk_items(request))
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=BulkStatusItem(many=True),
+        responses=OpenApiTypes.OBJECT,
+        description="Change the status of many tasks. Returns per-item results.",
+        tags=["tasks"],
+        operation_id="task_bulk_set_status",
+    )
+    @action(detail=False, methods=["patch"], url_path="bulk-set-status")
+    def bulk_set_status(self, request):
+        results = bulk_set_status(
+            request, self.get_queryset(), self.get_bulk_items(request)
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=BulkAssignItem(many=True),
+        responses=OpenApiTypes.OBJECT,
+        description="Assign or unassign (assigned_to_id: null) many tasks.",
+        tags=["tasks"],
+        operation_id="task_bulk_assign",
+    )
+    @action(detail=False, methods=["patch"], url_path="bulk-assign")
+    def bulk_assign(self, request):
+        results = bulk_assign(
+            request, self.get_queryset(), self.get_bulk_items(request)
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="cursor",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Cursor from the previous response. Omit to get the current head.",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description=f"Max change log entries to read (default {CHANGES_DEFAULT_LIMIT}).",
+            ),
+        ],
+        responses=TaskChangesSerializer,
+        description=(
+            "Tasks created, updated or deleted since the cursor, with project "
+            "tombstones. A cursor older than the log's retention answers 410 "
+            "with a fresh head cursor; clients reload their tasks and continue "
+            "from it."
+        ),
+        tags=["tasks"],
+        operation_id="task_changes",
+    )
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        cursor = request.query_params.get("cursor")
+        if not cursor:
+            feed = {
+                "changed": [],
+                "deleted": [],
+                "deleted_projects": [],
+                "resync_projects": [],
+                "cursor": head_cursor(),
+                "has_more": False,
+            }
+            return Response(TaskChangesSerializer(feed).data)
+
+        try:
+            after = decode_cursor(cursor)
+        except InvalidCursor:
+            return Response(
+                {"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = parse_int(request.query_params.get("limit"))
+        limit = min(max(limit or CHANGES_DEFAULT_LIMIT, 1), CHANGES_MAX_LIMIT)
+        try:
+            feed = build_change_feed(request.user, after, limit)
+        except CursorExpired:
+            # Entries after the cursor were pruned: reload, then follow the
+            # feed from this head.
+            return Response(
+                {"error": "Cursor expired", "cursor": head_cursor()},
+                status=status.HTTP_410_GONE,
+            )
+        serializer = TaskChangesSerializer(feed, context=self.get_serializer_context())
+        return Response(serializer.data)
+
+    @extend_schema(
+        parameters=[EXPORT_FORMAT_PARAMETER],
+        responses={(200, "application/x-ndjson"): OpenApiTypes.STR},
+        description="Stream every visible task matching the list filters.",
+        tags=["tasks"],
+        operation_id="task_export",
+    )
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        export_format = get_export_format(request)
+        tasks = self.filter_queryset(self.get_queryset())
+        if not tasks.ordered:
+            tasks = tasks.order_by("id")
+        return streaming_export(
+            request, tasks, TASK_EXPORT_COLUMNS, export_format, "tasks"
+        )
+
 
 class ProjectListCreateApiView(APIView):
     permission_classes = [IsAuthenticated]
+    pagination_class = ProjectCursorPagination
 
     @extend_schema(
+        responses=ProjectSummarySerializer(many=True),
         parameters=[
             OpenApiParameter(
                 name="search",
                 type=OpenApiTypes.STR,
                 location=OpenApiParameter.QUERY,
-                description="Search in project name or description.",
+                description="Full-text prefix search in project name or description.",
             ),
             OpenApiParameter(
                 name="member",
@@ -228,32 +502,27 @@ class ProjectListCreateApiView(APIView):
                 location=OpenApiParameter.QUERY,
                 description="Order by name or created_at (prefix with - for desc).",
             ),
-        ]
+            OpenApiParameter(
+                name="cursor",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Opaque pagination cursor taken from next/previous links.",
+            ),
+            *selection_parameters(
+                ProjectSummarySerializer, ProjectSummarySerializer.expandable_fields
+            ),
+        ],
     )
+    @method_decorator(conditional(project_list_state))
     def get(self, request):
-        user = request.user
-        if user.is_staff:
-            projects = Project.objects.all()
-        else:
-            projects = Project.objects.filter(members=user)
-
-        member_id = request.query_params.get("member")
-        if member_id:
-            projects = projects.filter(members__id=member_id)
-
-        search = request.query_params.get("search")
-        if search:
-            projects = projects.filter(
-                Q(name__icontains=search) | Q(description__icontains=search)
-            )
-
-        ordering = request.query_params.get("ordering")
-        if ordering in ("name", "-name", "created_at", "-created_at"):
-            projects = projects.order_by(ordering)
-
-        projects = projects.prefetch_related("members", "tasks").distinct()
-        serializer = ProjectSerializer(projects, many=True)
-        return Response(serializer.data)
+        selection = get_field_selection(request.query_params, ProjectSummarySerializer)
+        projects = project_list_queryset(
+            request.user, request.query_params, selection=selection
+        )
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(projects, request, view=self)
+        serializer = ProjectSummarySerializer(page, many=True, selection=selection)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = ProjectSerializer(data=request.data, context={"request": request})
@@ -264,17 +533,94 @@ class ProjectListCreateApiView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class ProjectExportApiView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[
+            EXPORT_FORMAT_PARAMETER,
+            OpenApiParameter(
+                name="search",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Full-text prefix search in project name or description.",
+            ),
+            OpenApiParameter(
+                name="member",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Only projects with this member id.",
+            ),
+        ],
+        responses={(200, "application/x-ndjson"): OpenApiTypes.STR},
+        description="Stream every visible project with its task counts.",
+        operation_id="project_export",
+    )
+    def get(self, request):
+        export_format = get_export_format(request)
+        projects = filter_projects(visible_projects(request.user), request.query_params)
+        projects = projects.with_task_counts().order_by("id")
+        return streaming_export(
+            request, projects, PROJECT_EXPORT_COLUMNS, export_format, "projects"
+        )
+
+
+class ProjectDetailCacheStatsApiView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        responses=OpenApiTypes.OBJECT,
+        description="Hit, miss and invalidation counts of the project detail cache.",
+    )
+    def get(self, request):
+        return Response(get_detail_cache().stats())
+
+
+class ProjectStatsApiView(APIView):
+    permission_classes = [IsAuthenticated, IsProjectMember]
+
+    @extend_schema(
+        responses=ProjectStatsSerializer,
+        description="Task counts by status, overdue open tasks and per-assignee workloads.",
+    )
+    def get(self, request, pk):
+        project = get_object_or_404(Project, pk=pk)
+        self.check_object_permissions(request, project)
+        serializer = ProjectStatsSerializer(project_stats(project.pk))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
 class ProjectDetailApiView(APIView):
     permission_classes = [IsAuthenticated, IsProjectMember]
 
     def get_object(self, pk):
-        return get_object_or_404(Project, pk=pk)
+        return get_object_or_404(Project.objects.prefetch_related("members"), pk=pk)
 
+    @extend_schema(
+        responses=ProjectSerializer, parameters=selection_parameters(ProjectSerializer)
+    )
+    @method_decorator(conditional(project_detail_state))
     def get(self, request, pk):
-        project = self.get_object(pk)
+        selection = get_field_selection(request.query_params, ProjectSerializer)
+        entry = get_detail_cache().lookup(pk, selection.key())
+        if entry.payload is not None:
+            # Cached payloads only exist for live projects; access is still
+            # checked per request.
+            self.check_object_permissions(request, Project(pk=pk))
+            return Response(entry.payload, headers={"X-Cache": "HIT"})
+
+        project = get_object_or_404(project_detail_queryset(selection), pk=pk)
         self.check_object_permissions(request, project)
-        serializer = ProjectSerializer(project)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        serializer = ProjectSerializer(project, selection=selection)
+        entry.store(
+            dict(serializer.data),
+            min_age=(
+                settings.DATABASE_REPLICA_LAG_SECONDS if reading_from_replica() else 0
+            ),
+        )
+        return Response(
+            serializer.data, status=status.HTTP_200_OK, headers={"X-Cache": "MISS"}
+        )
 
     def put(self, request, pk):
         project = self.get_object(pk)
@@ -286,32 +632,39 @@ class ProjectDetailApiView(APIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @extend_schema(
+        request=None,
+        responses={202: JobSerializer},
+        description="Queue the project and its tasks for deletion; poll the job.",
+    )
     def delete(self, request, pk):
         project = self.get_object(pk)
         self.check_object_permissions(request, project)
-        project.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        job = active_job(Job.DELETE_PROJECT, project_id=project.pk) or enqueue(
+            Job.DELETE_PROJECT, {"project_id": project.pk}, request.user
+        )
+        return job_accepted(request, job)
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@throttle_scope("add-member")
 def add_user_to_project(request, pk):
     try:
-        project = Project.objects.get(pk=pk)
+        project = Project.objects.prefetch_related("members").get(pk=pk)
     except Project.DoesNotExist:
         return Response(
             {"error": "Project does not exist"}, status=status.HTTP_404_NOT_FOUND
         )
 
-    if not (
-        request.user.is_staff or project.members.filter(id=request.user.id).exists()
-    ):
+    resolver = get_membership_resolver(request)
+    if not resolver.can_access(request.user, project):
         return Response(
             {"error": "You are not allowed to add members"},
             status=status.HTTP_403_FORBIDDEN,
         )
 
-    user_id = request.data.get("user_id")
+    user_id = parse_int(request.data.get("user_id"))
     if not user_id:
         return Response(
             {"error": "User ID is required"}, status=status.HTTP_400_BAD_REQUEST
@@ -324,7 +677,7 @@ def add_user_to_project(request, pk):
             {"error": "User does not exist"}, status=status.HTTP_404_NOT_FOUND
         )
 
-    if project.members.filter(id=user_to_add.id).exists():
+    if resolver.is_member(user_to_add, project):
         return Response(
             {
                 "message": f"User {user_to_add.username} is already member of project {project.name}"
@@ -343,21 +696,19 @@ def add_user_to_project(request, pk):
 @permission_classes([IsAuthenticated])
 def remove_member_from_project(request, pk):
     try:
-        project = Project.objects.get(pk=pk)
+        project = Project.objects.prefetch_related("members").get(pk=pk)
     except Project.DoesNotExist:
         return Response(
             {"error": "No projects with matching id"}, status=status.HTTP_404_NOT_FOUND
         )
 
-    if not (
-        request.user.is_staff or project.members.filter(id=request.user.id).exists()
-    ):
+    if not get_membership_resolver(request).can_access(request.user, project):
         return Response(
             {"error": "You are not allowed to remove members"},
             status=status.HTTP_403_FORBIDDEN,
         )
 
-    user_id = request.data.get("user_id", "")
+    user_id = parse_int(request.data.get("user_id", ""))
     if not user_id:
         return Response(
             {"error": "User ID is required"}, status=status.HTTP_400_BAD_REQUEST
@@ -377,3 +728,87 @@ def remove_member_from_project(request, pk):
         },
         status=status.HTTP_200_OK,
     )
+
+
+def job_accepted(request, job):
+    return Response(
+        JobSerializer(job).data,
+        status=status.HTTP_202_ACCEPTED,
+        headers={"Location": reverse("job-detail", kwargs={"pk": job.pk})},
+    )
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+    throttle_scope = "jobs"
+
+    def get_queryset(self):
+        jobs = Job.objects.order_by("-id")
+        if self.request.user.is_staff:
+            return jobs
+        return jobs.filter(created_by=self.request.user)
+
+    @extend_schema(
+        request=ExportJobSerializer,
+        responses={202: JobSerializer},
+        description="Queue an export of visible tasks or projects, filtered like "
+        "the list endpoints; download it from the job when it succeeds.",
+    )
+    @action(detail=False, methods=["post"], url_path="exports")
+    def exports(self, request):
+        payload = ExportJobSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        data = payload.validated_data
+        # Reject bad filters now rather than in the worker.
+        export_queryset(data["kind"], data["filters"], request.user)
+        job = enqueue(Job.EXPORT, {**data, "user_id": request.user.pk}, request.user)
+        return job_accepted(request, job)
+
+    @extend_schema(
+        request=StatsRebuildJobSerializer,
+        responses={202: JobSerializer},
+        description="Queue a rebuild of the stats tables for some or all projects.",
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="stats-rebuilds",
+        permission_classes=[IsAdminUser],
+    )
+    def stats_rebuilds(self, request):
+        payload = StatsRebuildJobSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        project_ids = payload.validated_data.get("project_ids")
+        job = enqueue(Job.REBUILD_STATS, {"project_ids": project_ids}, request.user)
+        return job_accepted(request, job)
+
+    @extend_schema(
+        responses={(200, "application/octet-stream"): OpenApiTypes.BINARY},
+        description="The file written by a succeeded export job, until it "
+        "expires; 410 once it has been removed.",
+    )
+    @action(detail=True, methods=["get"], url_path="download")
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.kind != Job.EXPORT or job.status != Job.SUCCEEDED:
+            return Response(
+                {"error": "Job has no export to download"},
+                status=status.HTTP_409_CONFLICT,
+            )
+        try:
+            export = open(export_path(job), "rb")
+        except FileNotFoundError:
+            # Expired, or written on another host's EXPORT_DIR.
+            return Response(
+                {"error": "Export file is no longer available"},
+                status=status.HTTP_410_GONE,
+            )
+        export_format = job.payload["format"]
+        return FileResponse(
+            export,
+            as_attachment=True,
+            filename=f"{job.payload['kind']}.{export_format}",
+            content_type=EXPORT_FORMATS[export_format],
+        )
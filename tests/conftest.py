@@ -1,9 +1,23 @@
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from projects.models import Task, Project
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings):
+    # One test process stands in for a deployment with a shared cache.
+    settings.CACHE_SHARED = True
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -0,0 +1,15 @@
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+def auth_headers(user):
+    return {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+
+def async_get(url, user=None, **params):
+    async def fetch():
+        headers = auth_headers(user) if user is not None else {}
+        return await AsyncClient().get(url, params, headers=headers)
+
+    return async_to_sync(fetch)()
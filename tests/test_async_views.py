@@ -0,0 +1,109 @@
+from urllib.parse import parse_qs, urlsplit
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from projects.models import Project, Task
+from tests.helpers import async_get
+
+
+def test_async_endpoints_require_authentication(project, task):
+    for url in (
+        reverse("async-project-list"),
+        reverse("async-project-detail", kwargs={"pk": project.id}),
+        reverse("async-task-list"),
+        reverse("async-task-detail", kwargs={"pk": task.id}),
+    ):
+        response = async_get(url)
+        assert response.status_code == 401
+        assert "WWW-Authenticate" in response
+
+
+def test_async_project_list_matches_sync(auth_client_for_user, user, project):
+    other = Project.objects.create(name="Gamma", description="second")
+    other.members.add(user)
+    Project.objects.create(name="Hidden")
+    Task.objects.create(project=project, title="T1", status="DONE")
+
+    for params in ({}, {"ordering": "name"}, {"expand": "tasks"}):
+        sync = auth_client_for_user.get(reverse("project-list-create"), params)
+        response = async_get(reverse("async-project-list"), user, **params)
+        assert response.status_code == 200
+        assert response.json()["results"] == sync.json()["results"]
+
+
+def test_async_project_detail_checks_membership(user, user2, project, task):
+    url = reverse("async-project-detail", kwargs={"pk": project.id})
+    response = async_get(url, user)
+    assert response.status_code == 200
+    assert response.json()["name"] == "Alpha"
+    assert [t["id"] for t in response.json()["tasks"]] == [task.id]
+
+    assert async_get(url, user2).status_code == 403
+    missing = reverse("async-project-detail", kwargs={"pk": project.id + 100})
+    assert async_get(missing, user).status_code == 404
+
+
+def test_async_task_list_filters_and_paginates(
+    auth_client_for_user, user, user2, project, task
+):
+    Task.objects.create(project=project, title="Second", status="DONE")
+    hidden = Project.objects.create(name="Other")
+    Task.objects.create(project=hidden, title="Hidden")
+
+    url = reverse("async-task-list")
+    response = async_get(url, user)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 2
+    sync = auth_client_for_user.get(reverse("task-list"), {"ordering": "title"})
+    ordered = async_get(url, user, ordering="title").json()
+    assert ordered["results"] == sync.json()["results"]
+
+    done = async_get(url, user, status="DONE").json()
+    assert [t["title"] for t in done["results"]] == ["Second"]
+    assert async_get(url, user, status="bogus").status_code == 400
+    assert async_get(url, user, page=5).status_code == 404
+    assert async_get(url, user2).json()["count"] == 0
+
+
+def test_async_task_list_pages_like_sync(auth_client_for_user, user, project, task):
+    Task.objects.create(project=project, title="Second")
+    url = reverse("async-task-list")
+    sync = auth_client_for_user.get(reverse("task-list"), {"page_size": 1}).json()
+    first = async_get(url, user, page_size=1).json()
+    assert first.keys() == sync.keys()
+    assert first["results"] == sync["results"]
+    assert first["count"] == 2
+
+    cursor = parse_qs(urlsplit(first["next"]).query)["cursor"][0]
+    second = async_get(url, user, page_size=1, cursor=cursor).json()
+    assert [t["title"] for t in second["results"]] == ["Second"]
+    assert second["next"] is None and second["count"] is None
+
+
+def test_async_views_ignore_session_auth(user, project):
+    async def fetch():
+        client = AsyncClient()
+        await client.aforce_login(user)
+        return await client.get(reverse("async-task-list"))
+
+    assert async_to_sync(fetch)().status_code == 401
+
+
+def test_async_task_detail_hides_other_projects(user, user2, task):
+    url = reverse("async-task-detail", kwargs={"pk": task.id})
+    response = async_get(url, user)
+    assert response.status_code == 200
+    assert response.json()["title"] == "T1"
+    assert async_get(url, user2).status_code == 404
+
+
+def test_async_views_honour_field_selection(auth_client_for_user, user, task):
+    params = {"fields": "title,assigned_to.username", "expand": "project"}
+    sync = auth_client_for_user.get(reverse("task-list"), params).json()
+    response = async_get(reverse("async-task-list"), user, **params)
+    assert response.json()["results"] == sync["results"]
+
+    url = reverse("async-task-detail", kwargs={"pk": task.id})
+    assert async_get(url, user, fields="secret").status_code == 400
@@ -0,0 +1,103 @@
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from projects.authentication import (
+    CachedJWTAuthentication,
+    auth_version,
+    bump_auth_versions,
+)
+
+
+@pytest.fixture
+def jwt_client(user):
+    client = APIClient()
+    token = RefreshToken.for_user(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def queries_for(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [q["sql"] for q in queries.captured_queries]
+
+
+def test_cached_user_skips_the_user_and_membership_queries(jwt_client, task):
+    url = reverse("project-stats", kwargs={"pk": task.project_id})
+    first = queries_for(jwt_client, url)
+    second = queries_for(jwt_client, url)
+    assert len(first) - len(second) == 2
+    assert not any(sql.startswith('SELECT "auth_user"') for sql in second)
+
+
+def test_unshared_cache_loads_the_user_every_request(jwt_client, task, settings):
+    settings.CACHE_SHARED = False
+    url = reverse("project-stats", kwargs={"pk": task.project_id})
+    queries_for(jwt_client, url)
+    second = queries_for(jwt_client, url)
+    assert any(sql.startswith('SELECT "auth_user"') for sql in second)
+
+
+def test_unshared_cache_revokes_without_an_invalidation(user, settings):
+    settings.CACHE_SHARED = False
+    token = RefreshToken.for_user(user).access_token
+    authentication = CachedJWTAuthentication()
+    authentication.get_user(token)
+    # As another worker would, without reaching this process's cache.
+    type(user).objects.filter(pk=user.pk).update(is_active=False)
+
+    with pytest.raises(AuthenticationFailed, match="inactive"):
+        authentication.get_user(token)
+
+
+def test_cached_user_defers_other_columns(user):
+    token = RefreshToken.for_user(user).access_token
+    authentication = CachedJWTAuthentication()
+    authentication.get_user(token)
+    cached = authentication.get_user(token)
+    assert (cached.pk, cached.username, cached.is_active) == (user.pk, "u1", True)
+    assert cached.get_deferred_fields() >= {"email", "password"}
+
+
+def test_deactivation_revokes_the_cached_user(jwt_client, user, project):
+    url = reverse("project-list-create")
+    assert jwt_client.get(url).status_code == 200
+
+    user.is_active = False
+    user.save(update_fields=["is_active"])
+    assert jwt_client.get(url).status_code == 401
+
+
+def test_deleted_user_is_rejected(jwt_client, staff_client, user):
+    url = reverse("project-list-create")
+    assert jwt_client.get(url).status_code == 200
+
+    delete = staff_client.delete(reverse("delete-user", kwargs={"pk": user.id}))
+    assert delete.status_code == 204
+    assert jwt_client.get(url).status_code == 401
+
+
+def test_unrelated_saves_keep_the_entry(user):
+    version = auth_version(user.pk)
+    user.first_name = "New"
+    user.save(update_fields=["first_name", "last_login"])
+    assert auth_version(user.pk) == version
+
+
+def test_entries_stored_under_an_old_version_are_reloaded(user):
+    token = RefreshToken.for_user(user).access_token
+    authentication = CachedJWTAuthentication()
+    stale_version = auth_version(user.pk)
+    bump_auth_versions([user.pk])
+    # A request that read the row before the bump stores a stale entry.
+    authentication.load_user(user.pk, stale_version)
+    type(user).objects.filter(pk=user.pk).update(is_active=False)
+
+    with pytest.raises(AuthenticationFailed, match="inactive"):
+        authentication.get_user(token)
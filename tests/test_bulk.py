@@ -0,0 +1,110 @@
+from django.urls import reverse
+from projects.membership import get_user_project_ids
+from projects.models import Project, Task
+
+
+def test_bulk_create_reports_per_item_results(
+    auth_client_for_user, project, user, user2
+):
+    other = Project.objects.create(name="Other")
+    url = reverse("task-bulk-create")
+    payload = [
+        {"title": "A", "project_id": project.id},
+        {"title": "B", "project_id": project.id, "assigned_to_id": user.id},
+        {"title": "C", "project_id": project.id, "assigned_to_id": user2.id},
+        {"title": "D", "project_id": other.id},
+        {"project_id": project.id},
+    ]
+
+    response = auth_client_for_user.post(url, payload, format="json")
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [
+        "created",
+        "created",
+        "error",
+        "error",
+        "error",
+    ]
+    assert set(Task.objects.values_list("title", flat=True)) == {"A", "B"}
+    assert Task.objects.get(title="B").assigned_to == user
+
+
+def test_bulk_create_query_count_is_constant(
+    django_assert_num_queries, auth_client_for_user, project, user
+):
+    get_user_project_ids(user)
+    url = reverse("task-bulk-create")
+    payload = [{"title": f"T{i}", "project_id": project.id} for i in range(50)]
+
+    # projects, member ids, savepoint, insert, project bump, stats upsert,
+    # change log, release
+    with django_assert_num_queries(8):
+        response = auth_client_for_user.post(url, payload, format="json")
+    assert response.status_code == 200
+    assert Task.objects.filter(project=project).count() == 50
+
+
+def test_bulk_set_status_and_assign(
+    auth_client_for_user, auth_client_for_user2, project_with_two_members, user2
+):
+    tasks = Task.objects.bulk_create(
+        [Task(project=project_with_two_members, title=f"T{i}") for i in range(3)]
+    )
+    status_url = reverse("task-bulk-set-status")
+    assign_url = reverse("task-bulk-assign")
+
+    response = auth_client_for_user.patch(
+        status_url,
+        [{"id": t.id, "status": "DONE"} for t in tasks] + [{"id": 0, "status": "DONE"}],
+        format="json",
+    )
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["updated"] * 3 + ["error"]
+    assert set(Task.objects.values_list("status", flat=True)) == {"DONE"}
+
+    response = auth_client_for_user2.patch(
+        assign_url,
+        [{"id": tasks[0].id, "assigned_to_id": user2.id}],
+        format="json",
+    )
+    assert response.json()["results"][0]["status"] == "updated"
+    tasks[0].refresh_from_db()
+    assert tasks[0].assigned_to == user2
+
+
+def test_bulk_rejects_assignees_that_are_not_members(
+    auth_client_for_user, project, user
+):
+    task = Task.objects.create(project=project, title="T")
+    missing = user.pk + 1000
+    response = auth_client_for_user.post(
+        reverse("task-bulk-create"),
+        [
+            {"title": "A", "project_id": project.id, "assigned_to_id": 0},
+            {"title": "B", "project_id": project.id, "assigned_to_id": missing},
+        ],
+        format="json",
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["error", "error"]
+    assert "assigned_to_id" in results[0]["errors"]
+
+    response = auth_client_for_user.patch(
+        reverse("task-bulk-assign"),
+        [
+            {"id": task.id, "assigned_to_id": 0},
+            {"id": task.id, "assigned_to_id": missing},
+        ],
+        format="json",
+    )
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == ["error", "error"]
+    assert list(Task.objects.values_list("title", "assigned_to")) == [("T", None)]
+
+
+def test_bulk_rejects_non_list_payload(auth_client_for_user):
+    url = reverse("task-bulk-set-status")
+    response = auth_client_for_user.patch(url, {"id": 1}, format="json")
+    assert response.status_code == 400
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from projects.models import ChangeLog, Project, Task
+
+
+def get_changes(client, cursor):
+    return client.get(reverse("task-changes"), {"cursor": cursor}).json()
+
+
+def test_change_feed_reports_upserts_and_tombstones(
+    auth_client_for_user, project, task
+):
+    head = auth_client_for_user.get(reverse("task-changes")).json()
+    assert head["changed"] == []
+
+    task.status = "DONE"
+    task.save()
+    created = Task.objects.create(project=project, title="T2")
+    gone = Task.objects.create(project=project, title="T3")
+    gone_id = gone.id
+    gone.delete()
+
+    feed = get_changes(auth_client_for_user, head["cursor"])
+    assert [t["id"] for t in feed["changed"]] == [task.id, created.id]
+    assert feed["changed"][0]["status"] == "DONE"
+    assert feed["deleted"] == [gone_id]
+
+    assert get_changes(auth_client_for_user, feed["cursor"])["changed"] == []
+
+
+def test_change_feed_project_tombstones_and_membership(
+    auth_client_for_user, auth_client_for_user2, project, task, user2
+):
+    cursor_user2 = auth_client_for_user2.get(reverse("task-changes")).json()["cursor"]
+    cursor_user1 = auth_client_for_user.get(reverse("task-changes")).json()["cursor"]
+    other = Project.objects.create(name="Hidden")
+    Task.objects.create(project=other, title="Not mine")
+
+    project.members.add(user2)
+    feed = get_changes(auth_client_for_user2, cursor_user2)
+    assert feed["resync_projects"] == [project.id]
+    assert feed["changed"] == []
+
+    project_id = project.id
+    project.delete()
+    feed = get_changes(auth_client_for_user, cursor_user1)
+    assert feed["deleted_projects"] == [project_id]
+    assert feed["changed"] == []
+
+
+def test_change_feed_paging_and_invalid_cursor(auth_client_for_user, project):
+    head = auth_client_for_user.get(reverse("task-changes")).json()["cursor"]
+    Task.objects.bulk_create([Task(project=project, title=f"T{i}") for i in range(3)])
+    Task.objects.create(project=project, title="A")
+    Task.objects.create(project=project, title="B")
+
+    url = reverse("task-changes")
+    page = auth_client_for_user.get(url, {"cursor": head, "limit": 1}).json()
+    assert page["has_more"] is True
+    assert [t["title"] for t in page["changed"]] == ["A"]
+
+    assert auth_client_for_user.get(url, {"cursor": "garbage"}).status_code == 400
+
+
+def test_moved_task_leaves_a_tombstone_in_the_old_project(
+    auth_client_for_user, user, project, task
+):
+    other = Project.objects.create(name="Other")
+    other.members.add(user)
+    cursor = auth_client_for_user.get(reverse("task-changes")).json()["cursor"]
+
+    task.project = other
+    task.save()
+    # A member of both projects sees the move as an update...
+    assert get_changes(auth_client_for_user, cursor)["changed"][0]["id"] == task.id
+    # ...and a member of the old one only as a deletion.
+    other.members.remove(user)
+    assert get_changes(auth_client_for_user, cursor)["deleted"] == [task.id]
+
+
+def test_unsettled_entries_are_held_back(settings, auth_client_for_user, project):
+    head = auth_client_for_user.get(reverse("task-changes")).json()["cursor"]
+    settings.CHANGE_FEED = {**settings.CHANGE_FEED, "SETTLE_SECONDS": 60}
+    Task.objects.create(project=project, title="Fresh")
+    feed = get_changes(auth_client_for_user, head)
+    assert feed["changed"] == []
+    assert feed["cursor"] == head
+
+    ChangeLog.objects.update(created_at=timezone.now() - timedelta(minutes=2))
+    assert [t["title"] for t in get_changes(auth_client_for_user, head)["changed"]] == [
+        "Fresh"
+    ]
+
+
+def test_pruned_cursor_answers_410(settings, auth_client_for_user, project):
+    stale = auth_client_for_user.get(reverse("task-changes")).json()["cursor"]
+    Task.objects.create(project=project, title="Old")
+    ChangeLog.objects.update(created_at=timezone.now() - timedelta(days=60))
+    Task.objects.create(project=project, title="New")
+
+    call_command("prune_change_log", stdout=StringIO())
+    assert ChangeLog.objects.count() == 1
+    response = auth_client_for_user.get(reverse("task-changes"), {"cursor": stale})
+    assert response.status_code == 410
+    feed = get_changes(auth_client_for_user, response.json()["cursor"])
+    assert feed["changed"] == []
+
+
+def test_cursor_just_before_the_oldest_entry_is_current(auth_client_for_user, project):
+    Task.objects.create(project=project, title="Old")
+    seen = auth_client_for_user.get(reverse("task-changes")).json()["cursor"]
+    ChangeLog.objects.update(created_at=timezone.now() - timedelta(days=60))
+    Task.objects.create(project=project, title="New")
+
+    call_command("prune_change_log", stdout=StringIO())
+    feed = get_changes(auth_client_for_user, seen)
+    assert [task["title"] for task in feed["changed"]] == ["New"]
@@ -0,0 +1,118 @@
+from django.urls import reverse
+from projects.membership import get_user_project_ids
+from projects.models import Project, Task
+
+
+def test_project_list_not_modified_until_task_changes(
+    django_assert_num_queries, auth_client_for_user, user, project, task
+):
+    url = reverse("project-list-create")
+    first = auth_client_for_user.get(url)
+    etag = first["ETag"]
+
+    get_user_project_ids(user)
+    with django_assert_num_queries(1):
+        unchanged = auth_client_for_user.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert unchanged.status_code == 304
+
+    Task.objects.create(project=project, title="T2")
+    changed = auth_client_for_user.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+
+
+def test_project_detail_conditional_get(
+    auth_client_for_user, auth_client_for_user2, project, user2
+):
+    url = reverse("project-detail", kwargs={"pk": project.id})
+    first = auth_client_for_user.get(url)
+    assert "Last-Modified" in first
+    etag = first["ETag"]
+
+    assert auth_client_for_user.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert auth_client_for_user2.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 403
+
+    project.members.add(user2)
+    assert auth_client_for_user.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_task_list_and_detail_conditional_get(auth_client_for_user, project, task):
+    list_url = reverse("task-list")
+    detail_url = reverse("task-detail", kwargs={"pk": task.id})
+    list_etag = auth_client_for_user.get(list_url, {"project": project.id})["ETag"]
+    detail_etag = auth_client_for_user.get(detail_url)["ETag"]
+
+    response = auth_client_for_user.get(
+        list_url, {"project": project.id}, HTTP_IF_NONE_MATCH=list_etag
+    )
+    assert response.status_code == 304
+    assert (
+        auth_client_for_user.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code
+        == 304
+    )
+
+    auth_client_for_user.patch(
+        reverse("task-set-status", kwargs={"pk": task.id}),
+        {"status": "DONE"},
+        format="json",
+    )
+    response = auth_client_for_user.get(
+        list_url, {"project": project.id}, HTTP_IF_NONE_MATCH=list_etag
+    )
+    assert response.status_code == 200
+    assert (
+        auth_client_for_user.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code
+        == 200
+    )
+
+
+def test_moving_a_task_changes_both_projects(auth_client_for_user, user, project, task):
+    other = Project.objects.create(name="Other")
+    other.members.add(user)
+    url = reverse("project-detail", kwargs={"pk": project.id})
+    etag = auth_client_for_user.get(url)["ETag"]
+
+    auth_client_for_user.patch(
+        reverse("task-detail", kwargs={"pk": task.id}),
+        {"project_id": other.id},
+        format="json",
+    )
+    assert auth_client_for_user.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_detail_etag_depends_on_field_selection(auth_client_for_user, project, task):
+    url = reverse("project-detail", kwargs={"pk": project.id})
+    etag = auth_client_for_user.get(url)["ETag"]
+    narrow = auth_client_for_user.get(url, {"fields": "name"}, HTTP_IF_NONE_MATCH=etag)
+    assert narrow.status_code == 200
+    assert narrow["ETag"] != etag
+    # Equivalent selections share an ETag.
+    same = auth_client_for_user.get(
+        url, {"fields": "name,id"}, HTTP_IF_NONE_MATCH=narrow["ETag"]
+    )
+    assert same.status_code == 304
+
+    task_url = reverse("task-detail", kwargs={"pk": task.id})
+    etag = auth_client_for_user.get(task_url)["ETag"]
+    response = auth_client_for_user.get(
+        task_url, {"fields": "title"}, HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == 200
+
+
+def test_renaming_a_member_changes_project_and_task_etags(
+    auth_client_for_user, user, project, task
+):
+    project_url = reverse("project-detail", kwargs={"pk": project.id})
+    task_url = reverse("task-detail", kwargs={"pk": task.id})
+    project_etag = auth_client_for_user.get(project_url)["ETag"]
+    task_etag = auth_client_for_user.get(task_url)["ETag"]
+
+    user.username = "renamed"
+    user.save(update_fields=["username"])
+    response = auth_client_for_user.get(project_url, HTTP_IF_NONE_MATCH=project_etag)
+    assert response.status_code == 200
+    assert [m["username"] for m in response.json()["members"]] == ["renamed"]
+    response = auth_client_for_user.get(task_url, HTTP_IF_NONE_MATCH=task_etag)
+    assert response.status_code == 200
+    assert response.json()["assigned_to"]["username"] == "renamed"
@@ -0,0 +1,10 @@
+from django.conf import settings
+from django.db import connection
+
+
+def test_sqlite_connections_get_the_pragmas(db):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA busy_timeout")
+        assert cursor.fetchone()[0] == settings.SQLITE_PRAGMAS["busy_timeout"]
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1  # NORMAL
@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from projects.deletion import delete_project, delete_user
+from projects.models import ChangeLog, Project, Task
+from projects.stats import find_drift, project_stats
+
+
+def test_delete_project_in_batches(project, user):
+    for i in range(5):
+        Task.objects.create(project=project, title=f"T{i}", assigned_to=user)
+    ChangeLog.objects.all().delete()
+
+    with CaptureQueriesContext(connection) as queries:
+        result = delete_project(project, chunk_size=2)
+    assert result == {"deleted_tasks": 5}
+    batches = [
+        q["sql"] for q in queries if q["sql"].startswith('DELETE FROM "projects_task"')
+    ]
+    assert len(batches) == 3
+    assert not Project.objects.filter(pk=project.pk).exists()
+    assert find_drift() == []
+    kinds = set(ChangeLog.objects.values_list("kind", flat=True))
+    assert kinds == {ChangeLog.PROJECT_DELETE}
+
+
+def test_delete_project_can_send_task_signals(project):
+    Task.objects.bulk_create([Task(project=project, title=f"T{i}") for i in range(3)])
+    seen = []
+
+    def receiver(sender, instance, origin, **kwargs):
+        seen.append((instance.title, origin))
+
+    post_delete.connect(receiver, sender=Task)
+    try:
+        delete_project(project, chunk_size=2, send_signals=True)
+    finally:
+        post_delete.disconnect(receiver, sender=Task)
+    assert sorted(seen) == [("T0", project), ("T1", project), ("T2", project)]
+
+
+def test_delete_user_detaches_tasks_and_memberships(
+    staff_client, project_with_two_members, user, user2
+):
+    project = project_with_two_members
+    for i in range(3):
+        Task.objects.create(project=project, title=f"T{i}", assigned_to=user)
+    Task.objects.create(project=project, title="Other", assigned_to=user2)
+    stale = project.updated_at
+
+    response = staff_client.delete(reverse("delete-user", kwargs={"pk": user.id}))
+    assert response.status_code == 204
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert Task.objects.filter(project=project, assigned_to=None).count() == 3
+    assert list(project.members.values_list("id", flat=True)) == [user2.pk]
+    assert find_drift() == []
+    workloads = project_stats(project.pk)["workloads"]
+    assert [w["user_id"] for w in workloads] == [user2.pk]
+    project.refresh_from_db()
+    assert project.updated_at > stale
+    removed = ChangeLog.objects.filter(kind=ChangeLog.MEMBER_REMOVED)
+    assert list(removed.values_list("project_id", "user_id")) == [(project.pk, user.pk)]
+
+
+def test_delete_user_batches(project, user):
+    Task.objects.bulk_create(
+        [Task(project=project, title=f"T{i}", assigned_to=user) for i in range(5)]
+    )
+    assert delete_user(user, chunk_size=2) == {
+        "unassigned_tasks": 5,
+        "removed_memberships": 1,
+    }
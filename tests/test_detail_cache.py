@@ -0,0 +1,152 @@
+import pytest
+
+from django.urls import reverse
+from projects import detail_cache
+from projects.detail_cache import LRUPayloadCache, get_detail_cache
+from projects.models import Project, Task
+
+
+@pytest.fixture
+def detail_url(project):
+    return reverse("project-detail", kwargs={"pk": project.id})
+
+
+def fetch(client, url, **params):
+    response = client.get(url, params)
+    return response.get("X-Cache"), response.json()
+
+
+def test_repeated_reads_hit_the_cache(auth_client_for_user, detail_url, task):
+    before = get_detail_cache().stats()
+    miss = fetch(auth_client_for_user, detail_url)
+    hit = fetch(auth_client_for_user, detail_url)
+    assert miss[0] == "MISS" and hit[0] == "HIT"
+    assert hit[1] == miss[1]
+
+    narrowed = fetch(auth_client_for_user, detail_url, fields="name")
+    assert narrowed == ("MISS", {"id": miss[1]["id"], "name": "Alpha"})
+    assert fetch(auth_client_for_user, detail_url, fields="name,id")[0] == "HIT"
+
+    after = get_detail_cache().stats()
+    assert after["hits"] - before["hits"] == 2
+    assert after["misses"] - before["misses"] == 2
+
+
+def test_cached_payloads_still_check_membership(
+    auth_client_for_user, auth_client_for_user2, detail_url
+):
+    fetch(auth_client_for_user, detail_url)
+    response = auth_client_for_user2.get(detail_url)
+    assert response.status_code == 403
+    assert "X-Cache" not in response
+
+
+def test_task_writes_invalidate(auth_client_for_user, detail_url, project, task):
+    fetch(auth_client_for_user, detail_url)
+    auth_client_for_user.patch(
+        reverse("task-detail", kwargs={"pk": task.id}), {"title": "Renamed"}
+    )
+    cache_status, body = fetch(auth_client_for_user, detail_url)
+    assert cache_status == "MISS"
+    assert [t["title"] for t in body["tasks"]] == ["Renamed"]
+
+    fetch(auth_client_for_user, detail_url)
+    auth_client_for_user.patch(
+        reverse("task-bulk-set-status"),
+        [{"id": task.id, "status": "DONE"}],
+        format="json",
+    )
+    assert fetch(auth_client_for_user, detail_url)[1]["tasks"][0]["status"] == "DONE"
+
+    Task.objects.filter(pk=task.pk).get().delete()
+    assert fetch(auth_client_for_user, detail_url) == (
+        "MISS",
+        {**body, "tasks": []},
+    )
+
+
+def test_moving_a_task_invalidates_both_projects(
+    auth_client_for_user, detail_url, project, task, user
+):
+    other = Project.objects.create(name="Other")
+    other.members.add(user)
+    other_url = reverse("project-detail", kwargs={"pk": other.id})
+    fetch(auth_client_for_user, detail_url)
+    fetch(auth_client_for_user, other_url)
+
+    auth_client_for_user.patch(
+        reverse("task-detail", kwargs={"pk": task.id}),
+        {"project_id": other.id},
+        format="json",
+    )
+    assert fetch(auth_client_for_user, detail_url)[1]["tasks"] == []
+    assert [t["id"] for t in fetch(auth_client_for_user, other_url)[1]["tasks"]] == [
+        task.id
+    ]
+
+
+def test_nothing_is_cached_without_a_shared_cache(
+    settings, auth_client_for_user, detail_url
+):
+    settings.CACHE_SHARED = False
+    before = get_detail_cache().stats()
+    assert fetch(auth_client_for_user, detail_url)[0] == "MISS"
+    assert fetch(auth_client_for_user, detail_url)[0] == "MISS"
+    # A disabled cache records no misses that would read as a 0% hit ratio.
+    after = get_detail_cache().stats()
+    assert after["enabled"] is False
+    assert after["misses"] == before["misses"]
+
+
+def test_membership_and_user_changes_invalidate(
+    auth_client_for_user, detail_url, project, user, user2
+):
+    fetch(auth_client_for_user, detail_url)
+    project.members.add(user2)
+    assert len(fetch(auth_client_for_user, detail_url)[1]["members"]) == 2
+
+    user2.username = "renamed"
+    user2.save()
+    members = fetch(auth_client_for_user, detail_url)[1]["members"]
+    assert "renamed" in {member["username"] for member in members}
+
+    user2.save(update_fields=["last_login"])
+    assert fetch(auth_client_for_user, detail_url)[0] == "HIT"
+
+    project.name = "Omega"
+    project.save()
+    assert fetch(auth_client_for_user, detail_url)[1]["name"] == "Omega"
+
+
+def test_stats_endpoint_is_staff_only(auth_client_for_user, staff_client):
+    url = reverse("project-detail-cache-stats")
+    assert auth_client_for_user.get(url).status_code == 403
+    body = staff_client.get(url).json()
+    assert body["backend"] == "DjangoPayloadCache"
+    assert {"hits", "misses", "invalidations", "hit_ratio"} <= body.keys()
+
+
+def test_lru_evicts_and_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(detail_cache.time, "monotonic", lambda: now[0])
+    cache = LRUPayloadCache(timeout=10, max_entries=2)
+
+    for project_id in (1, 2):
+        cache.lookup(project_id, "*").store({"id": project_id})
+    assert cache.lookup(1, "*").payload == {"id": 1}
+    cache.lookup(3, "*").store({"id": 3})
+    assert cache.lookup(2, "*").payload is None
+    assert cache.lookup(1, "*").payload == {"id": 1}
+
+    now[0] += 11
+    assert cache.lookup(1, "*").payload is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_lru_drops_payloads_read_before_an_invalidation():
+    cache = LRUPayloadCache()
+    entry = cache.lookup(1, "*")
+    cache.invalidate([1])
+    entry.store({"id": 1, "name": "stale"})
+    assert cache.lookup(1, "*").payload is None
+    assert cache.stats()["invalidations"] == 1
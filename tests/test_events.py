@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+from projects.events import InMemoryBroker, get_broker, project_channel
+
+
+def auth_headers(user):
+    return {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+
+def test_in_memory_broker_fans_out_to_subscribers():
+    async def scenario():
+        broker = InMemoryBroker(max_queue=1)
+        first = broker.subscribe("project:1")
+        second = broker.subscribe("project:1")
+        other = broker.subscribe("project:2")
+
+        broker.publish("project:1", {"type": "task.updated"})
+        broker.publish("project:1", {"type": "task.updated"})
+        await asyncio.sleep(0)
+
+        assert (await first.get(1))["type"] == "task.updated"
+        assert first.overflowed and second.overflowed
+        assert other.queue.empty()
+
+        for subscription in (first, second, other):
+            subscription.close()
+        assert broker.subscriber_count("project:1") == 0
+
+    async_to_sync(scenario)()
+
+
+def test_project_events_requires_membership(user, user2, project):
+    async def scenario():
+        client = AsyncClient()
+        url = reverse("project-events", kwargs={"pk": project.id})
+        assert (await client.get(url)).status_code == 401
+        response = await client.get(url, headers=auth_headers(user2))
+        assert response.status_code == 403
+        missing = reverse("project-events", kwargs={"pk": project.id + 100})
+        assert (
+            await client.get(missing, headers=auth_headers(user))
+        ).status_code == 404
+
+    async_to_sync(scenario)()
+
+
+def test_project_events_streams_committed_task_changes(
+    django_capture_on_commit_callbacks, user, project, task
+):
+    def change_status():
+        with django_capture_on_commit_callbacks(execute=True):
+            task.status = "DONE"
+            task.save()
+
+    def delete_project():
+        with django_capture_on_commit_callbacks(execute=True):
+            project.delete()
+
+    async def scenario():
+        client = AsyncClient()
+        url = reverse("project-events", kwargs={"pk": project.id})
+        response = await client.get(url, headers=auth_headers(user))
+        assert response["Content-Type"] == "text/event-stream"
+        stream = response.streaming_content
+        assert (await stream.__anext__()).startswith(b"retry:")
+        assert get_broker().subscriber_count(project_channel(project.id)) == 1
+
+        await sync_to_async(change_status)()
+        chunk = await asyncio.wait_for(stream.__anext__(), 5)
+        assert chunk.startswith(b"event: task.updated")
+        assert b'"status": "DONE"' in chunk
+
+        channel = project_channel(project.id)
+        await sync_to_async(delete_project)()
+        chunk = await asyncio.wait_for(stream.__anext__(), 5)
+        assert chunk.startswith(b"event: project.deleted")
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+        assert get_broker().subscriber_count(channel) == 0
+
+    async_to_sync(scenario)()
@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+from projects import export
+from projects.models import Project, Task
+
+
+def streamed(response):
+    assert response.streaming
+    return b"".join(response.streaming_content).decode()
+
+
+def test_task_export_streams_ndjson_for_visible_tasks(
+    auth_client_for_user, project, task, user
+):
+    Task.objects.create(project=project, title="Second", status="DONE")
+    Task.objects.create(project=Project.objects.create(name="Other"), title="Hidden")
+
+    response = auth_client_for_user.get(reverse("task-export"))
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in streamed(response).splitlines()]
+    assert [row["title"] for row in rows] == ["T1", "Second"]
+    assert rows[0]["project_name"] == "Alpha"
+    assert rows[0]["assigned_to_username"] == user.username
+    assert rows[1]["assigned_to_username"] is None
+
+
+def test_export_streams_chunks_under_asgi(monkeypatch, project, task, user):
+    Task.objects.create(project=project, title="Second")
+    monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 1)
+    token = RefreshToken.for_user(user).access_token
+
+    async def scenario():
+        response = await AsyncClient().get(
+            reverse("task-export"), headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.is_async
+        return [chunk async for chunk in response.streaming_content]
+
+    # One chunk per line rather than the whole export at once.
+    chunks = async_to_sync(scenario)()
+    titles = [json.loads(chunk)["title"] for chunk in chunks]
+    assert titles == ["T1", "Second"]
+
+
+def test_task_export_respects_list_filters_as_csv(auth_client_for_user, project, task):
+    Task.objects.create(project=project, title="Second", status="DONE")
+
+    response = auth_client_for_user.get(
+        reverse("task-export"), {"export_format": "csv", "status": "DONE"}
+    )
+    assert response["Content-Type"] == "text/csv"
+    assert 'filename="tasks.csv"' in response["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(streamed(response))))
+    assert [row["title"] for row in rows] == ["Second"]
+    assert rows[0]["assigned_to_id"] == ""
+
+
+def test_export_rejects_unknown_format(auth_client_for_user, project):
+    response = auth_client_for_user.get(
+        reverse("task-export"), {"export_format": "xml"}
+    )
+    assert response.status_code == 400
+    response = auth_client_for_user.get(
+        reverse("project-export"), {"export_format": "xml"}
+    )
+    assert response.status_code == 400
+
+
+def test_project_export_includes_task_counts(auth_client_for_user, project, task):
+    Project.objects.create(name="Hidden")
+
+    response = auth_client_for_user.get(reverse("project-export"))
+    rows = [json.loads(line) for line in streamed(response).splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["name"] == "Alpha"
+    assert (rows[0]["todo_count"], rows[0]["done_count"]) == (1, 0)
+
+
+def test_export_command_writes_file(tmp_path, user, user2, project, task):
+    Task.objects.create(project=Project.objects.create(name="Other"), title="Other")
+    output = tmp_path / "tasks.csv"
+
+    call_command("export", "tasks", "--format", "csv", "--output", str(output))
+    assert len(list(csv.DictReader(output.open()))) == 2
+
+    call_command("export", "tasks", "--user", user2.username, "--output", str(output))
+    assert output.read_text() == ""
+
+    stdout = io.StringIO()
+    call_command("export", "projects", "--user", user.username, stdout=stdout)
+    assert [json.loads(line)["name"] for line in stdout.getvalue().splitlines()] == [
+        "Alpha"
+    ]
@@ -0,0 +1,94 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from django.utils.timezone import override as timezone_override
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from projects import renderers
+from projects.fieldsets import FieldSelection
+from projects.models import Project, Task
+from projects.queries import project_detail_queryset, project_list_queryset
+from projects.renderers import FastJSONRenderer
+from projects.serializers import (
+    CompiledListSerializer,
+    ProjectSerializer,
+    ProjectSummarySerializer,
+    TaskSerializer,
+)
+
+
+def drf_output(serializer_class, instances, **kwargs):
+    child = serializer_class(**kwargs)
+    return serializers.ListSerializer(instances, child=child).data
+
+
+@pytest.fixture
+def tasks(project, user):
+    Task.objects.create(project=project, title="Due", due_date=date(2030, 5, 1))
+    Task.objects.create(project=project, title="Mine", assigned_to=user, status="DONE")
+    return list(Task.objects.select_related("project", "assigned_to"))
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{}, {"fields": "title,assigned_to.username"}, {"expand": "project"}],
+)
+def test_compiled_tasks_match_drf(tasks, params):
+    selection = FieldSelection.from_params(params)
+    fast = TaskSerializer(tasks, many=True, selection=selection)
+    assert isinstance(fast, CompiledListSerializer)
+    assert fast.data == drf_output(TaskSerializer, tasks, selection=selection)
+
+
+def test_compiled_projects_match_drf(user, project, tasks):
+    Project.objects.create(name="Empty").members.add(user)
+    projects = list(
+        project_list_queryset(
+            user, {}, selection=FieldSelection(expand=["tasks"])
+        ).order_by("id")
+    )
+    selection = FieldSelection(expand=["tasks"])
+    fast = ProjectSummarySerializer(projects, many=True, selection=selection).data
+    assert fast == drf_output(ProjectSummarySerializer, projects, selection=selection)
+
+    detail = list(project_detail_queryset())
+    assert ProjectSerializer(detail, many=True).data == drf_output(
+        ProjectSerializer, detail
+    )
+
+
+def test_renderer_matches_json_renderer(monkeypatch):
+    data = {
+        "when": datetime(2030, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        "day": date(2030, 1, 2),
+        "amount": Decimal("1.50"),
+        "label": gettext_lazy("Not found."),
+        "text": "line\u2028separator ünïcode",
+        1: [None, True, 1.5],
+    }
+    expected = JSONRenderer().render(data)
+    assert FastJSONRenderer().render(data) == expected
+    assert FastJSONRenderer().render(data, "application/json; indent=2") == (
+        JSONRenderer().render(data, "application/json; indent=2")
+    )
+
+    monkeypatch.setattr(renderers, "orjson", None)
+    assert FastJSONRenderer().render(data) == expected
+
+
+def test_api_responses_are_unchanged(auth_client_for_user, tasks):
+    response = auth_client_for_user.get("/api/tasks/")
+    assert response["Content-Type"] == "application/json"
+    body = json.loads(response.content)
+    assert [task["title"] for task in body["results"]] == ["Due", "Mine"]
+
+
+def test_compiled_datetimes_follow_the_current_timezone(tasks):
+    with timezone_override("Asia/Kolkata"):
+        fast = TaskSerializer(tasks, many=True).data
+        assert fast == drf_output(TaskSerializer, tasks)
+    assert fast[0]["created_at"].endswith("+05:30")
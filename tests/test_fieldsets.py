@@ -0,0 +1,74 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+def captured_get(client, url, params):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    return response, [query["sql"] for query in context.captured_queries]
+
+
+def test_task_fields_are_pushed_into_the_query(auth_client_for_user, task):
+    response, queries = captured_get(
+        auth_client_for_user, reverse("task-list"), {"fields": "title,status"}
+    )
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"id": task.id, "title": "T1", "status": "TODO"}
+    ]
+    task_query = next(sql for sql in queries if 'FROM "projects_task"' in sql)
+    assert "auth_user" not in task_query
+    assert '"description"' not in task_query
+
+
+def test_dotted_fields_narrow_nested_serializers(auth_client_for_user, task, user):
+    url = reverse("task-detail", kwargs={"pk": task.id})
+    body = auth_client_for_user.get(url, {"fields": "assigned_to.username"}).json()
+    assert body == {"id": task.id, "assigned_to": {"id": user.id, "username": "u1"}}
+
+
+def test_expand_adds_the_project(auth_client_for_user, task, project):
+    body = auth_client_for_user.get(
+        reverse("task-list"), {"fields": "title", "expand": "project"}
+    ).json()
+    assert body["results"] == [
+        {"id": task.id, "title": "T1", "project": {"id": project.id, "name": "Alpha"}}
+    ]
+    default = auth_client_for_user.get(reverse("task-list")).json()["results"][0]
+    assert "project" not in default and "description" in default
+
+
+def test_unknown_names_are_rejected(auth_client_for_user, task):
+    url = reverse("task-list")
+    response = auth_client_for_user.get(url, {"fields": "title,secret"})
+    assert response.status_code == 400
+    assert response.json() == {"fields": ["Unknown field secret"]}
+    response = auth_client_for_user.get(url, {"expand": "members"})
+    assert response.status_code == 400
+
+
+def test_project_list_skips_unselected_counts(auth_client_for_user, project, task):
+    url = reverse("project-list-create")
+    response, queries = captured_get(auth_client_for_user, url, {"fields": "name"})
+    assert response.json()["results"] == [{"id": project.id, "name": "Alpha"}]
+    assert not any('FROM "auth_user"' in sql for sql in queries)
+    assert not any('COUNT("projects_task' in sql for sql in queries)
+
+    body = auth_client_for_user.get(url, {"fields": "name", "expand": "tasks"}).json()
+    assert [t["title"] for t in body["results"][0]["tasks"]] == ["T1"]
+
+
+def test_project_detail_and_users_accept_fields(
+    auth_client_for_user, staff_client, project, task, user
+):
+    url = reverse("project-detail", kwargs={"pk": project.id})
+    body = auth_client_for_user.get(url, {"fields": "name,tasks.title"}).json()
+    assert body == {
+        "id": project.id,
+        "name": "Alpha",
+        "tasks": [{"id": task.id, "title": "T1"}],
+    }
+
+    users = staff_client.get(reverse("users-list"), {"fields": "username"}).json()
+    assert {"id": user.id, "username": "u1"} in users["results"]
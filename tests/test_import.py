@@ -0,0 +1,140 @@
+import io
+import json
+
+import pytest
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from projects import importer
+from projects.membership import get_user_project_ids
+from projects.models import ChangeLog, ImportCheckpoint, Task
+
+
+def write_ndjson(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return str(path)
+
+
+def run_import(*args):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    call_command("import_tasks", *args, stdout=stdout, stderr=stderr)
+    return stdout.getvalue(), stderr.getvalue()
+
+
+def test_import_csv_resolves_projects_and_assignees(tmp_path, user, user2, project):
+    source = tmp_path / "tasks.csv"
+    source.write_text(
+        "title,project,project_id,assignee,status,due_date\n"
+        f"First,,{project.id},{user.username},DONE,2030-01-02\n"
+        f"Second,Imported,,,,\n"
+        f"Third,,{project.id},{user2.username},TODO,\n"
+        f",,{project.id},,,\n"
+        f"Fifth,,{project.id},,SOMEDAY,\n"
+    )
+
+    stdout, stderr = run_import(str(source), "--create-projects")
+
+    assert "Imported 2 tasks from 5 rows (3 rejected)" in stdout
+    assert "row 3:" in stderr and "member of the project" in stderr
+    first = Task.objects.get(title="First")
+    assert first.assigned_to == user
+    assert first.status == "DONE"
+    assert str(first.due_date) == "2030-01-02"
+    assert Task.objects.get(title="Second").project.name == "Imported"
+    assert ChangeLog.objects.filter(kind=ChangeLog.TASK_UPSERT).count() == 2
+
+
+def test_import_can_add_assignees_as_members(tmp_path, user2, project):
+    source = write_ndjson(
+        tmp_path / "tasks.ndjson",
+        [{"title": "T", "project_id": project.id, "assigned_to_id": user2.id}],
+    )
+    assert get_user_project_ids(user2) == set()
+
+    run_import(source, "--add-members")
+
+    assert Task.objects.get(title="T").assigned_to == user2
+    assert get_user_project_ids(user2) == {project.id}
+
+
+def test_import_remembers_missing_projects_and_users(project):
+    rows = [
+        {"title": "A", "project_id": 9999},
+        {"title": "B", "project": "Nowhere"},
+        {"title": "C", "project_id": project.id, "assigned_to_id": 9999},
+        {"title": "D", "project_id": project.id, "assignee": "nobody"},
+    ]
+    checkpoint = ImportCheckpoint.objects.create(name="misses")
+    task_importer = importer.TaskImporter(checkpoint)
+    assert task_importer.import_batch(rows, 0)[0] == 0
+
+    with CaptureQueriesContext(connection) as queries:
+        created, rejected = task_importer.import_batch(rows, len(rows))
+    assert (created, len(rejected)) == (0, 4)
+    lookups = [
+        q["sql"]
+        for q in queries
+        if q["sql"].startswith(('SELECT "auth_user"', 'SELECT "projects_project"'))
+    ]
+    assert lookups == []
+
+
+def test_import_rejects_non_string_descriptions(tmp_path, project):
+    source = write_ndjson(
+        tmp_path / "tasks.ndjson",
+        [
+            {"title": "List", "project_id": project.id, "description": ["a"]},
+            {"title": "Text", "project_id": project.id, "description": "fine"},
+        ],
+    )
+    stdout, stderr = run_import(source)
+    assert "Imported 1 tasks from 2 rows (1 rejected)" in stdout
+    assert "row 1:" in stderr and "description" in stderr
+    assert Task.objects.get().description == "fine"
+
+
+def test_import_resumes_from_checkpoint_after_crash(tmp_path, monkeypatch, project):
+    rows = [{"title": f"T{i}", "project_id": project.id} for i in range(5)]
+    source = write_ndjson(tmp_path / "tasks.ndjson", rows)
+
+    calls = []
+    original = importer.record_task_upserts
+
+    def crash_on_second_batch(tasks):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("worker died")
+        original(tasks)
+
+    monkeypatch.setattr(importer, "record_task_upserts", crash_on_second_batch)
+    with pytest.raises(RuntimeError):
+        run_import(source, "--batch-size", "2")
+    assert Task.objects.count() == 2
+    assert ImportCheckpoint.objects.get().position == 2
+
+    monkeypatch.setattr(importer, "record_task_upserts", original)
+    stdout, stderr = run_import(source, "--batch-size", "2")
+    assert "Resuming" in stderr
+    assert sorted(Task.objects.values_list("title", flat=True)) == [
+        "T0",
+        "T1",
+        "T2",
+        "T3",
+        "T4",
+    ]
+
+    run_import(source)
+    assert Task.objects.count() == 5
+    run_import(source, "--restart")
+    assert Task.objects.count() == 10
+
+
+def test_import_from_stdin_requires_checkpoint_name(monkeypatch, project):
+    monkeypatch.setattr(
+        "sys.stdin", io.StringIO(json.dumps({"title": "S", "project_id": project.id}))
+    )
+    with pytest.raises(CommandError, match="--checkpoint"):
+        run_import("-")
+    run_import("-", "--checkpoint", "stdin-test")
+    assert Task.objects.filter(title="S").exists()
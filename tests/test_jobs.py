@@ -0,0 +1,161 @@
+import os
+
+import pytest
+
+from django.core.management import call_command
+from django.urls import reverse
+from projects.jobs import (
+    claim_job,
+    enqueue,
+    export_path,
+    run_pending_jobs,
+)
+from projects.models import ChangeLog, Job, Project, ProjectStats, Task
+from projects.stats import find_drift
+
+
+@pytest.fixture(autouse=True)
+def job_settings(settings, tmp_path):
+    settings.JOB_QUEUE = {
+        **settings.JOB_QUEUE,
+        "DELETE_CHUNK_SIZE": 2,
+        "EXPORT_DIR": str(tmp_path),
+    }
+
+
+def test_project_delete_is_queued_and_chunked(auth_client_for_user, project, user):
+    for i in range(5):
+        Task.objects.create(project=project, title=f"T{i}", assigned_to=user)
+    url = reverse("project-detail", kwargs={"pk": project.id})
+
+    response = auth_client_for_user.delete(url)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == Job.QUEUED
+    assert response["Location"] == reverse("job-detail", kwargs={"pk": job["id"]})
+    assert Project.objects.filter(pk=project.id).exists()
+    # Deleting again while queued returns the same job.
+    assert auth_client_for_user.delete(url).json()["id"] == job["id"]
+
+    run_pending_jobs()
+    detail = auth_client_for_user.get(response["Location"]).json()
+    assert detail["status"] == Job.SUCCEEDED
+    assert detail["result"] == {"deleted_tasks": 5}
+    assert not Project.objects.filter(pk=project.id).exists()
+    assert not Task.objects.filter(project_id=project.id).exists()
+    assert not ProjectStats.objects.filter(project_id=project.id).exists()
+    kinds = set(ChangeLog.objects.values_list("kind", flat=True))
+    assert ChangeLog.PROJECT_DELETE in kinds
+    assert ChangeLog.TASK_DELETE not in kinds
+
+
+def test_project_delete_requires_membership(auth_client_for_user2, project):
+    url = reverse("project-detail", kwargs={"pk": project.id})
+    assert auth_client_for_user2.delete(url).status_code == 403
+    assert not Job.objects.exists()
+
+
+def test_export_job_writes_a_downloadable_file(auth_client_for_user, task):
+    Task.objects.create(project=task.project, title="Done", status="DONE")
+    response = auth_client_for_user.post(
+        reverse("job-exports"),
+        {"kind": "tasks", "format": "csv", "filters": {"status": "TODO"}},
+        format="json",
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    run_pending_jobs()
+    job = auth_client_for_user.get(reverse("job-detail", kwargs={"pk": job_id}))
+    assert job.json()["result"]["rows"] == 1
+    download = auth_client_for_user.get(reverse("job-download", kwargs={"pk": job_id}))
+    assert download["Content-Type"] == "text/csv"
+    lines = b"".join(download.streaming_content).decode().splitlines()
+    assert len(lines) == 2 and "T1" in lines[1]
+
+
+def run_export(user):
+    payload = {"kind": "tasks", "format": "csv", "filters": {}, "user_id": user.pk}
+    job = enqueue(Job.EXPORT, payload, user)
+    run_pending_jobs()
+    job.refresh_from_db()
+    return job
+
+
+def test_missing_export_file_is_gone(auth_client_for_user, user):
+    job = run_export(user)
+    os.remove(export_path(job))
+    download = auth_client_for_user.get(reverse("job-download", kwargs={"pk": job.pk}))
+    assert download.status_code == 410
+
+
+def test_run_jobs_removes_expired_exports(auth_client_for_user, user, settings):
+    job = run_export(user)
+    assert "expires_at" in job.result
+    call_command("run_jobs", "--once")
+    assert os.path.exists(export_path(job))
+
+    settings.JOB_QUEUE = {**settings.JOB_QUEUE, "EXPORT_RETENTION": -1}
+    call_command("run_jobs", "--once")
+    job.refresh_from_db()
+    assert not os.path.exists(export_path(job))
+    assert job.result["expired"] is True
+    download = auth_client_for_user.get(reverse("job-download", kwargs={"pk": job.pk}))
+    assert download.status_code == 410
+
+
+def test_export_job_validates_filters(auth_client_for_user, project):
+    response = auth_client_for_user.post(
+        reverse("job-exports"),
+        {"kind": "tasks", "filters": {"status": "NOPE"}},
+        format="json",
+    )
+    assert response.status_code == 400
+    assert not Job.objects.exists()
+
+
+def test_jobs_are_private_to_their_creator(
+    auth_client_for_user, auth_client_for_user2, staff_client, user
+):
+    job = enqueue(Job.REBUILD_STATS, {"project_ids": None}, user)
+    url = reverse("job-detail", kwargs={"pk": job.pk})
+    assert auth_client_for_user.get(url).status_code == 200
+    assert auth_client_for_user2.get(url).status_code == 404
+    assert staff_client.get(url).status_code == 200
+
+
+def test_stats_rebuild_job(auth_client_for_user, staff_client, task):
+    url = reverse("job-stats-rebuilds")
+    assert auth_client_for_user.post(url, {}, format="json").status_code == 403
+
+    ProjectStats.objects.filter(project_id=task.project_id).update(todo_count=7)
+    response = staff_client.post(url, {"project_ids": [task.project_id]}, format="json")
+    assert response.status_code == 202
+    run_pending_jobs()
+    assert find_drift() == []
+
+
+def test_failed_jobs_are_retried_then_marked_failed(settings, user):
+    settings.JOB_QUEUE = {**settings.JOB_QUEUE, "MAX_ATTEMPTS": 2, "RETRY_DELAY": 0}
+    # An export for a user deleted since it was queued.
+    payload = {"kind": "tasks", "format": "csv", "filters": {}, "user_id": 999}
+    job = enqueue(Job.EXPORT, payload, user)
+
+    run_pending_jobs()
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (Job.FAILED, 2)
+    assert job.error.startswith("DoesNotExist")
+
+
+def test_a_job_is_claimed_once(user):
+    enqueue(Job.REBUILD_STATS, {"project_ids": None}, user)
+    assert claim_job("a") is not None
+    assert claim_job("b") is None
+
+
+def test_run_jobs_once(project):
+    job = enqueue(Job.DELETE_PROJECT, {"project_id": project.id})
+    call_command("run_jobs", "--once")
+    job.refresh_from_db()
+    assert job.status == Job.SUCCEEDED
+    assert not Project.objects.filter(pk=project.id).exists()
@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.urls import reverse
+from projects.checks import check_cache_deploy, check_cache_shared
+from projects.membership import get_user_project_ids, project_ids_key
+from projects.models import Project
+
+
+def test_membership_cache_follows_add_and_remove(user, user2, project):
+    assert get_user_project_ids(user2) == frozenset()
+
+    project.members.add(user2)
+    assert get_user_project_ids(user2) == {project.id}
+
+    user2.projects.remove(project)
+    assert get_user_project_ids(user2) == frozenset()
+
+
+def test_membership_cache_follows_clear_and_project_delete(user, project):
+    other = Project.objects.create(name="Other")
+    other.members.add(user)
+    assert get_user_project_ids(user) == {project.id, other.id}
+
+    other.members.clear()
+    assert get_user_project_ids(user) == {project.id}
+
+    project.delete()
+    assert get_user_project_ids(user) == frozenset()
+
+
+def test_new_member_sees_project_tasks(
+    auth_client_for_user, auth_client_for_user2, project, task, user2
+):
+    url = reverse("task-list")
+    assert auth_client_for_user2.get(url).json()["results"] == []
+
+    add_url = reverse("add-member", kwargs={"pk": project.id})
+    auth_client_for_user.post(add_url, {"user_id": user2.id}, format="json")
+    assert [t["id"] for t in auth_client_for_user2.get(url).json()["results"]] == [
+        task.id
+    ]
+
+
+def test_process_local_cache_is_not_trusted(settings, user, project):
+    settings.CACHE_SHARED = False
+    # As left behind by a worker that has not seen the removal.
+    cache.set(project_ids_key(user.pk), frozenset({project.id}))
+    Project.members.through.objects.filter(user_id=user.pk).delete()
+    assert get_user_project_ids(user) == frozenset()
+
+
+def test_cache_checks(settings):
+    assert [e.id for e in check_cache_shared(None)] == ["projects.E001"]
+    assert check_cache_deploy(None) == []
+    settings.CACHE_SHARED = False
+    assert check_cache_shared(None) == []
+    assert [w.id for w in check_cache_deploy(None)] == ["projects.W001"]
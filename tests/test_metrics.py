@@ -0,0 +1,96 @@
+import logging
+
+import pytest
+
+from django.urls import reverse
+from projects.metrics import Histogram, RequestRecorder, log_linear_bounds, registry
+from tests.helpers import async_get
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+@pytest.fixture(autouse=True)
+def metrics_token(settings):
+    settings.REQUEST_METRICS = {**settings.REQUEST_METRICS, "TOKEN": "secret"}
+
+
+def scrape(client):
+    response = client.get("/metrics", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    return response.content.decode()
+
+
+def sample(text, line_start):
+    for line in text.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_requests_are_recorded_per_url_name(auth_client_for_user, task):
+    auth_client_for_user.get(reverse("task-list"))
+    auth_client_for_user.get(reverse("task-detail", kwargs={"pk": task.id}))
+    auth_client_for_user.get(reverse("task-list"))
+    text = scrape(auth_client_for_user)
+
+    labels = 'url_name="task-list",method="GET"'
+    assert sample(text, f'http_requests_total{{{labels},status="200"}}') == 2
+    assert sample(text, f"http_request_duration_seconds_count{{{labels}}}") == 2
+    assert sample(text, f"http_request_queries_sum{{{labels}}}") > 0
+    assert sample(text, f'http_request_queries_bucket{{{labels},le="+Inf"}}') == 2
+    assert sample(text, f"http_response_size_bytes_sum{{{labels}}}") > 0
+    assert 'url_name="task-detail"' in text
+    assert "project_detail_cache_hits_total" in text
+
+
+def test_async_views_record_their_queries(client, user, task):
+    async_get(reverse("async-task-list"), user)
+    text = scrape(client)
+    labels = 'url_name="async-task-list",method="GET"'
+    assert sample(text, f"http_request_queries_sum{{{labels}}}") > 0
+
+
+def test_query_budget_logs_slow_requests(auth_client_for_user, task, settings, caplog):
+    settings.REQUEST_METRICS = {"QUERY_BUDGET": 1}
+    with caplog.at_level(logging.WARNING, logger="projects.metrics"):
+        auth_client_for_user.get(reverse("task-list"))
+    [record] = caplog.records
+    assert "(task-list) ran" in record.getMessage()
+    assert "budget 1" in record.getMessage()
+
+
+def test_metrics_token(client, settings):
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+
+
+def test_metrics_without_a_token_are_debug_only(client, settings):
+    settings.REQUEST_METRICS = {"TOKEN": None}
+    assert client.get("/metrics").status_code == 403
+    settings.DEBUG = True
+    assert client.get("/metrics").status_code == 200
+
+
+def test_duplicates_count_repeated_sql():
+    recorder = RequestRecorder()
+    for sql in ["SELECT a", "SELECT b", "SELECT b", "SELECT b"]:
+        recorder.statements[sql] += 1
+    assert recorder.duplicates == 2
+
+
+def test_log_linear_buckets():
+    assert log_linear_bounds(1, 16, 4, integer=True) == [
+        1, 2, 3, 4, 5, 6, 7, 8, 10, 12, 14, 16,
+    ]  # fmt: skip
+    histogram = Histogram([1, 2, 4])
+    for value in (0.5, 1, 3, 9):
+        histogram.observe(value)
+    assert histogram.counts == [2, 0, 1, 1]
+    assert histogram.sum == 13.5
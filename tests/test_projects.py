@@ -1,4 +1,5 @@
 from django.urls import reverse
+from projects.models import Project, Task
 
 
 def test_users_see_only_their_projects_listed(
@@ -10,11 +11,11 @@ def test_users_see_only_their_projects_listed(
     assert resp1.status_code == 200
 
     # test with user1 authorized
-    project_ids_user1 = [p["id"] for p in resp1.json()]
+    project_ids_user1 = [p["id"] for p in resp1.json()["results"]]
     assert project.id in project_ids_user1
 
     resp2 = auth_client_for_user2.get(url)
-    project_ids_user2 = [p["id"] for p in resp2.json()]
+    project_ids_user2 = [p["id"] for p in resp2.json()["results"]]
     assert project.id not in project_ids_user2
 
 
@@ -23,7 +24,7 @@ def test_project_list_admin_sees_all(staff_client, project, project_with_two_mem
     response = staff_client.get(url)
     assert response.status_code == 200
 
-    project_ids = [p["id"] for p in response.json()]
+    project_ids = [p["id"] for p in response.json()["results"]]
     assert len(project_ids) == 2
 
 
@@ -76,15 +77,47 @@ def test_projects_filters_search_ordering(
     resp1 = staff_client.get(url, {"search": "Alpha"})
     assert all(
         "Alpha" in p["name"] or "Alpha" in (p.get("description") or "")
-        for p in resp1.json()
+        for p in resp1.json()["results"]
     )
 
     # member filter
     member_id = project.members.first().id
     resp2 = staff_client.get(url, {"member": member_id})
-    assert all(any(m["id"] == member_id for m in p["members"]) for p in resp2.json())
+    assert all(
+        any(m["id"] == member_id for m in p["members"]) for p in resp2.json()["results"]
+    )
 
     # ordering
     resp3 = staff_client.get(url, {"ordering": "-created_at"})
-    body = resp3.json()
+    body = resp3.json()["results"]
     assert [p["id"] for p in body] == sorted([p["id"] for p in body], reverse=True)
+
+
+def test_project_list_is_cursor_paginated(staff_client, db):
+    for i in range(12):
+        Project.objects.create(name=f"P{i}")
+    url = reverse("project-list-create")
+
+    resp1 = staff_client.get(url)
+    assert resp1.status_code == 200
+    body1 = resp1.json()
+    assert len(body1["results"]) == 10
+    assert body1["next"] is not None
+
+    body2 = staff_client.get(body1["next"]).json()
+    assert len(body2["results"]) == 2
+    assert body2["next"] is None
+    ids = [p["id"] for p in body1["results"] + body2["results"]]
+    assert len(set(ids)) == 12
+
+
+def test_project_list_summary_task_counts(auth_client_for_user, project, task):
+    Task.objects.create(project=project, title="T2", status="DONE")
+    url = reverse("project-list-create")
+
+    body = auth_client_for_user.get(url).json()["results"][0]
+    assert "tasks" not in body
+    assert body["task_counts"] == {"TODO": 1, "IN_PROGRESS": 0, "DONE": 1}
+
+    expanded = auth_client_for_user.get(url, {"expand": "tasks"}).json()["results"][0]
+    assert sorted(t["title"] for t in expanded["tasks"]) == ["T1", "T2"]
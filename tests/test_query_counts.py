@@ -0,0 +1,68 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from projects.membership import get_user_project_ids
+
+
+@pytest.fixture(autouse=True)
+def warm_membership_cache(user, project):
+    get_user_project_ids(user)
+
+
+def test_assign_query_count(
+    django_assert_num_queries, auth_client_for_user, task, user
+):
+    url = reverse("task-assign", kwargs={"pk": task.id})
+    # task + project/assignee join, project members prefetch, locked stats
+    # key, update, project bump, change log
+    with django_assert_num_queries(6):
+        response = auth_client_for_user.patch(url, {"user_id": user.id}, format="json")
+    assert response.status_code == 200
+
+
+def test_unassign_query_count(
+    django_assert_num_queries, auth_client_for_user, task, user
+):
+    url = reverse("task-unassign", kwargs={"pk": task.id})
+    with django_assert_num_queries(8):
+        response = auth_client_for_user.patch(url, {"user_id": user.id}, format="json")
+    assert response.status_code == 200
+
+
+def test_set_status_query_count(django_assert_num_queries, auth_client_for_user, task):
+    url = reverse("task-set-status", kwargs={"pk": task.id})
+    with django_assert_num_queries(8):
+        response = auth_client_for_user.patch(url, {"status": "DONE"}, format="json")
+    assert response.status_code == 200
+
+
+def test_create_with_assignee_query_count(
+    django_assert_num_queries, auth_client_for_user, project, user
+):
+    url = reverse("task-list")
+    payload = {"title": "New", "project_id": project.id, "assigned_to_id": user.id}
+    # assignee + project lookups, member ids, insert, project bump, status and
+    # assignee stats upserts, change log
+    with django_assert_num_queries(8):
+        response = auth_client_for_user.post(url, payload, format="json")
+    assert response.status_code == 201
+
+
+def test_update_with_assignee_query_count(
+    django_assert_num_queries, auth_client_for_user, task, user
+):
+    url = reverse("task-detail", kwargs={"pk": task.id})
+    with django_assert_num_queries(7):
+        response = auth_client_for_user.patch(
+            url, {"assigned_to_id": user.id}, format="json"
+        )
+    assert response.status_code == 200
+
+
+def test_cold_membership_cache_costs_one_query(
+    django_assert_num_queries, auth_client_for_user, task
+):
+    url = reverse("task-set-status", kwargs={"pk": task.id})
+    cache.clear()
+    with django_assert_num_queries(9):
+        auth_client_for_user.patch(url, {"status": "DONE"}, format="json")
@@ -0,0 +1,70 @@
+import pytest
+
+from django.urls import reverse
+from projects import routers
+from projects.middleware import REPLICA_PIN_COOKIE
+
+
+@pytest.fixture
+def replica_reads(settings, monkeypatch):
+    # The test database has no real replica; route to a mirror of default
+    # and record every request that chose one.
+    settings.DATABASE_REPLICAS = ["default"]
+    picked = []
+
+    def pick(aliases):
+        picked.append(aliases)
+        return "default"
+
+    monkeypatch.setattr(routers, "pick_replica", pick)
+    return picked
+
+
+def test_list_and_detail_reads_use_a_replica(
+    auth_client_for_user, replica_reads, project, task
+):
+    response = auth_client_for_user.get(reverse("task-list"))
+    assert response.status_code == 200
+    assert REPLICA_PIN_COOKIE not in response.cookies
+    assert len(replica_reads) == 1
+
+    auth_client_for_user.get(reverse("project-stats", kwargs={"pk": project.id}))
+    assert len(replica_reads) == 1
+
+
+def test_writes_pin_the_session_to_the_primary(
+    auth_client_for_user, replica_reads, project, settings
+):
+    response = auth_client_for_user.post(
+        reverse("task-list"), {"title": "New", "project_id": project.id}
+    )
+    assert response.status_code == 201
+    cookie = response.cookies[REPLICA_PIN_COOKIE]
+    assert cookie["max-age"] == settings.DATABASE_REPLICA_LAG_SECONDS
+
+    auth_client_for_user.get(reverse("task-list"))
+    assert replica_reads == []
+
+    auth_client_for_user.cookies.pop(REPLICA_PIN_COOKIE)
+    auth_client_for_user.get(reverse("task-list"))
+    assert len(replica_reads) == 1
+
+
+def test_replica_reads_do_not_fill_the_detail_cache_during_lag(
+    auth_client_for_user, replica_reads, project, settings
+):
+    url = reverse("project-detail", kwargs={"pk": project.id})
+    settings.DATABASE_REPLICA_LAG_SECONDS = 60
+    assert auth_client_for_user.get(url)["X-Cache"] == "MISS"
+    assert auth_client_for_user.get(url)["X-Cache"] == "MISS"
+
+    settings.DATABASE_REPLICA_LAG_SECONDS = 0
+    auth_client_for_user.get(url)
+    assert auth_client_for_user.get(url)["X-Cache"] == "HIT"
+
+
+def test_replicas_are_never_migrated(settings):
+    settings.DATABASE_REPLICAS = ["replica-1"]
+    router = routers.ReplicaRouter()
+    assert router.allow_migrate("replica-1", "projects") is False
+    assert router.allow_migrate("default", "projects") is None
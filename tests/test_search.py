@@ -0,0 +1,51 @@
+from django.core.management import call_command
+from django.urls import reverse
+from projects.models import Project, Task
+
+
+def test_task_search_matches_word_prefixes(auth_client_for_user, project):
+    Task.objects.create(project=project, title="Deploy backend", description="prod")
+    Task.objects.create(project=project, title="Write docs", description="backend API")
+    Task.objects.create(project=project, title="Unrelated")
+    url = reverse("task-list")
+
+    response = auth_client_for_user.get(url, {"search": "back"})
+    titles = [t["title"] for t in response.json()["results"]]
+    assert sorted(titles) == ["Deploy backend", "Write docs"]
+
+    response = auth_client_for_user.get(url, {"search": "back prod"})
+    titles = [t["title"] for t in response.json()["results"]]
+    assert titles == ["Deploy backend"]
+
+
+def test_task_search_respects_visibility(auth_client_for_user2, project):
+    Task.objects.create(project=project, title="Secret roadmap")
+    url = reverse("task-list")
+
+    response = auth_client_for_user2.get(url, {"search": "roadmap"})
+    assert response.json()["results"] == []
+
+
+def test_search_index_follows_updates_and_deletes(staff_client, task):
+    url = reverse("task-list")
+
+    task.title = "Renamed"
+    task.save()
+    assert staff_client.get(url, {"search": "T1"}).json()["results"] == []
+    assert len(staff_client.get(url, {"search": "renam"}).json()["results"]) == 1
+
+    Task.objects.filter(pk=task.pk).update(title="Bulk edited")
+    assert len(staff_client.get(url, {"search": "bulk"}).json()["results"]) == 1
+
+    task.delete()
+    assert staff_client.get(url, {"search": "bulk"}).json()["results"] == []
+
+
+def test_project_search_and_rebuild_command(staff_client, project):
+    Project.objects.create(name="Gamma", description="Zażółć gęślą jaźń")
+    url = reverse("project-list-create")
+
+    call_command("rebuild_search_index")
+    response = staff_client.get(url, {"search": "gesl"})
+    names = [p["name"] for p in response.json()["results"]]
+    assert names == ["Gamma"]
@@ -0,0 +1,129 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from projects.bulk import _save_updates
+from projects.models import ProjectStats, Task
+from projects.stats import find_drift, project_stats
+
+
+def test_stats_endpoint(auth_client_for_user, auth_client_for_user2, project, user):
+    yesterday = timezone.localdate() - timedelta(days=1)
+    Task.objects.create(
+        project=project, title="A", assigned_to=user, due_date=yesterday
+    )
+    Task.objects.create(project=project, title="B", status="DONE", due_date=yesterday)
+    Task.objects.create(project=project, title="C", status="IN_PROGRESS")
+
+    url = reverse("project-stats", kwargs={"pk": project.id})
+    response = auth_client_for_user.get(url)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["task_counts"] == {"TODO": 1, "IN_PROGRESS": 1, "DONE": 1}
+    assert body["overdue_count"] == 1
+    assert body["workloads"] == [
+        {
+            "user_id": user.id,
+            "username": user.username,
+            "task_counts": {"TODO": 1, "IN_PROGRESS": 0, "DONE": 0},
+        }
+    ]
+    assert auth_client_for_user2.get(url).status_code == 403
+
+
+def test_stats_follow_task_actions(auth_client_for_user, project, task, user):
+    task.due_date = timezone.localdate() - timedelta(days=3)
+    task.save()
+    assert project_stats(project.id)["overdue_count"] == 1
+
+    auth_client_for_user.patch(
+        reverse("task-set-status", kwargs={"pk": task.id}),
+        {"status": "DONE"},
+        format="json",
+    )
+    auth_client_for_user.patch(
+        reverse("task-unassign", kwargs={"pk": task.id}),
+        {"user_id": user.id},
+        format="json",
+    )
+    stats = project_stats(project.id)
+    assert stats["task_counts"]["DONE"] == 1
+    assert stats["overdue_count"] == 0
+    assert stats["workloads"] == []
+
+    auth_client_for_user.patch(
+        reverse("task-bulk-set-status"),
+        [{"id": task.id, "status": "TODO"}],
+        format="json",
+    )
+    auth_client_for_user.post(
+        reverse("task-bulk-create"),
+        [{"title": "Bulk", "project_id": project.id, "assigned_to_id": user.id}],
+        format="json",
+    )
+    assert project_stats(project.id)["task_counts"]["TODO"] == 2
+    assert find_drift() == []
+
+    auth_client_for_user.delete(reverse("task-detail", kwargs={"pk": task.id}))
+    assert project_stats(project.id)["task_counts"]["TODO"] == 1
+    assert find_drift() == []
+
+
+def test_save_of_unloaded_instance_keeps_stats(project, task):
+    Task(
+        pk=task.pk,
+        project=project,
+        title="T1",
+        status="DONE",
+        created_at=task.created_at,
+    ).save()
+    assert project_stats(project.id)["task_counts"]["DONE"] == 1
+    assert find_drift() == []
+
+
+def test_concurrent_updates_from_stale_instances(project, task):
+    # Both loaded as TODO; only one of them may take the task out of TODO.
+    first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+    first.status = "DONE"
+    first.save()
+    second.status = "IN_PROGRESS"
+    second.save(update_fields=["status"])
+    assert find_drift() == []
+
+    stale = Task.objects.get(pk=task.pk)
+    Task.objects.get(pk=task.pk).delete()
+    stale.delete()
+    assert find_drift() == []
+
+
+def test_bulk_updates_read_the_locked_row(auth_client_for_user, project, task, user):
+    stale = Task.objects.get(pk=task.pk)
+    task.status = "DONE"
+    task.save()
+    stale.status = "IN_PROGRESS"
+    results = _save_updates([(0, {"id": task.pk}, stale)], ["status"], [None])
+    assert results[0]["status"] == "updated"
+    assert find_drift() == []
+
+
+def test_reconcile_command_detects_and_fixes_drift(project, task):
+    ProjectStats.objects.filter(project=project).update(todo_count=42)
+    stdout = io.StringIO()
+    call_command("reconcile_project_stats", stdout=stdout)
+    assert f"Drift in 1 projects: {project.id}" in stdout.getvalue()
+    assert find_drift() == [project.id]
+
+    call_command("reconcile_project_stats", "--fix", stdout=io.StringIO())
+    assert find_drift() == []
+    assert project_stats(project.id)["task_counts"]["TODO"] == 1
+
+    call_command("reconcile_project_stats", "--rebuild", stdout=io.StringIO())
+    assert find_drift() == []
+
+
+def test_deleting_assignee_drops_their_workload(project, task, user):
+    user.delete()
+    assert project_stats(project.id)["workloads"] == []
+    assert find_drift() == []
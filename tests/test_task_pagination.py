@@ -0,0 +1,131 @@
+from datetime import date, timedelta
+
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from projects.models import Task
+
+
+@pytest.fixture
+def tasks(project):
+    base = date(2030, 1, 1)
+    created = []
+    for i in range(23):
+        due_date = None if i % 4 == 0 else base + timedelta(days=i % 3)
+        created.append(
+            Task.objects.create(
+                project=project, title=f"T{i % 5}", due_date=due_date, status="TODO"
+            )
+        )
+    return created
+
+
+def walk(client, url, params):
+    pages = [client.get(url, params).json()]
+    while pages[-1]["next"]:
+        pages.append(client.get(pages[-1]["next"]).json())
+    return pages
+
+
+def expected_ids(tasks, ordering):
+    if not ordering:
+        return sorted(task.id for task in tasks)
+    name = ordering.lstrip("-")
+    ordered = sorted(
+        tasks,
+        key=lambda t: (
+            (getattr(t, name) is None, getattr(t, name) or 0, t.id)
+            if name == "due_date"
+            else (getattr(t, name), t.id)
+        ),
+        reverse=ordering.startswith("-"),
+    )
+    return [task.id for task in ordered]
+
+
+@pytest.mark.parametrize(
+    "ordering",
+    ["", "due_date", "-due_date", "created_at", "-created_at", "title", "-title"],
+)
+def test_keyset_pages_cover_every_ordering(auth_client_for_user, tasks, ordering):
+    url = reverse("task-list")
+    params = {"ordering": ordering} if ordering else {}
+    pages = walk(auth_client_for_user, url, params)
+
+    assert [len(page["results"]) for page in pages] == [10, 10, 3]
+    ids = [task["id"] for page in pages for task in page["results"]]
+    assert ids == expected_ids(tasks, ordering)
+
+    backwards = [auth_client_for_user.get(pages[-1]["previous"]).json()]
+    while backwards[-1]["previous"]:
+        backwards.append(auth_client_for_user.get(backwards[-1]["previous"]).json())
+    assert [page["results"] for page in reversed(backwards)] == [
+        page["results"] for page in pages[:-1]
+    ]
+
+
+def test_inserts_do_not_shift_pages(auth_client_for_user, project, tasks):
+    url = reverse("task-list")
+    first = auth_client_for_user.get(url, {"ordering": "due_date"}).json()
+    Task.objects.create(project=project, title="Early", due_date=date(2000, 1, 1))
+    second = auth_client_for_user.get(first["next"]).json()
+
+    seen = {task["id"] for task in first["results"]}
+    assert not seen & {task["id"] for task in second["results"]}
+    assert len(second["results"]) == 10
+
+
+def test_deep_pages_cost_the_same_as_the_first(auth_client_for_user, tasks):
+    url = reverse("task-list")
+    pages = walk(auth_client_for_user, url, {"ordering": "-due_date", "page_size": 2})
+    assert len(pages) == 12
+
+    def page_queries(link):
+        with CaptureQueriesContext(connection) as context:
+            auth_client_for_user.get(link)
+        return [query["sql"] for query in context.captured_queries]
+
+    first = page_queries(url + "?ordering=-due_date&page_size=2&count=false")
+    deep = page_queries(pages[-2]["next"])
+    assert len(first) == len(deep)
+    assert not any(
+        "OFFSET" in sql or 'COUNT("projects_task' in sql for sql in first + deep
+    )
+
+
+def test_count_defaults_to_the_first_page(auth_client_for_user, tasks):
+    url = reverse("task-list")
+    first = auth_client_for_user.get(url).json()
+    assert first["count"] == 23
+    assert auth_client_for_user.get(url, {"count": "false"}).json()["count"] is None
+
+    assert auth_client_for_user.get(first["next"]).json()["count"] is None
+    counted = auth_client_for_user.get(first["next"] + "&count=true").json()
+    assert counted["count"] == 23
+
+
+def test_bad_cursors_are_rejected(auth_client_for_user, tasks):
+    url = reverse("task-list")
+    next_link = auth_client_for_user.get(url, {"ordering": "title"}).json()["next"]
+    cursor = next_link.split("cursor=")[1].split("&")[0]
+
+    response = auth_client_for_user.get(url, {"cursor": cursor, "ordering": "-title"})
+    assert response.status_code == 404
+    assert auth_client_for_user.get(url, {"cursor": "garbage"}).status_code == 404
+
+
+def test_page_parameter_keeps_numbered_pages(auth_client_for_user, tasks):
+    body = auth_client_for_user.get(reverse("task-list"), {"page": 3}).json()
+    assert body["count"] == 23
+    assert [task["id"] for task in body["results"]] == sorted(t.id for t in tasks)[20:]
+
+
+def test_ranked_search_pages_by_rank(auth_client_for_user, project, tasks):
+    for i in range(12):
+        Task.objects.create(project=project, title=f"report {'draft ' * i}")
+    url = reverse("task-list")
+    pages = walk(auth_client_for_user, url, {"search": "report"})
+    ids = [task["id"] for page in pages for task in page["results"]]
+    assert len(ids) == len(set(ids)) == 12
@@ -0,0 +1,139 @@
+import threading
+import time
+
+import pytest
+
+from django.urls import reverse
+from projects import throttling
+from projects.throttling import CacheBucketStore, ConcurrencyLimiter, LocalBucketStore
+
+
+@pytest.fixture
+def tight_limits(settings):
+    settings.WRITE_THROTTLES = {
+        **settings.WRITE_THROTTLES,
+        "SCOPES": {
+            "tasks": {
+                "user": {"rate": "1/min", "burst": 2},
+                "endpoint": {"rate": "1/min", "burst": 3},
+            },
+            "add-member": {"user": {"rate": "1/min", "burst": 1}},
+        },
+    }
+
+
+def create_task(client, project):
+    return client.post(reverse("task-list"), {"title": "T", "project_id": project.id})
+
+
+def test_task_writes_are_throttled_per_user(
+    auth_client_for_user, project, tight_limits
+):
+    assert create_task(auth_client_for_user, project).status_code == 201
+    assert create_task(auth_client_for_user, project).status_code == 201
+    response = create_task(auth_client_for_user, project)
+    assert response.status_code == 429
+    assert int(response["Retry-After"]) > 0
+
+    # Reads are never throttled.
+    assert auth_client_for_user.get(reverse("task-list")).status_code == 200
+
+
+def test_endpoint_bucket_is_shared_by_all_users(
+    auth_client_for_user, auth_client_for_user2, project_with_two_members, tight_limits
+):
+    project = project_with_two_members
+    for _ in range(2):
+        assert create_task(auth_client_for_user, project).status_code == 201
+    # Refused by their own bucket, without draining the endpoint's.
+    assert create_task(auth_client_for_user, project).status_code == 429
+    assert create_task(auth_client_for_user2, project).status_code == 201
+    assert create_task(auth_client_for_user2, project).status_code == 429
+
+
+def test_endpoint_refusal_refunds_the_callers_token(
+    auth_client_for_user,
+    auth_client_for_user2,
+    project_with_two_members,
+    user,
+    tight_limits,
+):
+    project = project_with_two_members
+    for client in (auth_client_for_user2, auth_client_for_user2, auth_client_for_user):
+        assert create_task(client, project).status_code == 201
+    # The endpoint bucket is empty while the caller still holds one token.
+    assert create_task(auth_client_for_user, project).status_code == 429
+    store = throttling.get_bucket_store()
+    key = f"throttle:tasks:user:{user.pk}"
+    assert store.consume(key, 1 / 60, 2, time.time()) == 0
+    assert store.consume(key, 1 / 60, 2, time.time()) > 0
+
+
+def test_add_member_is_throttled(auth_client_for_user, project, user2, tight_limits):
+    url = reverse("add-member", kwargs={"pk": project.id})
+    assert auth_client_for_user.post(url, {"user_id": user2.id}).status_code == 200
+    assert auth_client_for_user.post(url, {"user_id": user2.id}).status_code == 429
+
+
+@pytest.mark.parametrize("store_class", [LocalBucketStore, CacheBucketStore])
+def test_bucket_refills_at_rate_up_to_burst(store_class):
+    store = store_class()
+    assert store.consume("k", 1, 2, 100) == 0
+    assert store.consume("k", 1, 2, 100) == 0
+    assert store.consume("k", 1, 2, 100) == pytest.approx(1)
+    assert store.consume("k", 1, 2, 100.5) == pytest.approx(0.5)
+    assert store.consume("k", 1, 2, 101) == 0
+    # A long idle period refills to burst, not beyond.
+    assert store.consume("k", 1, 2, 500) == 0
+    assert store.consume("k", 1, 2, 500) == 0
+    assert store.consume("k", 1, 2, 500) > 0
+
+
+@pytest.mark.parametrize("store_class", [LocalBucketStore, CacheBucketStore])
+def test_refund_returns_a_token(store_class):
+    store = store_class()
+    assert store.consume("k", 1, 1, 100) == 0
+    store.refund("k", 1, 1, 100)
+    assert store.consume("k", 1, 1, 100) == 0
+    assert store.consume("k", 1, 1, 100) > 0
+
+
+def test_local_store_is_selectable(
+    settings, monkeypatch, auth_client_for_user, project
+):
+    settings.WRITE_THROTTLES = {
+        "STORE": {"BACKEND": "projects.throttling.LocalBucketStore"},
+        "SCOPES": {"tasks": {"user": {"rate": "1/min", "burst": 1}}},
+    }
+    monkeypatch.setattr(throttling, "_store", None)
+    assert create_task(auth_client_for_user, project).status_code == 201
+    assert create_task(auth_client_for_user, project).status_code == 429
+    assert isinstance(throttling.get_bucket_store(), LocalBucketStore)
+
+
+def test_saturated_writers_get_503(auth_client_for_user, project, settings):
+    settings.WRITE_CONCURRENCY = {
+        **settings.WRITE_CONCURRENCY,
+        "MAX_IN_FLIGHT": 0,
+        "QUEUE_TIMEOUT": 0.01,
+    }
+    response = create_task(auth_client_for_user, project)
+    assert response.status_code == 503
+    assert response["Retry-After"] == "1"
+    assert auth_client_for_user.get(reverse("task-list")).status_code == 200
+
+
+def test_limiter_queues_then_sheds():
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queued=1)
+    assert limiter.acquire(0)
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(limiter.acquire(5)))
+    waiter.start()
+    while limiter.queued == 0:
+        pass
+    # The queue is full: a third caller is refused without waiting.
+    assert not limiter.acquire(5)
+    limiter.release()
+    waiter.join()
+    assert results == [True]
+    assert limiter.in_flight == 1